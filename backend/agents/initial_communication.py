@@ -1,32 +1,33 @@
-// backend/agents/initial_communication.py
+# backend/agents/initial_communication.py
 from nemo_agent import Agent, Toolkit
 from nemo_agent.llms import OpenAICompatible
 import os
-import yaml
+from utils.app_config import get_app_config
+from utils.llm_configs import get_llm_config
+from utils.llm_governor import estimate_request_tokens, get_llm_governor
 
 class InitialCommunicationAgent(Agent):
     def __init__(self):
         # 从环境变量获取API密钥
         qwen_api_key = os.getenv("QWEN_API_KEY")
         
-        # 从配置文件加载模型配置
-        with open("configs/recruitment_config.yml", "r") as f:
-            config = yaml.safe_load(f)
+        # 从共享配置对象读取模型配置
+        config = get_app_config()
+        qwen_config = config.model("qwen")
         
-        qwen_config = config["models"]["qwen"]
-        
-        # 初始化LLM（使用阿里云百炼平台Qwen模型）
-        self.llm = OpenAICompatible(
-            model_name=qwen_config["model_name"],
-            base_url=qwen_config["base_url"],
+        # 初始化LLM（使用阿里云百炼平台Qwen模型，相同配置的模型配置对象在所有智能体间共享）
+        self.llm = get_llm_config(
+            OpenAICompatible,
+            model_name=qwen_config.model_name,
+            base_url=qwen_config.base_url,
             api_key=qwen_api_key,
-            temperature=qwen_config["temperature"],
-            max_tokens=qwen_config["max_tokens"]
+            temperature=qwen_config.temperature,
+            max_tokens=qwen_config.max_tokens
         )
         super().__init__(toolkit=Toolkit(), llm=self.llm)
         
         # 加载自定义沟通话术配置
-        self.communication_templates = config.get("communication_templates", {})
+        self.communication_templates = config.section("communication_templates")
     
     def conduct_initial_communication(self, candidate_info, job_requirements, template_name="default"):
         """进行初轮沟通"""
@@ -53,7 +54,9 @@ class InitialCommunicationAgent(Agent):
         5. 安排下一步流程
         """
         
-        response = self.llm.generate(prompt=prompt)
+        response = get_llm_governor().call(
+            self.llm.generate, prompt=prompt, tokens=estimate_request_tokens(prompt)
+        )
         return self._format_communication_result(response)
     
     def _get_default_template(self):
@@ -2,29 +2,30 @@
 from nat.agent.tool_calling_agent.agent import ToolCallAgentGraph as Agent
 from nat.llm import OpenAICompatible
 import os
-import yaml
 import requests
 from typing import Dict, Any
 import json
+from utils.agent_executor import run_agent
+from utils.app_config import get_app_config
+from utils.llm_configs import get_llm_config
 
 class InterviewSchedulerAgent(Agent):
     def __init__(self):
         # 从环境变量获取API密钥
         qwen_api_key = os.getenv("QWEN_API_KEY")
         
-        # 从配置文件加载模型配置
-        with open("configs/recruitment_config.yml", "r") as f:
-            config = yaml.safe_load(f)
+        # 从共享配置对象读取模型配置
+        config = get_app_config()
+        qwen_config = config.model("qwen")
         
-        qwen_config = config["models"]["qwen"]
-        
-        # 初始化LLM（使用阿里云百炼平台Qwen模型）
-        llm = OpenAICompatible(
-            model=qwen_config["model_name"],
-            base_url=qwen_config["base_url"],
+        # 初始化LLM（使用阿里云百炼平台Qwen模型，相同配置的模型配置对象在所有智能体间共享）
+        llm = get_llm_config(
+            OpenAICompatible,
+            model=qwen_config.model_name,
+            base_url=qwen_config.base_url,
             api_key=qwen_api_key,
-            temperature=qwen_config["temperature"],
-            max_tokens=qwen_config["max_tokens"]
+            temperature=qwen_config.temperature,
+            max_tokens=qwen_config.max_tokens
         )
         
         # 调用父类构造函数
@@ -37,7 +38,7 @@ class InterviewSchedulerAgent(Agent):
         )
         
         # 加载日程工具配置
-        self.calendar_configs = config.get("calendar_integrations", {})
+        self.calendar_configs = config.section("calendar_integrations")
     
     def _get_system_prompt(self):
         """获取系统提示"""
@@ -78,7 +79,7 @@ class InterviewSchedulerAgent(Agent):
         """
         
         try:
-            response = self.run(prompt)
+            response = run_agent(self, prompt)
             interview_details = self._format_interview_details(response)
             
             # 同步到日程工具
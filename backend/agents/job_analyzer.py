@@ -1,6 +1,9 @@
 # backend/agents/job_analyzer.py
 from nat.agent.tool_calling_agent.agent import ToolCallAgentGraph as Agent
 from nat.llm.openai_llm import OpenAIModelConfig
+from utils.agent_executor import arun_agent, run_agent
+from utils.llm_cache import LLMResponseCache, get_llm_cache
+from utils.llm_configs import get_llm_config
 import os
 import yaml
 import json
@@ -15,9 +18,12 @@ class JobAnalyzerAgent(Agent):
         if not qwen_api_key:
             raise ValueError("QWEN_API_KEY环境变量未设置，请检查.env文件配置")
         
-        # 初始化LLM
-        llm = OpenAIModelConfig(
-            model="qwen2-72b-instruct",
+        model_name = "qwen2-72b-instruct"
+        
+        # 初始化LLM（相同配置的模型配置对象在所有智能体间共享）
+        llm = get_llm_config(
+            OpenAIModelConfig,
+            model=model_name,
             api_key=qwen_api_key,
             base_url="https://dashscope.aliyuncs.com/compatible-mode/v1"
         )
@@ -28,6 +34,9 @@ class JobAnalyzerAgent(Agent):
             tools=[],  # 岗位分析暂时不需要工具
             system_prompt=self._get_system_prompt()
         )
+        
+        self.model_name = model_name
+        self.temperature = None  # 使用模型默认温度
     
     def _get_system_prompt(self):
         """获取系统提示"""
@@ -50,9 +59,9 @@ class JobAnalyzerAgent(Agent):
         请以结构化的格式输出结果。
         """
     
-    def parse_job_description(self, job_description: str) -> dict:
-        """分析职位描述并提取关键信息"""
-        prompt = f"""
+    def _build_parse_prompt(self, job_description: str) -> str:
+        """构造职位描述解析提示词"""
+        return f"""
         请分析以下职位描述并以标准JSON格式输出结果：
         
         职位描述：
@@ -76,10 +85,31 @@ class JobAnalyzerAgent(Agent):
         
         重要：只返回JSON，不要包含其他文字或解释。
         """
+    
+    def _get_cache_key(self, prompt: str) -> str:
+        """生成LLM响应缓存键"""
+        return LLMResponseCache.make_key(
+            self.model_name,
+            self.temperature,
+            self._get_system_prompt(),
+            {"task": "parse_job_description", "prompt": prompt}
+        )
+    
+    def parse_job_description(self, job_description: str) -> dict:
+        """分析职位描述并提取关键信息"""
+        prompt = self._build_parse_prompt(job_description)
+        
+        # 相同职位描述的解析结果直接复用缓存
+        cache = get_llm_cache()
+        cache_key = self._get_cache_key(prompt)
+        cached_response = cache.get(cache_key)
+        if cached_response is not None:
+            return {"raw_response": cached_response, "cached": True}
         
         try:
-            # 使用run方法运行Agent
-            response = self.run(prompt)
+            # 经全局LLM调用调控运行Agent
+            response = run_agent(self, prompt)
+            cache.set(cache_key, response)
             
             # 这里应该解析响应并返回结构化数据
             # 为简化，我们直接返回响应
@@ -87,4 +117,19 @@ class JobAnalyzerAgent(Agent):
         except Exception as e:
             return {"error": f"分析职位描述时出错: {str(e)}"}
     
-    
\ No newline at end of file
+    async def parse_job_description_async(self, job_description: str) -> dict:
+        """异步分析职位描述，LLM调用不阻塞事件循环"""
+        prompt = self._build_parse_prompt(job_description)
+        
+        cache = get_llm_cache()
+        cache_key = self._get_cache_key(prompt)
+        cached_response = await cache.aget(cache_key)
+        if cached_response is not None:
+            return {"raw_response": cached_response, "cached": True}
+        
+        try:
+            response = await arun_agent(self, prompt)
+            await cache.aset(cache_key, response)
+            return {"raw_response": response}
+        except Exception as e:
+            return {"error": f"分析职位描述时出错: {str(e)}"}
@@ -1,31 +1,98 @@
 # backend/agents/resume_agent.py
 from nat.agent.tool_calling_agent.agent import ToolCallAgentGraph as Agent
 from nat.llm.openai_llm import OpenAIModelConfig as OpenAICompatible
-import os
+from utils.agent_executor import arun_agent
+from utils.api_key_manager import get_api_key_manager
+from utils.api_key_pool import is_rate_limit_error
+from utils.llm_cache import LLMResponseCache, get_llm_cache
+from utils.llm_configs import get_llm_config
+from utils.llm_governor import get_llm_governor
+from utils.prefilter import extract_job_skills
+from utils.prompt_compression import compress_resume
+from utils.requirements_diff import DIMENSION_SECTIONS, diff_requirements, skills_changed
+from utils.resume_extractor import SECTION_TITLES, extract_resume_info
+from utils.screening_artifacts import get_screening_artifacts
+from utils.screening_engine import DEFAULT_MAX_CONCURRENCY, ScreeningEngine, load_screening_config
+from utils.skill_matcher import get_skill_matcher
+from utils.token_budget import estimate_tokens, plan_batches
+import asyncio
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+import json
+import logging
 import yaml
 
+logger = logging.getLogger(__name__)
+
 class ResumeScreenerAgent(Agent):
     def __init__(self):
-        # 从环境变量获取API密钥
-        qwen_api_key = os.getenv("QWEN_API_KEY")
+        # 从环境变量获取API密钥（QWEN_API_KEYS 可配置多个，按负载分配请求）
+        self.key_pool = get_api_key_manager().get_key_pool("qwen")
         
         # 检查API密钥是否存在
-        if not qwen_api_key:
+        if not len(self.key_pool):
             raise ValueError("QWEN_API_KEY环境变量未设置，请检查.env文件配置")
         
-        # 初始化LLM
-        llm = OpenAICompatible(
-            model="qwen2-72b-instruct",  # 或其他适当的模型
-            api_key=qwen_api_key,
-            base_url="https://dashscope.aliyuncs.com/compatible-mode/v1"
-        )
+        model_name = "qwen2-72b-instruct"  # 或其他适当的模型
+        self.model_name = model_name
         
-        # 调用父类构造函数
+        # 调用父类构造函数（第一个密钥由自身处理，其余密钥各用一个同配置的智能体）
         super().__init__(
-            llm=llm,
+            llm=self._create_llm(self.key_pool.keys[0].value),
             tools=[],  # 简历筛选暂时不需要工具
             system_prompt=self._get_system_prompt()
         )
+        self._key_agents = {self.key_pool.keys[0].name: self}
+        for key in self.key_pool.keys[1:]:
+            self._key_agents[key.name] = Agent(
+                llm=self._create_llm(key.value),
+                tools=[],
+                system_prompt=self._get_system_prompt()
+            )
+        
+        # 并发限制按 模型+密钥池 维度共享，密钥只保留摘要；并发上限随密钥数量线性增加
+        self.temperature = None  # 使用模型默认温度
+        pool_digest = hashlib.sha256(",".join(sorted(self._key_agents)).encode()).hexdigest()[:12]
+        self.limiter_key = f"{model_name}:{pool_digest}"
+        self.max_concurrency = load_screening_config().get("max_concurrency", DEFAULT_MAX_CONCURRENCY) * len(self.key_pool)
+    
+    def _create_llm(self, api_key: str):
+        """初始化LLM（相同配置的模型配置对象在所有智能体间共享）"""
+        return get_llm_config(
+            OpenAICompatible,
+            model=self.model_name,
+            api_key=api_key,
+            base_url="https://dashscope.aliyuncs.com/compatible-mode/v1"
+        )
+    
+    def _estimate_request_tokens(self, prompt: str) -> int:
+        """估算一次调用消耗的token（输入 + 预留输出），用于密钥的TPM额度"""
+        output_tokens = (load_screening_config().get("batch", {}) or {}).get("output_tokens_per_resume", 400)
+        return estimate_tokens(self._get_system_prompt() + prompt) + output_tokens
+    
+    def _run_llm(self, prompt: str):
+        """经全局调用调控后选择负载最低的密钥同步调用模型，遇到429时换一个密钥重试"""
+        tokens = self._estimate_request_tokens(prompt)
+        governor = get_llm_governor()
+        for attempt in range(len(self.key_pool)):
+            try:
+                with governor.slot(tokens), self.key_pool.lease(tokens) as lease:
+                    return self._key_agents[lease.key.name].run(prompt)
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt == len(self.key_pool) - 1:
+                    raise
+    
+    async def _arun_llm(self, prompt: str):
+        """经全局调用调控后选择负载最低的密钥异步调用模型，遇到429时换一个密钥重试"""
+        tokens = self._estimate_request_tokens(prompt)
+        governor = get_llm_governor()
+        for attempt in range(len(self.key_pool)):
+            try:
+                async with governor.slot_async(tokens), self.key_pool.lease_async(tokens) as lease:
+                    return await arun_agent(self._key_agents[lease.key.name], prompt, governed=False)
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt == len(self.key_pool) - 1:
+                    raise
     
     def _get_system_prompt(self):
         """获取系统提示"""
@@ -34,25 +101,39 @@ class ResumeScreenerAgent(Agent):
         请根据职位要求分析简历，并提供详细的匹配度分析。
         """
     
-    def screen_resume(self, resume_text: str, job_requirements: dict) -> dict:
-        """筛选简历并评估与职位的匹配度"""
-        prompt = f"""
+    @staticmethod
+    def _format_skills_match(skills_match: dict) -> str:
+        """把本地计算的技能匹配结果格式化为提示词片段"""
+        return (
+            f"已匹配技能：{'、'.join(skills_match['matched_skills']) or '无'}；"
+            f"缺少技能：{'、'.join(skills_match['missing_skills']) or '无'}；"
+            f"其他技能：{'、'.join(skills_match['additional_skills']) or '无'}"
+        )
+    
+    def _match_skills(self, resume_text: str, job_requirements: dict) -> dict:
+        """基于技能词典在本地确定性地计算技能匹配（matched/missing/additional）"""
+        return get_skill_matcher().match(resume_text, extract_job_skills(job_requirements))
+    
+    def _build_screening_prompt(self, resume_excerpt: str, job_requirements: dict, skills_match: dict) -> str:
+        """
+        构造单份简历筛选提示词（技能匹配已在本地计算，模型只需给出定性评估）
+        resume_excerpt 为 compress_resume 压缩后的简历：只含工作/项目/教育/技能等相关段落，不含联系方式
+        """
+        return f"""
         请根据以下职位要求分析简历并评估匹配度：
         
         职位要求：
         {yaml.dump(job_requirements, default_flow_style=False)}
         
         简历内容：
-        {resume_text}
+        {resume_excerpt}
+        
+        技能匹配（系统已计算，请作为评分依据，无需重复输出）：
+        {self._format_skills_match(skills_match)}
         
         请提供以下信息，并严格按照JSON格式输出，不要包含其他文字：
         {{
             "match_score": 85,
-            "skills_match": {{
-                "matched_skills": ["技能1", "技能2"],
-                "missing_skills": ["技能3", "技能4"],
-                "additional_skills": ["技能5"]
-            }},
             "experience_match": "工作经验匹配度分析",
             "education_match": "学历匹配度分析",
             "strengths": ["优势1", "优势2"],
@@ -61,37 +142,428 @@ class ResumeScreenerAgent(Agent):
             "overall_assessment": "总体评价"
         }}
         """
+    
+    def _build_batch_prompt(self, batch: list, job_requirements: dict, skills_matches: dict) -> str:
+        """
+        构造多份简历合并筛选提示词
+        batch 为 [(resume_index, 压缩后的简历)] 列表，skills_matches 为 {resume_index: 本地技能匹配结果}
+        """
+        resumes_block = "\n".join(
+            f"【简历 resume_index={resume_index}】\n{resume_excerpt}\n"
+            f"技能匹配（系统已计算）：{self._format_skills_match(skills_matches[resume_index])}\n"
+            for resume_index, resume_excerpt in batch
+        )
+        return f"""
+        请根据以下职位要求，分别分析下列每份简历并评估匹配度：
+        
+        职位要求：
+        {yaml.dump(job_requirements, default_flow_style=False)}
+        
+        简历列表：
+        {resumes_block}
+        
+        请为每份简历输出一个JSON对象，并严格按照JSON数组格式输出，不要包含其他文字。
+        每个对象必须原样带上对应简历的resume_index：
+        [
+            {{
+                "resume_index": 0,
+                "match_score": 85,
+                "experience_match": "工作经验匹配度分析",
+                "education_match": "学历匹配度分析",
+                "strengths": ["优势1", "优势2"],
+                "weaknesses": ["不足1", "不足2"],
+                "recommendations": ["建议1", "建议2"],
+                "overall_assessment": "总体评价"
+            }}
+        ]
+        """
+    
+    @staticmethod
+    def _parse_batch_response(response, expected_indices: list) -> dict:
+        """
+        解析合并筛选的JSON数组响应
+        返回 {resume_index: 结果对象}，无法解析或缺失的简历不会出现在结果中
+        """
+        items = response
+        if not isinstance(items, list):
+            text = response if isinstance(response, str) else str(response)
+            start = text.find('[')
+            end = text.rfind(']')
+            if start == -1 or end <= start:
+                return {}
+            try:
+                items = json.loads(text[start:end+1])
+            except ValueError:
+                return {}
+            if not isinstance(items, list):
+                return {}
+        
+        expected = set(expected_indices)
+        parsed = {}
+        for item in items:
+            if not isinstance(item, dict) or "match_score" not in item:
+                continue
+            try:
+                resume_index = int(item.get("resume_index"))
+            except (TypeError, ValueError):
+                continue
+            if resume_index in expected:
+                parsed[resume_index] = item
+        return parsed
+    
+    def _get_cache_key(self, prompt: str, task: str = "screen_resume") -> str:
+        """生成LLM响应缓存键"""
+        return LLMResponseCache.make_key(
+            self.model_name,
+            self.temperature,
+            self._get_system_prompt(),
+            {"task": task, "prompt": prompt}
+        )
+    
+    @staticmethod
+    def _build_result(response, skills_match: dict, **extra) -> dict:
+        """组装筛选结果：定性评估来自模型，技能匹配来自本地计算"""
+        result = {
+            "status": "success",
+            "raw_response": response,
+            "skills_match": skills_match
+        }
+        result.update(extra)
+        return result
+    
+    @staticmethod
+    def _record_artifacts(resume_text: str, job_requirements: dict, result: dict) -> dict:
+        """保存技能、段落概要和筛选结果等中间结果，返回原结果"""
+        get_screening_artifacts().record(resume_text, job_requirements, result)
+        return result
+    
+    @staticmethod
+    async def _arecord_artifacts(resume_text: str, job_requirements: dict, result: dict) -> dict:
+        """异步保存中间结果（提取和数据库写入在线程池中执行），返回原结果"""
+        await get_screening_artifacts().arecord(resume_text, job_requirements, result)
+        return result
+    
+    def screen_resume(self, resume_text: str, job_requirements: dict) -> dict:
+        """筛选简历并评估与职位的匹配度"""
+        skills_match = self._match_skills(resume_text, job_requirements)
+        # 压缩后的简历送入模型，节省的token数随结果返回
+        compressed = compress_resume(resume_text)
+        prompt = self._build_screening_prompt(compressed["text"], job_requirements, skills_match)
+        
+        # 相同模型参数和提示的筛选结果直接复用缓存
+        cache = get_llm_cache()
+        cache_key = self._get_cache_key(prompt)
+        cached_response = cache.get(cache_key)
+        if cached_response is not None:
+            return self._record_artifacts(
+                resume_text, job_requirements,
+                self._build_result(cached_response, skills_match, cached=True, prompt_tokens=compressed["tokens"])
+            )
         
         try:
-            response = self.run(prompt)
-            # 返回响应
+            response = self._run_llm(prompt)
+            cache.set(cache_key, response)
+            # 返回响应（同时保存中间结果，供职位要求调整后增量重新筛选）
+            return self._record_artifacts(
+                resume_text, job_requirements,
+                self._build_result(response, skills_match, prompt_tokens=compressed["tokens"])
+            )
+        except Exception as e:
             return {
-                "status": "success",
-                "raw_response": response
+                "status": "error",
+                "message": f"筛选简历时出错: {str(e)}"
             }
+    
+    async def screen_resume_async(self, resume_text: str, job_requirements: dict) -> dict:
+        """异步筛选简历，LLM调用不阻塞事件循环"""
+        skills_match = self._match_skills(resume_text, job_requirements)
+        # 压缩后的简历送入模型，节省的token数随结果返回
+        compressed = compress_resume(resume_text)
+        prompt = self._build_screening_prompt(compressed["text"], job_requirements, skills_match)
+        
+        # 相同模型参数和提示的筛选结果直接复用缓存
+        cache = get_llm_cache()
+        cache_key = self._get_cache_key(prompt)
+        cached_response = await cache.aget(cache_key)
+        if cached_response is not None:
+            return await self._arecord_artifacts(
+                resume_text, job_requirements,
+                self._build_result(cached_response, skills_match, cached=True, prompt_tokens=compressed["tokens"])
+            )
+        
+        try:
+            response = await self._arun_llm(prompt)
+            await cache.aset(cache_key, response)
+            return await self._arecord_artifacts(
+                resume_text, job_requirements,
+                self._build_result(response, skills_match, prompt_tokens=compressed["tokens"])
+            )
         except Exception as e:
             return {
                 "status": "error",
                 "message": f"筛选简历时出错: {str(e)}"
             }
-    
+
+    async def screen_resumes_async(self, resume_texts: list, job_requirements: dict,
+                                   max_concurrency: int = None) -> list:
+        """并发批量筛选简历，结果按 resume_index 保持输入顺序"""
+        engine = ScreeningEngine(
+            self.screen_resume_async,
+            limiter_key=self.limiter_key,
+            max_concurrency=max_concurrency or self.max_concurrency
+        )
+        return await engine.screen(resume_texts, job_requirements)
+
+    def iter_screen_resumes(self, items, job_requirements: dict, max_concurrency: int = None):
+        """
+        流式批量筛选：items 为 (resume_index, resume_text) 的同步或异步可迭代对象，
+        返回异步迭代器，每完成一份简历立即产出 {resume_index, result}
+        """
+        engine = ScreeningEngine(
+            self.screen_resume_async,
+            limiter_key=self.limiter_key,
+            max_concurrency=max_concurrency or self.max_concurrency
+        )
+        return engine.iter_results(items, job_requirements)
 
     def screen_resumes(self, resume_texts: list, job_requirements: dict) -> list:
-        """批量筛选简历"""
-        results = []
-        for i, resume_text in enumerate(resume_texts):
-            try:
-                result = self.screen_resume(resume_text, job_requirements)
-                results.append({
-                    "resume_index": i,
-                    "result": result
-                })
-            except Exception as e:
-                results.append({
-                    "resume_index": i,
-                    "result": {
-                        "status": "error",
-                        "message": f"处理简历时出错: {str(e)}"
+        """
+        批量筛选简历（同步接口，异步上下文中请使用 screen_resumes_async）
+        在事件循环中被调用时（兼容旧的调用方式），在独立线程的事件循环中执行并阻塞等待结果
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.screen_resumes_async(resume_texts, job_requirements))
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="screen-resumes") as executor:
+            return executor.submit(
+                lambda: asyncio.run(self.screen_resumes_async(resume_texts, job_requirements))
+            ).result()
+
+    async def _screen_batch(self, batch: list, job_requirements: dict, skills_matches: dict) -> dict:
+        """一次LLM调用筛选多份简历，返回成功解析的 {resume_index: 结果对象}"""
+        prompt = self._build_batch_prompt(batch, job_requirements, skills_matches)
+        response = await self._arun_llm(prompt)
+        return self._parse_batch_response(response, [resume_index for resume_index, _ in batch])
+
+    async def screen_resumes_batched_async(self, resume_texts: list, job_requirements: dict,
+                                           max_concurrency: int = None) -> list:
+        """
+        合并筛选：按token预算把多份较短的简历打包进一次LLM调用，职位要求只发送一次，
+        批量响应中缺失或无法解析的简历自动回退为单份筛选。结果按 resume_index 保持输入顺序
+        """
+        batch_config = load_screening_config().get("batch", {}) or {}
+        engine = ScreeningEngine(
+            self.screen_resume_async,
+            limiter_key=self.limiter_key,
+            max_concurrency=max_concurrency or self.max_concurrency
+        )
+        
+        fixed_tokens = estimate_tokens(self._get_system_prompt() + self._build_batch_prompt([], job_requirements, {}))
+        # 按实际送入模型的压缩后简历估算token
+        compressed = [compress_resume(text) for text in resume_texts]
+        batches = plan_batches(
+            [item["text"] for item in compressed],
+            fixed_tokens=fixed_tokens,
+            token_budget=batch_config.get("token_budget", 6000),
+            max_batch_size=batch_config.get("max_batch_size", 8),
+            max_item_tokens=batch_config.get("max_resume_tokens", 1500),
+            output_tokens_per_item=batch_config.get("output_tokens_per_resume", 400)
+        )
+        results = [None] * len(resume_texts)
+        
+        async def run_batch(indices: list):
+            parsed = {}
+            if len(indices) > 1:
+                batch = [(i, compressed[i]["text"]) for i in indices]
+                try:
+                    skills_matches = {i: self._match_skills(resume_texts[i], job_requirements) for i in indices}
+                    parsed = await engine.run_limited(self._screen_batch, batch, job_requirements, skills_matches)
+                except Exception as e:
+                    logger.warning(
+                        f"合并筛选简历失败，回退为单份筛选: 简历下标={indices}, 错误={type(e).__name__}: {e}",
+                        exc_info=True
+                    )
+            
+            fallback_indices = []
+            for i in indices:
+                if i in parsed:
+                    # resume_index 由外层结果给出，避免调用方传入子集时与原始下标混淆
+                    assessment = {k: v for k, v in parsed[i].items() if k != "resume_index"}
+                    results[i] = {
+                        "resume_index": i,
+                        "result": await self._arecord_artifacts(
+                            resume_texts[i],
+                            job_requirements,
+                            self._build_result(
+                                json.dumps(assessment, ensure_ascii=False),
+                                skills_matches[i],
+                                batch_size=len(indices),
+                                prompt_tokens=compressed[i]["tokens"]
+                            )
+                        )
+                    }
+                else:
+                    fallback_indices.append(i)
+            
+            for item in await asyncio.gather(*[
+                engine.screen_one(i, resume_texts[i], job_requirements) for i in fallback_indices
+            ]):
+                results[item["resume_index"]] = item
+        
+        await asyncio.gather(*[run_batch(indices) for indices in batches])
+        return results
+    
+    @staticmethod
+    def _parse_assessment(response) -> dict:
+        """从模型响应中取出评估JSON对象，无法解析时返回None"""
+        if isinstance(response, dict):
+            return dict(response)
+        text = response if isinstance(response, str) else str(response)
+        start = text.find('{')
+        end = text.rfind('}')
+        if start == -1 or end <= start:
+            return None
+        try:
+            assessment = json.loads(text[start:end+1])
+        except ValueError:
+            return None
+        return assessment if isinstance(assessment, dict) else None
+    
+    @staticmethod
+    def _skill_coverage(skills_match: dict) -> float:
+        required = len(skills_match["matched_skills"]) + len(skills_match["missing_skills"])
+        return len(skills_match["matched_skills"]) / required if required else None
+    
+    def _adjust_skill_score(self, assessment: dict, old_match: dict, new_match: dict) -> dict:
+        """
+        只有技能要求变化时在本地调整分数：按技能覆盖率的变化量 × skill_score_weight 增减原分数，
+        不再调用模型
+        """
+        weight = (load_screening_config().get("rescreen", {}) or {}).get("skill_score_weight", 30)
+        old_coverage, new_coverage = self._skill_coverage(old_match), self._skill_coverage(new_match)
+        score = assessment.get("match_score")
+        if isinstance(score, (int, float)) and old_coverage is not None and new_coverage is not None:
+            adjusted = min(100.0, max(0.0, score + weight * (new_coverage - old_coverage)))
+            assessment["match_score"] = round(adjusted)
+        return assessment
+    
+    def _build_rescreen_prompt(self, resume_text: str, assessment: dict, diff: dict, skills_match: dict) -> str:
+        """
+        构造增量重新评估提示词：只发送调整的职位要求、之前的评估和相关的简历段落，
+        模型只需重新评估受影响的维度并给出调整后的总分
+        """
+        info = extract_resume_info(resume_text)
+        sections = info["sections"]
+        names = []
+        for dimension in diff["dimensions"]:
+            for name in DIMENSION_SECTIONS.get(dimension, ()):
+                if name in sections and name not in names:
+                    names.append(name)
+        # 只涉及经验、学历等维度且识别出对应段落时只发送这些段落，否则发送完整摘录
+        if names and all(dimension in DIMENSION_SECTIONS for dimension in diff["dimensions"]):
+            parts = [f"【{SECTION_TITLES[name]}】\n{sections[name]}" for name in names]
+            facts = []
+            if info.get("education"):
+                facts.append(f"最高学历：{info['education']}")
+            if info.get("experience_years") is not None:
+                facts.append(f"工作年限：约{info['experience_years']:g}年")
+            if facts:
+                parts.insert(0, "；".join(facts))
+            resume_block = "\n\n".join(parts)
+        else:
+            resume_block = compress_resume(resume_text)["text"]
+        changes = {
+            field: {"原要求": change["old"], "新要求": change["new"]}
+            for field, change in diff["changed_fields"].items()
+        }
+        output_format = {"match_score": 85}
+        output_format.update({dimension: "调整后的分析" for dimension in diff["dimensions"]})
+        output_format["overall_assessment"] = "调整后的总体评价"
+        return f"""
+        候选人此前已按原职位要求完成评估，现在职位要求有部分调整。请只针对调整的部分重新评估，并给出调整后的总分：
+        
+        职位要求调整：
+        {yaml.dump(changes, allow_unicode=True, default_flow_style=False)}
+        
+        此前的评估：
+        {json.dumps(assessment, ensure_ascii=False)}
+        
+        简历相关内容：
+        {resume_block}
+        
+        技能匹配（系统已按新要求计算）：
+        {self._format_skills_match(skills_match)}
+        
+        请严格按照JSON格式输出，不要包含其他文字：
+        {json.dumps(output_format, ensure_ascii=False, indent=4)}
+        """
+    
+    async def _rescreen_dimensions(self, resume_text: str, assessment: dict, diff: dict, skills_match: dict) -> dict:
+        """重新评估受影响的维度，返回合并后的评估；响应无法解析时返回None"""
+        prompt = self._build_rescreen_prompt(resume_text, assessment, diff, skills_match)
+        cache = get_llm_cache()
+        cache_key = self._get_cache_key(prompt, task="rescreen_dimensions")
+        response = await cache.aget(cache_key)
+        if response is None:
+            response = await self._arun_llm(prompt)
+            await cache.aset(cache_key, response)
+        updated = self._parse_assessment(response)
+        if updated is None or "match_score" not in updated:
+            return None
+        return {**assessment, **updated}
+    
+    async def rescreen_resumes_async(self, resume_texts: list, previous_requirements: dict, job_requirements: dict,
+                                     max_concurrency: int = None) -> list:
+        """
+        职位要求调整后增量重新筛选，结果按 resume_index 保持输入顺序，result.rescreen.mode 说明处理方式：
+        reused（要求未变化，直接复用）、local（只有技能变化，本地重算技能匹配并调整分数）、
+        dimension（只把受影响的维度发送给模型）、full（没有之前的结果，完整筛选）
+        """
+        diff = diff_requirements(previous_requirements, job_requirements)
+        store = get_screening_artifacts()
+        engine = ScreeningEngine(
+            self.screen_resume_async,
+            limiter_key=self.limiter_key,
+            max_concurrency=max_concurrency or self.max_concurrency
+        )
+        
+        async def full_screen(resume_index: int, resume_text: str) -> dict:
+            item = await engine.screen_one(resume_index, resume_text, job_requirements)
+            item["result"]["rescreen"] = {"mode": "full"}
+            return item
+        
+        async def rescreen_one(resume_index: int, resume_text: str) -> dict:
+            prior = await store.aget_result(resume_text, previous_requirements)
+            assessment = self._parse_assessment(prior.get("raw_response")) if prior else None
+            if assessment is None:
+                return await full_screen(resume_index, resume_text)
+            
+            skills_match = self._match_skills(resume_text, job_requirements)
+            if diff["dimensions"]:
+                try:
+                    assessment = await engine.run_limited(
+                        self._rescreen_dimensions, resume_text, assessment, diff, skills_match
+                    )
+                except Exception as e:
+                    return {
+                        "resume_index": resume_index,
+                        "result": {"status": "error", "message": f"重新筛选简历时出错: {str(e)}"}
                     }
-                })
-        return results
\ No newline at end of file
+                if assessment is None:
+                    return await full_screen(resume_index, resume_text)
+                rescreen = {"mode": "dimension", "dimensions": diff["dimensions"]}
+            elif skills_changed(diff):
+                assessment = self._adjust_skill_score(assessment, prior["skills_match"], skills_match)
+                rescreen = {"mode": "local"}
+            else:
+                rescreen = {"mode": "reused"}
+            result = self._build_result(json.dumps(assessment, ensure_ascii=False), skills_match, rescreen=rescreen)
+            return {
+                "resume_index": resume_index,
+                "result": await self._arecord_artifacts(resume_text, job_requirements, result)
+            }
+        
+        return list(await asyncio.gather(*[
+            rescreen_one(resume_index, resume_text) for resume_index, resume_text in enumerate(resume_texts)
+        ]))
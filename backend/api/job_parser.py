@@ -1,19 +1,18 @@
 # backend/api/job_parser.py
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from agents.job_analyzer import JobAnalyzerAgent
+from utils.agent_registry import get_agent_registry
 import logging
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-# 初始化Agent时添加错误处理
-try:
-    agent = JobAnalyzerAgent()
-    logger.info("JobAnalyzerAgent 初始化成功")
-except Exception as e:
-    logger.error(f"JobAnalyzerAgent 初始化失败: {str(e)}")
-    agent = None
+def _create_agent():
+    """创建岗位分析Agent（首次使用或后台预热时调用，工具包在此时才导入）"""
+    from agents.job_analyzer import JobAnalyzerAgent
+    return JobAnalyzerAgent()
+
+get_agent_registry().register("job_analyzer", _create_agent)
 
 class JobDescriptionRequest(BaseModel):
     description: str
@@ -26,7 +25,8 @@ class JobParseResponse(BaseModel):
 
 @router.post("/parse-job", response_model=JobParseResponse)
 async def parse_job(request: JobDescriptionRequest):
-    # 检查Agent是否初始化成功
+    # 获取Agent（尚未创建时在此创建），检查是否初始化成功
+    agent = await get_agent_registry().aget("job_analyzer")
     if agent is None:
         logger.error("JobAnalyzerAgent 未初始化")
         return JobParseResponse(
@@ -37,7 +37,7 @@ async def parse_job(request: JobDescriptionRequest):
     
     try:
         logger.info("开始解析岗位描述")
-        result = agent.parse_job_description(request.description)
+        result = await agent.parse_job_description_async(request.description)
         logger.info("岗位描述解析完成")
         return JobParseResponse(**result)
     except Exception as e:
@@ -1,32 +1,96 @@
 # backend/api/resume_screener.py
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, File, Form, HTTPException, Query, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel
-from agents.resume_agent import ResumeScreenerAgent
+from utils.agent_registry import get_agent_registry
+from utils.job_queue import get_job_queue, get_job_worker, register_job_handler
+from utils.json_response import dumps as dumps_json
+from utils.prefilter import ResumePrefilter
+from utils.requirements_diff import diff_requirements
+from utils.screening_engine import load_screening_config
+from utils.spreadsheet_reader import aiter_candidate_records
+from typing import Optional
+import json
 import logging
+import os
+import shutil
+import tempfile
+import time
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-# 初始化Agent
-try:
-    agent = ResumeScreenerAgent()
-    logger.info("ResumeScreenerAgent 初始化成功")
-except Exception as e:
-    logger.error(f"ResumeScreenerAgent 初始化失败: {str(e)}")
-    agent = None
+def _create_agent():
+    """创建简历筛选Agent（首次使用或后台预热时调用，工具包在此时才导入）"""
+    from agents.resume_agent import ResumeScreenerAgent
+    return ResumeScreenerAgent()
+
+get_agent_registry().register("resume_screener", _create_agent)
 
 class ResumeScreenRequest(BaseModel):
     resumes: list[str]
     job_requirements: dict
+    # 合并筛选模式：多份较短的简历合并到一次LLM调用中
+    batch_mode: bool = False
+    # 本地预筛选：未指定时使用配置文件中的默认值
+    prefilter: Optional[bool] = None
+    prefilter_top_n: Optional[int] = None
+    prefilter_threshold: Optional[float] = None
 
 class ResumeScreenResponse(BaseModel):
     status: str
     data: list = None
+    # 请求级统计，如送入模型的简历压缩前后的token数
+    metadata: dict = None
     message: str = None
 
+def _add_prompt_tokens(totals: dict, result: dict):
+    """累计单份简历压缩前后的token数"""
+    tokens = result.get("prompt_tokens")
+    if tokens:
+        for key in ("original", "compressed", "saved"):
+            totals[key] = totals.get(key, 0) + tokens[key]
+        totals["counter"] = tokens["counter"]
+
+def _run_prefilter(request: ResumeScreenRequest) -> tuple:
+    """
+    执行本地预筛选
+    返回 (需要送入LLM的简历下标列表, {简历下标: 预筛选信息})，未启用预筛选时返回全部下标和空字典
+    """
+    config = load_screening_config().get("prefilter", {}) or {}
+    enabled = request.prefilter if request.prefilter is not None else config.get("enabled", False)
+    if not enabled:
+        return list(range(len(request.resumes))), {}
+    
+    top_n = request.prefilter_top_n if request.prefilter_top_n is not None else config.get("top_n")
+    threshold = request.prefilter_threshold if request.prefilter_threshold is not None else config.get("threshold")
+    prefilter = ResumePrefilter(skill_weight=config.get("skill_weight", 0.6))
+    ranking = prefilter.rank(request.resumes, request.job_requirements)
+    selected = prefilter.select(ranking, top_n=top_n, threshold=threshold)
+    logger.info(f"本地预筛选完成: {len(selected)}/{len(request.resumes)} 份简历进入模型评估")
+    prefilter_info = {
+        item["resume_index"]: {k: v for k, v in item.items() if k != "resume_index"}
+        for item in ranking
+    }
+    return selected, prefilter_info
+
+def _filtered_result(resume_index: int, prefilter_info: dict) -> dict:
+    """未通过预筛选的简历结果"""
+    return {
+        "resume_index": resume_index,
+        "result": {
+            "status": "filtered",
+            "message": "预筛选分数未达到要求，未提交模型评估"
+        },
+        "prefilter": prefilter_info.get(resume_index)
+    }
+
 @router.post("/screen-resumes", response_model=ResumeScreenResponse)
 async def screen_resumes(request: ResumeScreenRequest):
-    # 检查Agent是否初始化成功
+    # 获取Agent（尚未创建时在此创建），检查是否初始化成功
+    agent = await get_agent_registry().aget("resume_screener")
     if agent is None:
         logger.error("ResumeScreenerAgent 未初始化")
         return ResumeScreenResponse(
@@ -36,12 +100,353 @@ async def screen_resumes(request: ResumeScreenRequest):
     
     try:
         logger.info("开始筛选简历")
-        results = agent.screen_resumes(request.resumes, request.job_requirements)
-        logger.info("简历筛选完成")
+        selected, prefilter_info = await run_in_threadpool(_run_prefilter, request)
+        selected_texts = [request.resumes[i] for i in selected]
+        if request.batch_mode:
+            screened = await agent.screen_resumes_batched_async(selected_texts, request.job_requirements)
+        else:
+            screened = await agent.screen_resumes_async(selected_texts, request.job_requirements)
+        
+        # 把子集结果映射回原始下标，未进入模型评估的简历标记为已过滤
+        results = [None] * len(request.resumes)
+        for item in screened:
+            resume_index = selected[item["resume_index"]]
+            results[resume_index] = {"resume_index": resume_index, "result": item["result"]}
+        for resume_index, item in enumerate(results):
+            if item is None:
+                results[resume_index] = _filtered_result(resume_index, prefilter_info)
+            elif prefilter_info:
+                item["prefilter"] = prefilter_info.get(resume_index)
+        prompt_tokens = {}
+        for item in screened:
+            _add_prompt_tokens(prompt_tokens, item["result"])
+        logger.info(f"简历筛选完成，简历压缩节省约{prompt_tokens.get('saved', 0)}个token")
         return ResumeScreenResponse(
             status="success",
-            data=results
+            data=results,
+            metadata={"prompt_tokens": prompt_tokens}
         )
     except Exception as e:
         logger.error(f"筛选简历时出错: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+class ResumeRescreenRequest(BaseModel):
+    resumes: list[str]
+    # 之前筛选时使用的职位要求（据此找到之前的筛选结果）
+    previous_requirements: dict
+    job_requirements: dict
+
+class ResumeRescreenResponse(BaseModel):
+    status: str
+    data: list = None
+    summary: dict = None
+    message: str = None
+
+@router.post("/rescreen-resumes", response_model=ResumeRescreenResponse)
+async def rescreen_resumes(request: ResumeRescreenRequest):
+    """
+    职位要求调整后增量重新筛选：要求未变的简历直接复用之前的结果，只有技能变化时在本地重算，
+    其他要求变化时只把受影响的维度发送给模型；没有之前结果的简历完整筛选
+    """
+    agent = await get_agent_registry().aget("resume_screener")
+    if agent is None:
+        logger.error("ResumeScreenerAgent 未初始化")
+        return ResumeRescreenResponse(
+            status="error",
+            message="服务初始化失败，请检查配置和API密钥"
+        )
+    
+    try:
+        started_at = time.monotonic()
+        results = await agent.rescreen_resumes_async(
+            request.resumes, request.previous_requirements, request.job_requirements
+        )
+        modes = {}
+        for item in results:
+            mode = item["result"].get("rescreen", {}).get("mode", "error")
+            modes[mode] = modes.get(mode, 0) + 1
+        summary = {
+            "diff": diff_requirements(request.previous_requirements, request.job_requirements),
+            "modes": modes,
+            "elapsed_seconds": round(time.monotonic() - started_at, 3)
+        }
+        logger.info(f"增量重新筛选完成: {modes}")
+        return ResumeRescreenResponse(status="success", data=results, summary=summary)
+    except Exception as e:
+        logger.error(f"重新筛选简历时出错: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+def _format_event(event: str, payload: dict, stream_format: str) -> str:
+    """按SSE或NDJSON格式编码一条流式事件"""
+    if stream_format == "sse":
+        return f"event: {event}\ndata: {dumps_json(payload)}\n\n"
+    return dumps_json({"event": event, **payload}) + "\n"
+
+async def _stream_screening_events(agent, request: ResumeScreenRequest, stream_format: str):
+    """逐份产出筛选结果，并附带进度事件和最终汇总事件"""
+    resumes = request.resumes
+    total = len(resumes)
+    completed = 0
+    failed = 0
+    started_at = time.monotonic()
+    prompt_tokens = {}
+    
+    try:
+        selected, prefilter_info = await run_in_threadpool(_run_prefilter, request)
+        selected_set = set(selected)
+        filtered = total - len(selected)
+        
+        # 未通过预筛选的简历立即返回
+        for resume_index in range(total):
+            if resume_index not in selected_set:
+                completed += 1
+                yield _format_event("result", _filtered_result(resume_index, prefilter_info), stream_format)
+        if filtered:
+            yield _format_event("progress", {"completed": completed, "total": total, "failed": failed}, stream_format)
+        
+        items = ((i, resumes[i]) for i in selected)
+        async for item in agent.iter_screen_resumes(items, request.job_requirements):
+            completed += 1
+            if item["result"].get("status") == "error":
+                failed += 1
+            _add_prompt_tokens(prompt_tokens, item["result"])
+            if prefilter_info:
+                item["prefilter"] = prefilter_info.get(item["resume_index"])
+            yield _format_event("result", item, stream_format)
+            yield _format_event("progress", {"completed": completed, "total": total, "failed": failed}, stream_format)
+        
+        yield _format_event("summary", {
+            "status": "success",
+            "total": total,
+            "succeeded": completed - failed - filtered,
+            "failed": failed,
+            "filtered": filtered,
+            "prompt_tokens": prompt_tokens,
+            "elapsed_seconds": round(time.monotonic() - started_at, 3)
+        }, stream_format)
+        logger.info(f"流式简历筛选完成: 共{total}份，失败{failed}份")
+    except Exception as e:
+        logger.error(f"流式简历筛选出错: {str(e)}", exc_info=True)
+        yield _format_event("error", {"status": "error", "message": f"简历筛选失败: {str(e)}"}, stream_format)
+
+@router.post("/screen-resumes/stream")
+async def screen_resumes_stream(
+    request: ResumeScreenRequest,
+    format: str = Query("ndjson", pattern="^(ndjson|sse)$", description="流式格式：ndjson 或 sse")
+):
+    """
+    流式筛选简历：每完成一份简历立即推送 {resume_index, result}，
+    并推送进度事件和最终汇总事件（该接口逐份筛选，忽略 batch_mode）
+    """
+    agent = await get_agent_registry().aget("resume_screener")
+    if agent is None:
+        logger.error("ResumeScreenerAgent 未初始化")
+        return ResumeScreenResponse(
+            status="error",
+            message="服务初始化失败，请检查配置和API密钥"
+        )
+    
+    logger.info(f"开始流式筛选简历: 共{len(request.resumes)}份")
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(
+        _stream_screening_events(agent, request, format),
+        media_type=media_type,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# 批量候选人表格支持的格式
+SPREADSHEET_EXTENSIONS = ('.xlsx', '.xlsm', '.xls', '.csv')
+
+def _remove_temp_file(file_path: str):
+    """删除上传的临时文件（可能已被删除）"""
+    try:
+        os.remove(file_path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"删除临时文件失败 {file_path}: {str(e)}")
+
+async def _stream_spreadsheet_events(agent, file_path: str, job_requirements: dict, sheet_name: Optional[str],
+                                     stream_format: str):
+    """边读取表格边筛选：每读到一行候选人记录即送入筛选，完成一份推送一份"""
+    records = {}
+    completed = 0
+    failed = 0
+    started_at = time.monotonic()
+    
+    async def items():
+        index = 0
+        async for record in aiter_candidate_records(file_path, sheet_name=sheet_name):
+            # 只保留在途记录，结果推送后即释放
+            records[index] = record
+            yield index, record["text"]
+            index += 1
+    
+    try:
+        async for item in agent.iter_screen_resumes(items(), job_requirements):
+            record = records.pop(item["resume_index"])
+            completed += 1
+            if item["result"].get("status") == "error":
+                failed += 1
+            item.update({"row": record["row"], "candidate": record["candidate"]})
+            yield _format_event("result", item, stream_format)
+            yield _format_event("progress", {"completed": completed, "failed": failed}, stream_format)
+        
+        yield _format_event("summary", {
+            "status": "success",
+            "total": completed,
+            "succeeded": completed - failed,
+            "failed": failed,
+            "elapsed_seconds": round(time.monotonic() - started_at, 3)
+        }, stream_format)
+        logger.info(f"表格简历筛选完成: 共{completed}行，失败{failed}行")
+    except Exception as e:
+        logger.error(f"表格简历筛选出错: {str(e)}", exc_info=True)
+        yield _format_event("error", {"status": "error", "message": f"表格筛选失败: {str(e)}"}, stream_format)
+    finally:
+        _remove_temp_file(file_path)
+
+@router.post("/screen-spreadsheet/stream")
+async def screen_spreadsheet_stream(
+    file: UploadFile = File(..., description="候选人表格（xlsx/xls/csv）"),
+    job_requirements: str = Form(..., description="职位要求（JSON字符串）"),
+    sheet_name: Optional[str] = Form(None, description="工作表名称，默认第一个工作表"),
+    format: str = Query("ndjson", pattern="^(ndjson|sse)$", description="流式格式：ndjson 或 sse")
+):
+    """
+    流式筛选批量候选人表格（如招聘网站导出的申请人列表）：
+    自动识别表头，每行作为一份候选人记录送入筛选，推送 {resume_index, row, candidate, result}
+    """
+    agent = await get_agent_registry().aget("resume_screener")
+    if agent is None:
+        logger.error("ResumeScreenerAgent 未初始化")
+        return ResumeScreenResponse(
+            status="error",
+            message="服务初始化失败，请检查配置和API密钥"
+        )
+    
+    _, ext = os.path.splitext(file.filename or "")
+    if ext.lower() not in SPREADSHEET_EXTENSIONS:
+        raise HTTPException(status_code=400, detail=f"不支持的表格格式: {ext}")
+    try:
+        requirements = json.loads(job_requirements)
+    except json.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"职位要求不是合法的JSON: {str(e)}")
+    
+    # 上传内容写入临时文件，由表格读取器流式读取
+    fd, file_path = tempfile.mkstemp(suffix=ext.lower())
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            await run_in_threadpool(shutil.copyfileobj, file.file, tmp)
+    except BaseException:
+        _remove_temp_file(file_path)
+        raise
+    
+    logger.info(f"开始流式筛选候选人表格: {file.filename}")
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    # 生成器未开始迭代（如客户端在响应开始前断开）时不会执行其中的清理，由响应结束后的后台任务兜底删除临时文件
+    return StreamingResponse(
+        _stream_spreadsheet_events(agent, file_path, requirements, sheet_name, format),
+        media_type=media_type,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(_remove_temp_file, file_path)
+    )
+
+# 持久化筛选任务：提交后由后台任务处理器逐份筛选，每完成一份写入检查点，
+# 浏览器关闭或服务重启后从未完成的简历继续，已完成的简历不会再次调用模型
+SCREENING_JOB_KIND = "screen_resumes"
+
+class ScreeningJobResponse(BaseModel):
+    status: str
+    data: dict = None
+    message: str = None
+
+async def _run_screening_job(job: dict, items):
+    """任务处理函数：逐份筛选待处理的简历，产出 (简历下标, 结果, 是否失败)"""
+    agent = await get_agent_registry().aget("resume_screener")
+    if agent is None:
+        raise RuntimeError("ResumeScreenerAgent 未初始化")
+    async for item in agent.iter_screen_resumes(items, job["payload"]["job_requirements"]):
+        yield item["resume_index"], item["result"], item["result"].get("status") == "error"
+
+register_job_handler(SCREENING_JOB_KIND, _run_screening_job)
+
+def _job_summary(job: dict) -> dict:
+    """对外返回的任务状态（不包含提交内容）"""
+    return {k: v for k, v in job.items() if k not in ("payload", "kind", "heartbeat_at")}
+
+def _get_job_or_404(job_id: str) -> dict:
+    job = get_job_queue().get(job_id)
+    if job is None or job["kind"] != SCREENING_JOB_KIND:
+        raise HTTPException(status_code=404, detail=f"任务不存在: {job_id}")
+    return job
+
+@router.post("/jobs", response_model=ScreeningJobResponse)
+async def submit_screening_job(request: ResumeScreenRequest):
+    """
+    提交持久化筛选任务，立即返回任务ID；通过 GET /jobs/{job_id} 查询进度，
+    GET /jobs/{job_id}/results 分页获取结果（逐份筛选，忽略 batch_mode）
+    """
+    selected, prefilter_info = await run_in_threadpool(_run_prefilter, request)
+    selected_set = set(selected)
+    precomputed = {
+        resume_index: _filtered_result(resume_index, prefilter_info)["result"]
+        for resume_index in range(len(request.resumes)) if resume_index not in selected_set
+    }
+    payload = {"job_requirements": request.job_requirements, "prefilter": prefilter_info}
+    job_id = await run_in_threadpool(
+        get_job_queue().submit, SCREENING_JOB_KIND, request.resumes, payload, precomputed
+    )
+    get_job_worker().notify()
+    logger.info(f"已提交筛选任务 {job_id}: 共{len(request.resumes)}份简历，{len(selected)}份待模型评估")
+    return ScreeningJobResponse(
+        status="success",
+        data={"job_id": job_id, "total": len(request.resumes), "queued": len(selected)}
+    )
+
+@router.get("/jobs/{job_id}", response_model=ScreeningJobResponse)
+async def get_screening_job(job_id: str):
+    """查询任务状态和进度"""
+    job = await run_in_threadpool(_get_job_or_404, job_id)
+    return ScreeningJobResponse(status="success", data=_job_summary(job))
+
+@router.get("/jobs/{job_id}/results", response_model=ScreeningJobResponse)
+async def get_screening_job_results(
+    job_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000)
+):
+    """按简历下标顺序分页获取已完成的结果（任务运行中也可获取已完成的部分）"""
+    job = await run_in_threadpool(_get_job_or_404, job_id)
+    items = await run_in_threadpool(get_job_queue().results, job_id, offset, limit)
+    prefilter_info = job["payload"].get("prefilter") or {}
+    for item in items:
+        # 预筛选信息以JSON保存，键为字符串形式的下标
+        if prefilter_info:
+            item["prefilter"] = prefilter_info.get(str(item["resume_index"]))
+    return ScreeningJobResponse(
+        status="success",
+        data={**_job_summary(job), "offset": offset, "results": items}
+    )
+
+@router.post("/jobs/{job_id}/cancel", response_model=ScreeningJobResponse)
+async def cancel_screening_job(job_id: str):
+    """取消任务，已完成的结果保留"""
+    job = await run_in_threadpool(_get_job_or_404, job_id)
+    cancelled = await run_in_threadpool(get_job_queue().cancel, job_id)
+    if not cancelled:
+        return ScreeningJobResponse(status="error", message=f"任务已结束（{job['status']}），无法取消")
+    logger.info(f"已取消筛选任务 {job_id}")
+    job = await run_in_threadpool(_get_job_or_404, job_id)
+    return ScreeningJobResponse(status="success", data=_job_summary(job))
+
+@router.post("/jobs/{job_id}/retry-failed", response_model=ScreeningJobResponse)
+async def retry_failed_screening_items(job_id: str):
+    """重新筛选出错的简历（如遇到限流）以及任务失败时尚未处理的简历，已成功的简历不会重复调用模型"""
+    job = await run_in_threadpool(_get_job_or_404, job_id)
+    retried = await run_in_threadpool(get_job_queue().retry_failed, job_id)
+    if not retried:
+        return ScreeningJobResponse(status="error", message=f"任务状态为 {job['status']}，没有可重试的简历")
+    get_job_worker().notify()
+    logger.info(f"筛选任务 {job_id} 重新排队: {retried}份待处理的简历")
+    return ScreeningJobResponse(status="success", data={"job_id": job_id, "retried": retried})
@@ -0,0 +1,304 @@
+# backend/batch_screen.py
+"""
+离线批量筛选：不经过HTTP服务，直接解析并筛选一个目录或zip包中的全部简历
+结果逐行追加到JSONL文件，中断后重新运行会跳过已处理的文件（出错的文件会重新处理）
+用法：python batch_screen.py 简历目录或zip包 --jd 职位描述文件 --output results.jsonl [--parquet results.parquet]
+职位描述文件可以是 JSON/YAML 格式的职位要求，也可以是 TXT/PDF/DOCX 格式的职位描述原文
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import zipfile
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import yaml
+from dotenv import load_dotenv
+
+from utils.document_parser import DocumentParser
+from utils.json_response import dumps as dumps_json
+from utils.skill_matcher import get_skill_matcher
+
+# 将NeMo-Agent-Toolkit添加到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'NeMo-Agent-Toolkit', 'src'))
+
+RESUME_EXTENSIONS = (".pdf", ".docx", ".txt")
+# 每批提交给解析进程池的文件数，解析结果在筛选完成前驻留内存，分批可限制内存占用
+DEFAULT_PARSE_CHUNK = 200
+
+
+def load_job_requirements(jd_path: str) -> Dict:
+    """读取职位要求：JSON/YAML 直接使用，其他格式解析为原文并在本地提取技能"""
+    ext = os.path.splitext(jd_path)[1].lower()
+    if ext == ".json":
+        with open(jd_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    if ext in (".yml", ".yaml"):
+        with open(jd_path, "r", encoding="utf-8") as f:
+            return yaml.safe_load(f) or {}
+    text = DocumentParser.parse_document(jd_path)
+    return {"description": text, "skills": get_skill_matcher().find_skills(text)}
+
+
+def load_processed(output_path: str) -> Dict[str, Dict]:
+    """读取已有输出，返回 {文件: 最后一条记录}（同一文件重复处理时以最后一条为准）"""
+    processed = {}
+    if not os.path.exists(output_path):
+        return processed
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # 上次中断时可能留下写了一半的行
+                continue
+            processed[record["file"]] = record
+    return processed
+
+
+def list_resume_files(source: str) -> List[str]:
+    """列出目录（递归）或zip包中的简历文件，返回相对路径，按名称排序"""
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            names = [info.filename for info in archive.infolist() if not info.is_dir()]
+    else:
+        names = [
+            os.path.relpath(os.path.join(root, name), source)
+            for root, _, files in os.walk(source) for name in files
+        ]
+    return sorted(name for name in names if name.lower().endswith(RESUME_EXTENSIONS))
+
+
+class ProgressReporter:
+    """定期输出处理进度、吞吐量和预计剩余时间"""
+
+    def __init__(self, total: int, skipped: int, interval: float = 5.0):
+        self.total = total
+        self.skipped = skipped
+        self.interval = interval
+        self.started_at = time.monotonic()
+        self.last_report = self.started_at
+        self.counts = {"success": 0, "error": 0, "parse_error": 0}
+        self.parse_cached = 0
+
+    @property
+    def done(self) -> int:
+        return sum(self.counts.values())
+
+    def record(self, status: str, parse_cached: bool = False):
+        self.counts[status] = self.counts.get(status, 0) + 1
+        self.parse_cached += int(parse_cached)
+        if time.monotonic() - self.last_report >= self.interval:
+            self.report()
+
+    def report(self, final: bool = False):
+        self.last_report = time.monotonic()
+        elapsed = max(self.last_report - self.started_at, 1e-6)
+        rate = self.done / elapsed
+        remaining = self.total - self.done
+        eta = f"{remaining / rate:.0f}秒" if rate > 0 else "未知"
+        prefix = "处理完成" if final else "进度"
+        print(
+            f"{prefix}: {self.done}/{self.total}（跳过已处理{self.skipped}份），"
+            f"成功{self.counts['success']}，筛选出错{self.counts['error']}，解析出错{self.counts['parse_error']}，"
+            f"解析缓存命中{self.parse_cached}，{rate * 60:.1f}份/分钟，"
+            f"用时{elapsed:.0f}秒" + ("" if final else f"，预计剩余{eta}"),
+            flush=True
+        )
+
+
+class BatchScreener:
+    """离线批量筛选：分批并行解析，按并发上限筛选，每完成一份立即追加到输出文件"""
+
+    def __init__(self, agent, job_requirements: Dict, output_path: str, concurrency: Optional[int] = None,
+                 parse_workers: Optional[int] = None, parse_chunk: int = DEFAULT_PARSE_CHUNK):
+        self.agent = agent
+        self.job_requirements = job_requirements
+        self.output_path = output_path
+        self.concurrency = concurrency
+        self.parse_workers = parse_workers
+        self.parse_chunk = max(1, parse_chunk)
+
+    def _iter_parsed(self, source_dir: str, names: List[str]) -> Iterator[Dict]:
+        """分批解析，每批用进程池并行（按完成顺序产出）"""
+        for start in range(0, len(names), self.parse_chunk):
+            chunk = [os.path.join(source_dir, name) for name in names[start:start + self.parse_chunk]]
+            yield from DocumentParser.parse_documents(chunk, max_workers=self.parse_workers)
+
+    async def _aiter_resumes(self, source_dir: str, names: List[str], parse_failures: List[Dict],
+                             files: Dict[int, Tuple[str, Dict]]):
+        """解析在线程中进行，不阻塞筛选；解析失败的文件不提交筛选，由调用方直接写出"""
+        loop = asyncio.get_running_loop()
+        parsed = self._iter_parsed(source_dir, names)
+        index = 0
+        while True:
+            result = await loop.run_in_executor(None, next, parsed, None)
+            if result is None:
+                return
+            name = os.path.relpath(result["file_path"], source_dir)
+            if result["status"] != "success":
+                parse_failures.append({"file": name, "status": "parse_error", "message": result["message"]})
+                continue
+            files[index] = (name, result)
+            yield index, result["text"]
+            index += 1
+
+    async def run(self, source_dir: str, names: List[str], reporter: ProgressReporter):
+        parse_failures: List[Dict] = []
+        files: Dict[int, Tuple[str, Dict]] = {}
+        items = self._aiter_resumes(source_dir, names, parse_failures, files)
+        with open(self.output_path, "a", encoding="utf-8") as output:
+            if _ends_without_newline(self.output_path):
+                # 上次中断时写了一半的行单独成行，不影响之后追加的记录
+                output.write("\n")
+
+            def write(record: Dict):
+                record["processed_at"] = time.time()
+                output.write(dumps_json(record) + "\n")
+                # 每条记录立即落盘，进程中断时最多丢失正在处理的简历
+                output.flush()
+
+            results = self.agent.iter_screen_resumes(items, self.job_requirements, max_concurrency=self.concurrency)
+            try:
+                async for item in results:
+                    while parse_failures:
+                        failure = parse_failures.pop()
+                        write(failure)
+                        reporter.record("parse_error")
+                    name, parsed = files.pop(item["resume_index"])
+                    result = item["result"]
+                    status = "error" if result.get("status") == "error" else "success"
+                    write({
+                        "file": name,
+                        "content_hash": parsed["content_hash"],
+                        "status": status,
+                        "result": result
+                    })
+                    reporter.record(status, parsed.get("cached", False))
+            finally:
+                await results.aclose()
+            for failure in parse_failures:
+                write(failure)
+                reporter.record("parse_error")
+
+
+def _ends_without_newline(path: str) -> bool:
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() == 0:
+            return False
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) != b"\n"
+
+
+def _extract_zip(source: str, names: List[str], target_dir: str):
+    """只解压需要处理的文件（跳过已处理的文件），并防止路径穿越"""
+    root = os.path.realpath(target_dir)
+    with zipfile.ZipFile(source) as archive:
+        for name in names:
+            if not os.path.realpath(os.path.join(root, name)).startswith(root + os.sep):
+                raise ValueError(f"zip包中包含非法路径: {name}")
+            archive.extract(name, target_dir)
+
+
+def _match_score(result: Dict) -> Optional[float]:
+    """从模型返回的JSON中取出匹配分数（无法解析时为空）"""
+    raw = result.get("raw_response")
+    if not isinstance(raw, str):
+        return None
+    try:
+        score = json.loads(raw.strip().removeprefix("```json").removesuffix("```")).get("match_score")
+        return float(score) if score is not None else None
+    except (ValueError, AttributeError):
+        return None
+
+
+def write_parquet(output_path: str, parquet_path: str):
+    """把JSONL结果（每个文件取最后一条记录）转换为Parquet，需要安装 pandas 和 pyarrow"""
+    try:
+        import pandas as pd
+    except ImportError:
+        print("未安装pandas，跳过Parquet输出")
+        return
+    rows = []
+    for record in load_processed(output_path).values():
+        result = record.get("result") or {}
+        rows.append({
+            "file": record["file"],
+            "content_hash": record.get("content_hash"),
+            "status": record["status"],
+            "match_score": _match_score(result),
+            "matched_skills": (result.get("skills_match") or {}).get("matched_skills"),
+            "missing_skills": (result.get("skills_match") or {}).get("missing_skills"),
+            "message": record.get("message") or result.get("message"),
+            "result": dumps_json(result) if result else None,
+            "processed_at": record.get("processed_at")
+        })
+    try:
+        pd.DataFrame(rows).to_parquet(parquet_path, index=False)
+    except ImportError as e:
+        print(f"写入Parquet失败（需要安装pyarrow或fastparquet）: {e}")
+        return
+    print(f"已写入Parquet: {parquet_path}（{len(rows)}行）")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="离线批量筛选简历（可中断后继续）")
+    parser.add_argument("source", help="简历目录（递归查找PDF/DOCX/TXT）或zip包")
+    parser.add_argument("--jd", required=True, help="职位要求文件：JSON/YAML，或TXT/PDF/DOCX格式的职位描述")
+    parser.add_argument("--output", default="screening_results.jsonl", help="结果文件（JSONL，追加写入）")
+    parser.add_argument("--parquet", help="处理完成后同时输出Parquet文件")
+    parser.add_argument("--concurrency", type=int, help="同时筛选的简历数（默认使用 screening.max_concurrency）")
+    parser.add_argument("--parse-workers", type=int, help="解析进程数（默认使用 document_parsing.max_workers）")
+    parser.add_argument("--parse-chunk", type=int, default=DEFAULT_PARSE_CHUNK, help="每批解析的文件数")
+    parser.add_argument("--retry-errors", action=argparse.BooleanOptionalAction, default=True,
+                        help="重新运行时是否重新处理上次出错的文件")
+    parser.add_argument("--progress-interval", type=float, default=5.0, help="进度输出间隔（秒）")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    load_dotenv()
+    if not os.path.exists(args.source):
+        sys.exit(f"找不到简历目录或zip包: {args.source}")
+
+    job_requirements = load_job_requirements(args.jd)
+    processed = load_processed(args.output)
+    names = list_resume_files(args.source)
+    done = {
+        name for name, record in processed.items()
+        if not (args.retry_errors and record["status"] in ("error", "parse_error"))
+    }
+    pending = [name for name in names if name not in done]
+    print(f"共{len(names)}份简历，已处理{len(names) - len(pending)}份，本次处理{len(pending)}份")
+
+    if pending:
+        from agents.resume_agent import ResumeScreenerAgent
+        screener = BatchScreener(
+            ResumeScreenerAgent(), job_requirements, args.output,
+            concurrency=args.concurrency, parse_workers=args.parse_workers, parse_chunk=args.parse_chunk
+        )
+        reporter = ProgressReporter(len(pending), len(names) - len(pending), args.progress_interval)
+        try:
+            if zipfile.is_zipfile(args.source):
+                with tempfile.TemporaryDirectory(prefix="batch_screen_") as temp_dir:
+                    _extract_zip(args.source, pending, temp_dir)
+                    asyncio.run(screener.run(temp_dir, pending, reporter))
+            else:
+                asyncio.run(screener.run(args.source, pending, reporter))
+        except KeyboardInterrupt:
+            print("已中断，重新运行同样的命令即可从未处理的简历继续")
+            reporter.report(final=True)
+            sys.exit(130)
+        reporter.report(final=True)
+
+    if args.parquet:
+        write_parquet(args.output, args.parquet)
+
+
+if __name__ == "__main__":
+    main()
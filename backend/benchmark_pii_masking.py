@@ -0,0 +1,68 @@
+# backend/benchmark_pii_masking.py
+"""
+敏感信息遮蔽吞吐量基准：对比旧实现（每类信息一次 re.sub）与单次扫描的 PIIMasker
+用法：python benchmark_pii_masking.py [简历份数] [重复次数]
+"""
+import random
+import re
+import sys
+import time
+
+from utils.data_security import PIIMasker
+
+
+def legacy_mask(text: str) -> str:
+    """旧版 DataSecurity.mask_sensitive_info 实现"""
+    text = re.sub(r'1[3-9]\d{9}', '1**********', text)
+    text = re.sub(r'[\w\.-]+@[\w\.-]+', '***@***.***', text)
+    text = re.sub(r'\d{17}[\dXx]', '******************', text)
+    return text
+
+
+def make_resumes(count: int, seed: int = 42) -> list:
+    """生成带有手机号、邮箱、身份证号的模拟简历"""
+    rng = random.Random(seed)
+    body = (
+        "2019.07 - 2021.12 某科技公司 后端工程师，负责Python服务开发，日均处理请求1000万次。\n"
+        "2022.01 - 至今 某互联网公司 高级工程师，使用Go、Kubernetes构建推荐系统。\n"
+        "熟悉Python、Java、Docker、Redis、MySQL，英语六级。\n"
+    )
+    resumes = []
+    for i in range(count):
+        phone = f"1{rng.randint(3, 9)}{rng.randint(0, 999999999):09d}"
+        id_card = f"{rng.randint(110000, 659999)}19{rng.randint(70, 99)}0{rng.randint(1, 9)}1{rng.randint(0, 9)}{rng.randint(0, 9999):04d}"
+        resumes.append(
+            f"候选人{i} 个人简历\n电话：{phone}  邮箱：user{i}@example.com  身份证：{id_card}\n"
+            + body * rng.randint(2, 6)
+        )
+    return resumes
+
+
+def run(label: str, func, resumes: list, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(resumes)
+        best = min(best, time.perf_counter() - started)
+    size_mb = sum(len(r.encode("utf-8")) for r in resumes) / 1024 / 1024
+    print(f"{label:<28}{len(resumes) / best:>12.0f} 份/秒{size_mb / best:>10.1f} MB/秒")
+    return best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    resumes = make_resumes(count)
+    masker = PIIMasker()
+    all_types = PIIMasker(["id_card", "phone", "email", "bank_card", "wechat", "address"])
+
+    print(f"简历份数: {count}，取 {repeat} 次中的最好成绩")
+    legacy = run("旧实现（三次 re.sub）", lambda texts: [legacy_mask(t) for t in texts], resumes, repeat)
+    single = run("PIIMasker.mask", lambda texts: [masker.mask(t) for t in texts], resumes, repeat)
+    batch = run("PIIMasker.mask_batch", masker.mask_batch, resumes, repeat)
+    run("PIIMasker（全部6种类型）", all_types.mask_batch, resumes, repeat)
+    print(f"加速比: mask {legacy / single:.2f}x，mask_batch {legacy / batch:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
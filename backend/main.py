@@ -2,19 +2,40 @@
 import sys
 import os
 
-# 将NeMo-Agent-Toolkit添加到Python路径
+from utils.startup_timer import get_startup_timer
+
+# 启动耗时记录（各模块导入、智能体创建耗时见 /metrics 的 startup 字段）
+startup_timer = get_startup_timer()
+
+# 将NeMo-Agent-Toolkit添加到Python路径（工具包在智能体首次使用或后台预热时才导入）
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'NeMo-Agent-Toolkit', 'src'))
 
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from api.job_parser import router as job_router
-from api.resume_screener import router as resume_router
+with startup_timer.stage("fastapi", "import"):
+    from fastapi import FastAPI
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.responses import JSONResponse
+job_router = startup_timer.import_module("api.job_parser").router
+resume_router = startup_timer.import_module("api.resume_screener").router
+from utils.agent_executor import get_agent_executor, shutdown_agent_executor
+from utils.agent_registry import get_agent_registry
+from utils.api_key_manager import get_api_key_manager
+from utils.app_config import get_app_config
+from utils.job_queue import get_job_worker, start_job_worker, stop_job_worker
+from utils.json_response import FastJSONResponse
+from utils.llm_cache import get_llm_cache
+from utils.llm_configs import get_llm_config_cache
+from utils.llm_governor import get_llm_governor
+from utils.parse_cache import get_parse_cache
+from utils.retention import get_retention_index, start_retention_sweeper, stop_retention_sweeper
+from utils.screening_artifacts import get_screening_artifacts
+from utils.server_profile import PROFILES, build_uvicorn_options, worker_count
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
-import os
-import yaml
 import logging
 
+# 后台预热时导入的重量级依赖（文档解析库）
+WARM_UP_MODULES = ("PyPDF2", "docx", "openpyxl")
+
 # 配置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -22,26 +43,40 @@ logger = logging.getLogger(__name__)
 # 加载环境变量
 load_dotenv()
 
-app = FastAPI(title="HR Assistant API", description="中小微企业智能招聘助手API")
-
-# 从环境变量获取配置
-SERVICE_PORT = int(os.getenv("SERVICE_PORT", "8000"))
-DEBUG_MODE = os.getenv("DEBUG_MODE", "False").lower() == "true"
-
-# 从配置文件加载模型配置
-try:
-    with open("configs/recruitment_config.yml", "r") as f:
-        config = yaml.safe_load(f)
-    app.state.model_config = config["models"]["qwen"]
-    logger.info("配置文件加载成功")
-except Exception as e:
-    logger.warning(f"警告: 无法加载配置文件: {e}")
-    app.state.model_config = {
-        "model_name": "qwen-plus",
-        "base_url": "https://dashscope.aliyuncs.com/compatible-mode/v1",
-        "temperature": 0.7,
-        "max_tokens": 2048
-    }
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """工作进程启动时开启后台预热、过期简历清理和任务处理，停止时依次关闭"""
+    startup_timer.mark("app_started")
+    logger.info(f"工作进程已启动: pid={os.getpid()}, 工作进程数={worker_count()}")
+    # 后台导入重量级依赖并创建智能体，预热期间即可接收请求（/ready 返回503）
+    if get_app_config().service.warm_up:
+        get_agent_registry().start_warm_up(WARM_UP_MODULES)
+    # 后台按到期时间分批清理过期简历
+    start_retention_sweeper()
+    # 后台处理持久化筛选任务（含上次未完成的任务）
+    start_job_worker()
+    yield
+    # 运行中的任务放回队列，由下次启动或其他工作进程继续
+    await stop_job_worker()
+    stop_retention_sweeper()
+    # 写入内存中尚未落盘的缓存命中统计
+    get_llm_cache().flush()
+    shutdown_agent_executor(wait=False)
+
+# 默认使用orjson序列化响应（大批量筛选结果）
+app = FastAPI(
+    title="HR Assistant API",
+    description="中小微企业智能招聘助手API",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan
+)
+
+# 从环境变量获取配置（未设置时使用配置文件 service 中的值）
+SERVICE_PORT = int(os.getenv("SERVICE_PORT", get_app_config().service.port))
+DEBUG_MODE = os.getenv("DEBUG_MODE", str(get_app_config().service.debug)).lower() == "true"
+
+# 从共享配置对象读取模型配置（配置文件缺失时使用默认的Qwen配置）
+app.state.model_config = get_app_config().model("qwen").to_dict()
 
 # 检查必要的环境变量
 required_env_vars = ["QWEN_API_KEY"]
@@ -79,7 +114,50 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/ready")
+async def readiness_check():
+    """就绪检查：后台预热完成且必需的智能体均已创建时返回200，否则返回503（进程存活检查使用 /health）"""
+    registry = get_agent_registry()
+    ready = registry.ready()
+    if ready:
+        status = "ready"
+    else:
+        status = "not_ready" if registry.warmed_up else "warming_up"
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": status, "agents": registry.status()}
+    )
+
+# 统计需要查询多个SQLite数据库，定义为普通函数，由线程池执行，不阻塞事件循环
+@app.get("/metrics")
+def metrics():
+    """运行指标：智能体执行器排队深度、LLM缓存和解析缓存命中率、过期简历清理情况、API密钥请求量、LLM调用并发上限、共享模型配置复用情况、启动耗时、持久化任务数、筛选中间结果数等"""
+    return {
+        "agent_executor": get_agent_executor().stats(),
+        "llm_cache": get_llm_cache().stats(),
+        "parse_cache": get_parse_cache().stats(),
+        "retention": get_retention_index().stats(),
+        "api_key_usage": get_api_key_manager().usage_metrics(),
+        "api_key_pools": get_api_key_manager().key_pool_metrics(),
+        "llm_governor": get_llm_governor().stats(),
+        "llm_configs": get_llm_config_cache().stats(),
+        "agents": get_agent_registry().status(),
+        "job_queue": get_job_worker().stats(),
+        "screening_artifacts": get_screening_artifacts().stats(),
+        "startup": startup_timer.report()
+    }
+
 if __name__ == "__main__":
+    import argparse
     import uvicorn
-    logger.info(f"启动服务: host=0.0.0.0, port={SERVICE_PORT}, debug={DEBUG_MODE}")
-    uvicorn.run("main:app", host="0.0.0.0", port=SERVICE_PORT, reload=DEBUG_MODE)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="启动招聘助手API服务")
+    parser.add_argument(
+        "--profile",
+        choices=PROFILES,
+        default=os.getenv("SERVICE_PROFILE", get_app_config().service.profile),
+        help="运行模式：development 单进程，production 多进程并启用uvloop/httptools、优雅停机和工作进程定期重启"
+    )
+    args = parser.parse_args()
+    options = build_uvicorn_options(get_app_config().service, args.profile, port=SERVICE_PORT, debug=DEBUG_MODE)
+    logger.info(f"启动服务: profile={args.profile}, {', '.join(f'{k}={v}' for k, v in options.items())}")
+    uvicorn.run("main:app", **options)
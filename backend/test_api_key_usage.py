@@ -0,0 +1,57 @@
+# backend/test_api_key_usage.py
+import asyncio
+import os
+import unittest
+
+from fastapi.testclient import TestClient
+
+from utils.api_key_manager import APIKeyManager, get_api_key_manager
+
+
+class TestAPIKeyUsage(unittest.TestCase):
+    def setUp(self):
+        # 密钥池从环境变量读取密钥
+        os.environ["QWEN_API_KEYS"] = "usage-test-key-1,usage-test-key-2"
+
+    def test_lease_records_usage_per_key(self):
+        """通过密钥池占用的请求计入服务和对应密钥的请求量"""
+        manager = APIKeyManager()
+        pool = manager.get_key_pool("qwen")
+        with pool.lease() as lease:
+            key_name = lease.key.name
+        metrics = manager.usage_metrics()
+        self.assertEqual(metrics["qwen"]["total"], 1)
+        self.assertEqual(metrics[f"qwen:{key_name}"]["total"], 1)
+        self.assertEqual(metrics[f"qwen:{key_name}:completed"]["total"], 1)
+        self.assertEqual(manager.check_key_usage("qwen")["total_requests"], 1)
+
+    def test_failed_lease_records_outcome(self):
+        """异步租约中调用失败时按失败结果记录"""
+        manager = APIKeyManager()
+        pool = manager.get_key_pool("qwen")
+
+        async def call():
+            async with pool.lease_async() as lease:
+                raise ValueError(lease.key.name)
+
+        with self.assertRaises(ValueError) as ctx:
+            asyncio.run(call())
+        key_name = str(ctx.exception)
+        metrics = manager.usage_metrics()
+        self.assertEqual(metrics[f"qwen:{key_name}"]["total"], 1)
+        self.assertEqual(metrics[f"qwen:{key_name}:failed"]["total"], 1)
+        self.assertNotIn(f"qwen:{key_name}:completed", metrics)
+
+    def test_leased_call_in_metrics_endpoint(self):
+        """/metrics 的 api_key_usage 包含通过密钥池发出的请求"""
+        from main import app
+
+        with get_api_key_manager().get_key_pool("qwen").lease() as lease:
+            key_name = lease.key.name
+        usage = TestClient(app).get("/metrics").json()["api_key_usage"]
+        self.assertGreaterEqual(usage["qwen"]["total"], 1)
+        self.assertGreaterEqual(usage[f"qwen:{key_name}"]["total"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
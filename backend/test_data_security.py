@@ -0,0 +1,176 @@
+# backend/test_data_security.py
+import base64
+import io
+import os
+import unittest
+
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from benchmark_pii_masking import legacy_mask, make_resumes
+from utils.data_security import DataSecurity, PIIMasker, StreamDecryptor, StreamEncryptor
+
+CHUNK_SIZE = 64
+
+
+def _encrypt(key: bytes, plaintext: bytes, piece_size: int, chunk_size: int = CHUNK_SIZE) -> bytes:
+    """按 piece_size 分片输入加密器"""
+    encryptor = StreamEncryptor(key, chunk_size)
+    out = [encryptor.update(plaintext[i:i + piece_size]) for i in range(0, len(plaintext), piece_size)]
+    out.append(encryptor.finalize())
+    return b"".join(out)
+
+
+def _decrypt(key: bytes, ciphertext: bytes, piece_size: int) -> bytes:
+    decryptor = StreamDecryptor(key)
+    out = [decryptor.update(ciphertext[i:i + piece_size]) for i in range(0, len(ciphertext), piece_size)]
+    decryptor.finalize()
+    return b"".join(out)
+
+
+class TestStreamEncryption(unittest.TestCase):
+    def setUp(self):
+        self.key = AESGCM.generate_key(bit_length=256)
+
+    def test_round_trip_across_frame_boundaries(self):
+        """明文长度为空、不足一帧、恰好整帧和跨多帧时，任意分片方式都能还原"""
+        for length in (0, 1, CHUNK_SIZE - 1, CHUNK_SIZE, CHUNK_SIZE + 1, CHUNK_SIZE * 3, CHUNK_SIZE * 3 + 17):
+            plaintext = os.urandom(length)
+            for piece_size in (1, 7, CHUNK_SIZE, CHUNK_SIZE + 5, 10000):
+                with self.subTest(length=length, piece_size=piece_size):
+                    ciphertext = _encrypt(self.key, plaintext, piece_size)
+                    self.assertEqual(_decrypt(self.key, ciphertext, piece_size), plaintext)
+                    self.assertEqual(_decrypt(self.key, ciphertext, 3), plaintext)
+
+    def test_file_stream_round_trip(self):
+        """encrypt_stream/decrypt_stream 按文件流往返"""
+        security = DataSecurity()
+        plaintext = os.urandom(CHUNK_SIZE * 5 + 3)
+        encrypted = io.BytesIO()
+        security.encrypt_stream(io.BytesIO(plaintext), encrypted, chunk_size=CHUNK_SIZE)
+        decrypted = io.BytesIO()
+        written = security.decrypt_stream(io.BytesIO(encrypted.getvalue()), decrypted, chunk_size=CHUNK_SIZE)
+        self.assertEqual(written, len(plaintext))
+        self.assertEqual(decrypted.getvalue(), plaintext)
+
+    def test_rejects_tampered_stream(self):
+        """任意位置的字节被修改都会被发现"""
+        ciphertext = _encrypt(self.key, os.urandom(CHUNK_SIZE * 3), CHUNK_SIZE)
+        for position in (5, 20, 40, len(ciphertext) // 2, len(ciphertext) - 1):
+            with self.subTest(position=position):
+                tampered = bytearray(ciphertext)
+                tampered[position] ^= 0x01
+                with self.assertRaises(ValueError):
+                    _decrypt(self.key, bytes(tampered), 16)
+
+    def test_rejects_wrong_key(self):
+        ciphertext = _encrypt(self.key, b"resume attachment", 5)
+        with self.assertRaises(ValueError):
+            _decrypt(AESGCM.generate_key(bit_length=256), ciphertext, 5)
+
+    def test_rejects_truncated_stream(self):
+        """截断在帧中间或整帧边界、丢弃结束帧都会在 finalize 时报错"""
+        plaintext = os.urandom(CHUNK_SIZE * 3 + 10)
+        ciphertext = _encrypt(self.key, plaintext, CHUNK_SIZE)
+        frame_size = 5 + CHUNK_SIZE + 16
+        header_size = 17
+        for length in (0, 10, header_size, header_size + 3, header_size + frame_size,
+                       header_size + frame_size * 3, len(ciphertext) - 1):
+            with self.subTest(length=length):
+                with self.assertRaises(ValueError):
+                    _decrypt(self.key, ciphertext[:length], 8)
+
+    def test_rejects_reordered_and_appended_frames(self):
+        """交换两帧或在结束帧之后追加数据都会被拒绝"""
+        ciphertext = _encrypt(self.key, os.urandom(CHUNK_SIZE * 3), CHUNK_SIZE)
+        header, frames = ciphertext[:17], ciphertext[17:]
+        frame_size = 5 + CHUNK_SIZE + 16
+        first, second = frames[:frame_size], frames[frame_size:frame_size * 2]
+        with self.assertRaises(ValueError):
+            _decrypt(self.key, header + second + first + frames[frame_size * 2:], 32)
+        with self.assertRaises(ValueError):
+            _decrypt(self.key, ciphertext + frames[:frame_size], 32)
+
+
+class TestResumeEncryption(unittest.TestCase):
+    def setUp(self):
+        os.environ["ENCRYPTION_KEY"] = "test-encryption-key"
+        self.security = DataSecurity()
+
+    def tearDown(self):
+        os.environ.pop("ENCRYPTION_KEY", None)
+
+    def test_round_trip(self):
+        text = "张三\n手机：13812345678\n工作经历：5年Python开发"
+        token = self.security.encrypt_resume(text)
+        self.assertTrue(token.startswith("gAAAAA"))
+        self.assertEqual(self.security.decrypt_resume(token), text)
+
+    def test_decrypts_legacy_double_base64(self):
+        """旧版本在Fernet令牌外又做了一次base64编码"""
+        text = "李四 Java 工程师"
+        legacy = base64.urlsafe_b64encode(self.security.cipher.encrypt(text.encode())).decode()
+        self.assertFalse(legacy.startswith("gAAAAA"))
+        self.assertEqual(self.security.decrypt_resume(legacy), text)
+
+    def test_same_key_across_instances(self):
+        """相同的 ENCRYPTION_KEY 在新实例（如重启后）中仍能解密"""
+        token = self.security.encrypt_resume("王五")
+        self.assertEqual(DataSecurity().decrypt_resume(token), "王五")
+
+
+class TestPIIMasker(unittest.TestCase):
+    def setUp(self):
+        self.masker = PIIMasker()
+
+    def test_phone_digit_boundaries(self):
+        """手机号只按完整的 11 位数字匹配，允许 +86/86 前缀"""
+        self.assertEqual(self.masker.mask("电话13812345678。"), "电话1**********。")
+        self.assertEqual(self.masker.mask("a13812345678b"), "a1**********b")
+        self.assertEqual(self.masker.mask("+86 13812345678"), "1**********")
+        self.assertEqual(self.masker.mask("+86-13812345678"), "1**********")
+        self.assertEqual(self.masker.mask("8613812345678"), "1**********")
+        # 更长数字串中的片段不是手机号
+        for text in ("138123456789", "913812345678", "订单号2023138123456789"):
+            self.assertEqual(self.masker.mask(text), text)
+
+    def test_id_card_digit_boundaries(self):
+        """身份证号只按完整的 18 位匹配，且不会被当作手机号局部遮蔽"""
+        self.assertEqual(self.masker.mask("身份证110101199003074518"), "身份证******************")
+        self.assertEqual(self.masker.mask("11010119900307451X号"), "******************号")
+        self.assertEqual(self.masker.mask("1101011990030745181"), "1101011990030745181")
+        self.assertEqual(self.masker.mask("9110101199003074518"), "9110101199003074518")
+
+    def test_register(self):
+        masker = PIIMasker(types=["phone"])
+        self.assertEqual(masker.types, ["phone"])
+        masker.register("employee_id", r"EMP\d{6}", "EMP******", first_chars="E")
+        self.assertEqual(masker.types, ["phone", "employee_id"])
+        self.assertEqual(masker.mask("工号EMP123456，电话13812345678"), "工号EMP******，电话1**********")
+        # 覆盖已有类型，替换也可以是函数
+        masker.register("phone", r"1[3-9]\d{9}(?!\d)", lambda m: m.group()[:3] + "********")
+        self.assertEqual(masker.mask("13812345678"), "138********")
+        with self.assertRaises(ValueError):
+            masker.register("employee-id", r"\d+", "*")
+        with self.assertRaises(ValueError):
+            PIIMasker(types=["passport"])
+        self.assertEqual(PIIMasker(types=[]).mask("13812345678"), "13812345678")
+
+    def test_mask_batch_matches_legacy(self):
+        """mask_batch 与逐条 mask 一致；手机号、邮箱及不含手机号片段的身份证号与旧实现一致"""
+        resumes = make_resumes(50)
+        self.assertEqual(self.masker.mask_batch(resumes), [self.masker.mask(text) for text in resumes])
+        texts = [
+            "张三 电话13812345678 邮箱 zhang.san@example.com",
+            "身份证110101200501014512，手机15900001111",
+            "无敏感信息",
+            "",
+        ]
+        self.assertEqual(self.masker.mask_batch(texts), [legacy_mask(text) for text in texts])
+        # 旧实现会把身份证号中的手机号片段先遮蔽，留下身份证号后几位
+        text = "身份证110101199003074518"
+        self.assertEqual(legacy_mask(text), "身份证1101011**********8")
+        self.assertEqual(self.masker.mask_batch([text]), ["身份证******************"])
+
+
+if __name__ == '__main__':
+    unittest.main()
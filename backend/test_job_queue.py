@@ -0,0 +1,194 @@
+# backend/test_job_queue.py
+import asyncio
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from utils.job_queue import (
+    ITEM_DONE, ITEM_ERROR, JOB_CANCELLED, JOB_COMPLETED, JOB_FAILED, JOB_QUEUED, JOB_RUNNING, JobQueue, JobWorker
+)
+from utils.retention import ResumeRetentionIndex
+
+KIND = "screen_resumes"
+
+
+class TestJobQueue(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmpdir, "jobs.sqlite3")
+        self.queue = JobQueue(self.db_path)
+        self.index = ResumeRetentionIndex(os.path.join(self.tmpdir, "retention.sqlite3"), retention_days=30)
+        patcher = mock.patch("utils.job_queue.get_retention_index", return_value=self.index)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _expire_lease(self, job_id: str, seconds: float = 3600):
+        """把任务心跳改到 seconds 秒之前，模拟处理进程已退出"""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("UPDATE jobs SET heartbeat_at = heartbeat_at - ? WHERE job_id = ?", (seconds, job_id))
+        conn.commit()
+        conn.close()
+
+    def test_workers_never_claim_same_job(self):
+        """多个进程（各自的连接）同时领取时，每个任务只被领取一次"""
+        job_ids = {self.queue.submit(KIND, ["简历"]) for _ in range(20)}
+        claimed = []
+        claimed_lock = threading.Lock()
+        start = threading.Barrier(8)
+
+        def worker(worker_id: str):
+            queue = JobQueue(self.db_path)
+            start.wait()
+            while True:
+                job = queue.claim(worker_id, [KIND], lease_seconds=60)
+                if job is None:
+                    return
+                with claimed_lock:
+                    claimed.append((job["job_id"], worker_id))
+
+        threads = [threading.Thread(target=worker, args=(f"worker-{i}",)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        claimed_ids = [job_id for job_id, _ in claimed]
+        self.assertEqual(len(claimed_ids), len(set(claimed_ids)))
+        self.assertEqual(set(claimed_ids), job_ids)
+        self.assertIsNone(self.queue.claim("late-worker", [KIND], lease_seconds=60))
+
+    def test_expired_lease_is_reclaimed(self):
+        """心跳超时的运行中任务由其他进程接管，原进程续租时得知已失去任务"""
+        job_id = self.queue.submit(KIND, ["简历1", "简历2"])
+        first = self.queue.claim("worker-a", [KIND], lease_seconds=60)
+        self.assertEqual(first["job_id"], job_id)
+        self.queue.complete_item(job_id, 0, {"status": "success"})
+
+        # 租约未过期时不能被领取
+        self.assertIsNone(self.queue.claim("worker-b", [KIND], lease_seconds=60))
+
+        self._expire_lease(job_id)
+        second = self.queue.claim("worker-b", [KIND], lease_seconds=60)
+        self.assertEqual(second["job_id"], job_id)
+        self.assertEqual(second["status"], JOB_RUNNING)
+        self.assertEqual(second["completed"], 1)
+        # 接管后只处理未完成的项
+        pending = [index for page in self.queue.iter_pending(job_id) for index, _ in page]
+        self.assertEqual(pending, [1])
+        self.assertEqual(self.queue.heartbeat(job_id, "worker-a"), JOB_CANCELLED)
+        self.assertEqual(self.queue.heartbeat(job_id, "worker-b"), JOB_RUNNING)
+
+    def test_retry_failed_requeues_only_failed_items(self):
+        """只重试出错的项，成功项的结果保持不变"""
+        job_id = self.queue.submit(KIND, ["简历1", "简历2", "简历3"],
+                                   precomputed={2: {"status": "success", "filtered": True}})
+        self.queue.claim("worker-a", [KIND], lease_seconds=60)
+        self.queue.complete_item(job_id, 0, {"status": "success", "score": 80})
+        self.queue.complete_item(job_id, 1, {"status": "error"}, failed=True)
+
+        # 运行中的任务不能重试
+        self.assertEqual(self.queue.retry_failed(job_id), 0)
+        self.queue.finish(job_id, JOB_COMPLETED)
+
+        self.assertEqual(self.queue.retry_failed(job_id), 1)
+        job = self.queue.get(job_id)
+        self.assertEqual(job["status"], JOB_QUEUED)
+        self.assertEqual(job["completed"], 2)
+        self.assertEqual(job["failed"], 0)
+        pending = [(index, text) for page in self.queue.iter_pending(job_id) for index, text in page]
+        self.assertEqual(pending, [(1, "简历2")])
+        results = {item["resume_index"]: item for item in self.queue.results(job_id)}
+        self.assertEqual(results[0]["status"], ITEM_DONE)
+        self.assertEqual(results[0]["result"]["score"], 80)
+        self.assertNotIn(1, results)
+        self.assertTrue(results[2]["result"]["filtered"])
+
+        # 没有出错项时不会重新排队
+        self.queue.claim("worker-a", [KIND], lease_seconds=60)
+        self.queue.complete_item(job_id, 1, {"status": "success"})
+        self.queue.finish(job_id, JOB_COMPLETED)
+        self.assertEqual(self.queue.retry_failed(job_id), 0)
+        self.assertEqual(self.queue.get(job_id)["status"], JOB_COMPLETED)
+
+    def test_retry_resumes_job_failed_by_handler(self):
+        """处理函数抛出异常导致任务失败后，重试会继续处理尚未处理的项"""
+        job_id = self.queue.submit(KIND, ["简历1", "简历2", "简历3"])
+        worker = JobWorker(self.queue)
+
+        async def failing_handler(job, items):
+            async for index, text in items:
+                if index == 1:
+                    raise RuntimeError("模型服务不可用")
+                yield index, {"status": "success"}, False
+
+        worker.register(KIND, failing_handler)
+        job = self.queue.claim(worker.worker_id, [KIND], lease_seconds=60)
+        asyncio.run(worker._run_job(job))
+        job = self.queue.get(job_id)
+        self.assertEqual(job["status"], JOB_FAILED)
+        self.assertEqual(job["completed"], 1)
+        self.assertIn("模型服务不可用", job["error"])
+
+        self.assertEqual(self.queue.retry_failed(job_id), 2)
+        job = self.queue.get(job_id)
+        self.assertEqual(job["status"], JOB_QUEUED)
+        self.assertIsNone(job["error"])
+        pending = [(index, text) for page in self.queue.iter_pending(job_id) for index, text in page]
+        self.assertEqual(pending, [(1, "简历2"), (2, "简历3")])
+
+    def test_expired_job_inputs_are_purged(self):
+        """任务中保存的简历内容登记到保留期限索引，到期后删除，未处理的项记为出错且不能重试"""
+        job_id = self.queue.submit(KIND, ["简历1", "简历2", "简历3"])
+        self.assertEqual(self.index.stats()["tracked"], 1)
+        self.queue.claim("worker-a", [KIND], lease_seconds=60)
+        self.queue.complete_item(job_id, 0, {"status": "success"})
+        self.queue.complete_item(job_id, 1, {"status": "error"}, failed=True)
+        self.queue.finish(job_id, JOB_FAILED, "中断")
+
+        with mock.patch("utils.job_queue.get_job_queue", return_value=self.queue):
+            self.assertEqual(self.index.sweep(now=datetime.now() + timedelta(days=31)), 1)
+        self.assertEqual(self.index.stats()["tracked"], 0)
+        conn = sqlite3.connect(self.db_path)
+        inputs = conn.execute("SELECT input FROM job_items WHERE job_id = ?", (job_id,)).fetchall()
+        conn.close()
+        self.assertEqual(inputs, [(None,)] * 3)
+        job = self.queue.get(job_id)
+        self.assertEqual((job["completed"], job["failed"]), (3, 2))
+        results = {item["resume_index"]: item for item in self.queue.results(job_id)}
+        self.assertEqual(results[2]["status"], ITEM_ERROR)
+        self.assertEqual(self.queue.retry_failed(job_id), 0)
+        self.assertEqual(self.queue.get(job_id)["status"], JOB_FAILED)
+
+    def test_cancel_stops_further_claims(self):
+        """已取消的任务不会再被领取，运行中的处理进程续租时得知已取消"""
+        queued_id = self.queue.submit(KIND, ["简历1"])
+        self.assertTrue(self.queue.cancel(queued_id))
+        self.assertIsNone(self.queue.claim("worker-a", [KIND], lease_seconds=60))
+
+        running_id = self.queue.submit(KIND, ["简历1", "简历2"])
+        self.assertEqual(self.queue.claim("worker-a", [KIND], lease_seconds=60)["job_id"], running_id)
+        self.queue.complete_item(running_id, 0, {"status": "success"})
+        self.assertTrue(self.queue.cancel(running_id))
+        self.assertEqual(self.queue.heartbeat(running_id, "worker-a"), JOB_CANCELLED)
+        # 处理进程随后结束任务时不覆盖取消状态
+        self.queue.finish(running_id, JOB_COMPLETED)
+        self.assertEqual(self.queue.get(running_id)["status"], JOB_CANCELLED)
+
+        # 即使心跳超时也不会被重新领取
+        self._expire_lease(running_id)
+        self.assertIsNone(self.queue.claim("worker-b", [KIND], lease_seconds=60))
+        self.assertFalse(self.queue.cancel(running_id))
+        # 已完成的项保留结果
+        self.assertEqual([item["resume_index"] for item in self.queue.results(running_id)], [0])
+
+
+if __name__ == '__main__':
+    unittest.main()
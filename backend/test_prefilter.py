@@ -0,0 +1,79 @@
+# backend/test_prefilter.py
+import unittest
+
+from utils.prefilter import ResumePrefilter, extract_job_skills, tokenize
+
+JOB_REQUIREMENTS = {
+    "title": "Java后端工程师",
+    "requirements": {
+        "skills": ["Java", "Spring", "MySQL"],
+        "experience": "3年以上后端开发经验"
+    }
+}
+
+RESUMES = [
+    "5年Java后端开发经验，熟悉Spring Boot和MySQL，负责订单系统",
+    "3年JavaScript前端开发，熟悉React和Vue",
+    "Java开发2年，了解MySQL",
+    "行政专员，熟练使用Excel和PPT",
+]
+
+
+class TestResumePrefilter(unittest.TestCase):
+    def setUp(self):
+        self.prefilter = ResumePrefilter()
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("熟悉C++和Node.js"), ["c++", "node.js", "熟悉", "和"])
+        self.assertEqual(tokenize(""), [])
+
+    def test_extract_job_skills(self):
+        """嵌套字段、中文字段名和分隔符写法，去重并保持顺序"""
+        requirements = {"技能要求": "Python、SQL，python", "details": [{"required_skills": ["Docker", "SQL"]}]}
+        self.assertEqual(extract_job_skills(requirements), ["Python", "SQL", "Docker"])
+        self.assertEqual(extract_job_skills({}), [])
+
+    def test_rank_prefers_skill_matches(self):
+        ranking = self.prefilter.rank(RESUMES, JOB_REQUIREMENTS)
+        self.assertEqual([item["resume_index"] for item in ranking], [0, 1, 2, 3])
+        self.assertEqual(ranking[0]["matched_skills"], ["Java", "Spring", "MySQL"])
+        self.assertEqual(ranking[0]["skill_coverage"], 1.0)
+        # JavaScript 不算 Java
+        self.assertEqual(ranking[1]["matched_skills"], [])
+        self.assertEqual(ranking[2]["matched_skills"], ["Java", "MySQL"])
+        scores = [item["score"] for item in ranking]
+        self.assertEqual(max(scores), scores[0])
+        self.assertGreater(scores[2], scores[1])
+        self.assertEqual(min(scores), scores[3])
+
+    def test_select_top_n_and_threshold(self):
+        ranking = self.prefilter.rank(RESUMES, JOB_REQUIREMENTS)
+        # 都未指定时全部保留
+        self.assertEqual(ResumePrefilter.select(ranking), [0, 1, 2, 3])
+        # top_n 取分数最高的几份，结果按原始顺序
+        self.assertEqual(ResumePrefilter.select(ranking, top_n=2), [0, 2])
+        self.assertEqual(ResumePrefilter.select(ranking, top_n=0), [])
+        self.assertEqual(ResumePrefilter.select(ranking, top_n=10), [0, 1, 2, 3])
+        # 阈值与 top_n 同时满足
+        threshold = ranking[2]["score"]
+        self.assertEqual(ResumePrefilter.select(ranking, threshold=threshold), [0, 2])
+        self.assertEqual(ResumePrefilter.select(ranking, top_n=1, threshold=threshold), [0])
+        self.assertEqual(ResumePrefilter.select(ranking, threshold=1.01), [])
+
+    def test_empty_job_requirements_keeps_all(self):
+        """职位要求为空时无从比较，阈值不过滤任何简历，top_n 按原始顺序截取"""
+        for requirements in ({}, None, {"skills": []}):
+            with self.subTest(requirements=requirements):
+                ranking = self.prefilter.rank(RESUMES, requirements)
+                self.assertTrue(all(item["score"] == 1.0 for item in ranking))
+                self.assertTrue(all(item["matched_skills"] == [] for item in ranking))
+                self.assertEqual(ResumePrefilter.select(ranking, threshold=0.2), [0, 1, 2, 3])
+                self.assertEqual(ResumePrefilter.select(ranking, top_n=2, threshold=0.2), [0, 1])
+
+    def test_empty_resume_list(self):
+        self.assertEqual(self.prefilter.rank([], JOB_REQUIREMENTS), [])
+        self.assertEqual(ResumePrefilter.select([], top_n=5, threshold=0.5), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
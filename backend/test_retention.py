@@ -0,0 +1,62 @@
+# backend/test_retention.py
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from utils.parse_cache import ParseResultCache
+from utils.retention import ResumeRetentionIndex, RetentionSweeper
+
+
+class TestRetention(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmpdir, "retention.sqlite3")
+        self.index = ResumeRetentionIndex(self.db_path, retention_days=30)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_parse_cache_entries_are_registered(self):
+        """解析缓存写入的简历内容登记到保留期限索引，到期后被删除"""
+        cache = ParseResultCache(os.path.join(self.tmpdir, "parse_cache"))
+        with mock.patch("utils.parse_cache.get_retention_index", return_value=self.index):
+            cache.set("ab" * 20, {"text": "张三 13812345678", "candidate_info": {}})
+        path = cache._entry_path("ab" * 20)
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual(self.index.stats()["tracked"], 1)
+
+        self.assertEqual(self.index.sweep(), 0)
+        self.assertEqual(self.index.sweep(now=datetime.now() + timedelta(days=31)), 1)
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual(self.index.stats()["tracked"], 0)
+
+    def test_only_one_sweeper_runs(self):
+        """多个进程的清理线程中只有持有锁的一个执行清理，持有者停止后由其他进程接管"""
+        other_index = ResumeRetentionIndex(self.db_path, retention_days=30)
+        first = RetentionSweeper(self.index, interval_seconds=60)
+        second = RetentionSweeper(other_index, interval_seconds=60)
+        self.index.register("resume-1", None, upload_date=datetime.now() - timedelta(days=40))
+
+        self.assertEqual(first.run_once(), 1)
+        self.assertIsNone(second.run_once())
+        self.assertEqual(first.run_once(), 0)
+        self.assertEqual(self.index.stats()["sweeper_owner"], first.owner)
+
+        first.stop()
+        self.assertEqual(second.run_once(), 0)
+        self.assertIsNone(first.run_once())
+
+    def test_expired_lock_is_taken_over(self):
+        """持有锁的进程退出（未释放）后，锁过期即可被其他进程获取"""
+        self.assertTrue(self.index.acquire_lock("worker-a", ttl_seconds=60))
+        self.assertFalse(self.index.acquire_lock("worker-b", ttl_seconds=60))
+        self.assertTrue(self.index.acquire_lock("worker-a", ttl_seconds=-1))
+        self.assertTrue(self.index.acquire_lock("worker-b", ttl_seconds=60))
+        self.assertEqual(self.index.lock_owner(), "worker-b")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+# backend/test_screening_artifacts.py
+import asyncio
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from utils.screening_artifacts import ScreeningArtifactStore
+
+RESUME = "个人简历\n工作经历\n2018-2023 某公司 工程师 使用Python\n教育经历\n某大学 本科\n技能\nPython"
+REQUIREMENTS = {"title": "后端", "skills": ["Python"]}
+
+
+class TestScreeningArtifactStore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.store = ScreeningArtifactStore(os.path.join(self.tmpdir, "artifacts.sqlite3"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_async_round_trip_runs_off_event_loop(self):
+        """arecord/aget_result 在线程池中访问数据库，结果与同步接口一致"""
+        result = {"status": "success", "raw_response": '{"match_score": 80}'}
+        loop_threads = []
+        record = self.store.record
+
+        def tracking_record(*args):
+            loop_threads.append(threading.current_thread())
+            return record(*args)
+
+        self.store.record = tracking_record
+
+        async def run():
+            await self.store.arecord(RESUME, REQUIREMENTS, result)
+            return threading.current_thread(), await self.store.aget_result(RESUME, REQUIREMENTS)
+
+        loop_thread, stored = asyncio.run(run())
+        self.assertEqual(stored, result)
+        self.assertEqual(self.store.get_result(RESUME, REQUIREMENTS), result)
+        self.assertEqual(len(loop_threads), 1)
+        self.assertIsNot(loop_threads[0], loop_thread)
+        self.assertEqual(self.store.get_resume(RESUME)["skills"], ["Python"])
+
+    def test_failed_results_are_not_recorded(self):
+        asyncio.run(self.store.arecord(RESUME, REQUIREMENTS, {"status": "error", "message": "x"}))
+        self.assertIsNone(asyncio.run(self.store.aget_result(RESUME, REQUIREMENTS)))
+        self.assertEqual(self.store.stats()["results"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+# backend/test_skill_matcher.py
+import unittest
+
+from utils.skill_matcher import SkillMatcher
+
+
+class TestSkillMatcher(unittest.TestCase):
+    def setUp(self):
+        self.matcher = SkillMatcher()
+
+    def test_java_is_not_matched_inside_javascript(self):
+        self.assertEqual(self.matcher.find_skills("精通JavaScript和TypeScript"), ["JavaScript", "TypeScript"])
+        self.assertEqual(self.matcher.find_skills("熟悉Java，了解JavaScript"), ["Java", "JavaScript"])
+        self.assertEqual(self.matcher.find_skills("Java/JavaScript全栈"), ["Java", "JavaScript"])
+        result = self.matcher.match("5年JavaScript前端开发经验", ["Java"])
+        self.assertEqual(result["matched_skills"], [])
+        self.assertEqual(result["missing_skills"], ["Java"])
+
+    def test_word_boundaries_for_short_terms(self):
+        """短别名只按完整单词匹配"""
+        self.assertEqual(self.matcher.find_skills("熟悉JSON和Gopher协议"), [])
+        self.assertEqual(self.matcher.find_skills("使用 Go 和 JS 开发"), ["Go", "JavaScript"])
+        self.assertEqual(self.matcher.find_skills("HTML5, MLOps"), [])
+        self.assertEqual(self.matcher.find_skills("熟悉ML算法"), ["机器学习"])
+
+    def test_symbol_skills(self):
+        """C++、C#、.NET 等带符号的技能"""
+        self.assertEqual(self.matcher.find_skills("精通C++和C#"), ["C++", "C#"])
+        self.assertEqual(self.matcher.find_skills("熟悉C++11/14"), ["C++"])
+        self.assertEqual(self.matcher.find_skills("熟悉ASP.NET开发"), ["C#"])
+        self.assertEqual(self.matcher.find_skills("熟悉.NET Core"), ["C#"])
+        self.assertEqual(self.matcher.find_skills("熟悉.NETWORK"), [])
+        self.assertEqual(self.matcher.find_skills("会用NodeJS"), ["Node.js"])
+        self.assertEqual(self.matcher.find_skills("精通C、C++"), ["C++"])
+
+    def test_chinese_aliases(self):
+        self.assertEqual(self.matcher.find_skills("精通Go语言，熟悉容器化部署"), ["Go", "Docker"])
+        result = self.matcher.match("沟通能力强，通过英语六级，熟练使用电子表格", ["沟通协调", "英语", "Excel", "PPT"])
+        self.assertEqual(result["matched_skills"], ["沟通协调", "英语", "Excel"])
+        self.assertEqual(result["missing_skills"], ["PPT"])
+
+    def test_match_keeps_requirement_labels(self):
+        """matched/missing 使用职位要求中的写法，同义词只计一次"""
+        result = self.matcher.match("Golang, K8s, python3, Redis", ["golang", "Kubernetes", "Go", "Python"])
+        self.assertEqual(result["matched_skills"], ["golang", "Kubernetes", "Python"])
+        self.assertEqual(result["missing_skills"], [])
+        self.assertEqual(result["additional_skills"], ["Redis"])
+
+    def test_common_words_are_not_skills_in_prose(self):
+        """同时是普通英文单词的技能写法在正文中不计入"""
+        text = "I go to work every day, react quickly ..., each word counts. Spring 2020 intern. Node in a tree. TS certificate."
+        self.assertEqual(self.matcher.find_skills(text), [])
+        self.assertEqual(self.matcher.find_skills("I excel at teamwork"), [])
+        result = self.matcher.match(text, ["Go", "React", "Word"])
+        self.assertEqual(result["matched_skills"], [])
+
+    def test_ambiguous_terms_in_skill_context(self):
+        """技能列表、紧邻中文或附近有其他技能时仍然计入"""
+        self.assertEqual(self.matcher.find_skills("Skills: Java, Spring, MySQL, Go, React"),
+                         ["Java", "Spring", "MySQL", "Go", "React"])
+        self.assertEqual(self.matcher.find_skills("熟悉go、react和spring框架"), ["Go", "React", "Spring"])
+        self.assertEqual(self.matcher.find_skills("Experienced in Go and Kubernetes"), ["Go", "Kubernetes"])
+        self.assertEqual(self.matcher.find_skills("Excel, Word, PPT"), ["Excel", "Word", "PPT"])
+        # 上下文中写法不一致时不计入
+        self.assertEqual(self.matcher.find_skills("day, react quickly"), [])
+
+    def test_custom_ambiguous_terms(self):
+        matcher = SkillMatcher({"Rust": [], "Kafka": []}, ambiguous_terms=["Rust"])
+        self.assertEqual(matcher.find_skills("the bridge showed rust"), [])
+        self.assertEqual(matcher.find_skills("Rust, Kafka"), ["Rust", "Kafka"])
+        # 扩展匹配器沿用歧义写法
+        self.assertEqual(matcher.with_skills(["Flink"]).find_skills("rust and Flink"), ["Flink"])
+
+    def test_skills_outside_taxonomy(self):
+        """职位要求中词典外的技能同样按单词边界匹配"""
+        result = self.matcher.match("熟悉Rust和Rustls，用过Flask", ["Rust", "Flask", "Django"])
+        self.assertEqual(result["matched_skills"], ["Rust", "Flask"])
+        self.assertEqual(result["missing_skills"], ["Django"])
+        self.assertEqual(self.matcher.find_skills("熟悉Rust"), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
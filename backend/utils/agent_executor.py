@@ -0,0 +1,134 @@
+# backend/utils/agent_executor.py
+import asyncio
+import functools
+import inspect
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from utils.app_config import get_app_config
+from utils.llm_governor import estimate_request_tokens, get_llm_governor
+
+# 默认智能体调用线程数
+DEFAULT_AGENT_WORKERS = 16
+
+
+class AgentExecutor:
+    """
+    智能体调用执行器
+    同步的智能体方法（LLM调用）在独立的线程池中执行，避免阻塞事件循环，
+    同时统计排队深度、运行数和等待耗时
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_AGENT_WORKERS):
+        self.max_workers = max(1, int(max_workers))
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="agent-call")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+        self._peak_queue_depth = 0
+        self._total_wait_seconds = 0.0
+        self._total_run_seconds = 0.0
+
+    def _execute(self, func: Callable, args: tuple, kwargs: dict, submitted_at: float) -> Any:
+        """在线程池中执行调用并更新统计"""
+        started_at = time.monotonic()
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._total_wait_seconds += started_at - submitted_at
+
+        failed = False
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._total_run_seconds += time.monotonic() - started_at
+                if failed:
+                    self._failed += 1
+                else:
+                    self._completed += 1
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """在线程池中执行同步调用并等待结果"""
+        with self._lock:
+            self._queued += 1
+            self._peak_queue_depth = max(self._peak_queue_depth, self._queued)
+        loop = asyncio.get_running_loop()
+        call = functools.partial(self._execute, func, args, kwargs, time.monotonic())
+        return await loop.run_in_executor(self._pool, call)
+
+    def stats(self) -> Dict[str, Any]:
+        """获取执行器运行指标"""
+        with self._lock:
+            finished = self._completed + self._failed
+            return {
+                "max_workers": self.max_workers,
+                "queue_depth": self._queued,
+                "peak_queue_depth": self._peak_queue_depth,
+                "running": self._running,
+                "completed": self._completed,
+                "failed": self._failed,
+                "avg_wait_ms": round(self._total_wait_seconds / finished * 1000, 2) if finished else 0.0,
+                "avg_run_ms": round(self._total_run_seconds / finished * 1000, 2) if finished else 0.0
+            }
+
+    def shutdown(self, wait: bool = True):
+        """关闭线程池"""
+        self._pool.shutdown(wait=wait)
+
+
+_executor: Optional[AgentExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _load_agent_workers(config_file: str = "configs/recruitment_config.yml") -> int:
+    """从配置文件读取智能体调用线程数"""
+    return get_app_config(config_file).service.agent_workers
+
+
+def get_agent_executor() -> AgentExecutor:
+    """获取进程内共享的智能体执行器"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = AgentExecutor(_load_agent_workers())
+    return _executor
+
+
+def shutdown_agent_executor(wait: bool = True):
+    """关闭共享的智能体执行器"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait)
+            _executor = None
+
+
+def run_agent(agent: Any, prompt: str, tokens: Optional[int] = None) -> Any:
+    """在共享的LLM调用调控器下同步运行智能体（tokens 为空时按提示词估算）"""
+    governor = get_llm_governor()
+    return governor.call(agent.run, prompt, tokens=tokens or estimate_request_tokens(prompt))
+
+
+async def arun_agent(agent: Any, prompt: str, tokens: Optional[int] = None, governed: bool = True) -> Any:
+    """
+    异步运行智能体
+    工具包提供原生异步方法（arun）时直接调用，否则放入智能体执行器线程池；
+    默认经过共享的LLM调用调控器（调用方已自行占用调控名额时传 governed=False）
+    """
+    if governed:
+        async with get_llm_governor().slot_async(tokens or estimate_request_tokens(prompt)):
+            return await arun_agent(agent, prompt, governed=False)
+    native_run = getattr(agent, "arun", None)
+    if native_run is not None and inspect.iscoroutinefunction(native_run):
+        return await native_run(prompt)
+    return await get_agent_executor().run(agent.run, prompt)
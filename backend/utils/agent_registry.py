@@ -0,0 +1,128 @@
+# backend/utils/agent_registry.py
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from utils.startup_timer import get_startup_timer
+
+# 智能体创建失败后，间隔多久（秒）才允许再次尝试
+DEFAULT_RETRY_INTERVAL = 30.0
+
+
+class _AgentEntry:
+    """单个智能体的创建状态"""
+
+    def __init__(self, name: str, factory: Callable[[], Any], required: bool):
+        self.name = name
+        self.factory = factory
+        self.required = required
+        self.instance: Any = None
+        self.error: Optional[str] = None
+        self.failed_at = 0.0
+        self.init_ms: Optional[float] = None
+        self.lock = threading.Lock()
+
+
+class AgentRegistry:
+    """
+    智能体注册表
+    各API模块只注册创建函数（智能体模块在创建函数内导入），首次使用或后台预热时才创建，
+    进程启动时不再同步导入工具包和创建智能体，服务可以立即开始接收请求
+    """
+
+    def __init__(self, retry_interval: float = DEFAULT_RETRY_INTERVAL):
+        self.retry_interval = retry_interval
+        self._entries: Dict[str, _AgentEntry] = {}
+        self._warm_up_thread: Optional[threading.Thread] = None
+        self._warmed_up = threading.Event()
+
+    def register(self, name: str, factory: Callable[[], Any], required: bool = True):
+        """注册智能体创建函数（required 为 True 时，创建失败的智能体会使就绪检查不通过）"""
+        if name not in self._entries:
+            self._entries[name] = _AgentEntry(name, factory, required)
+
+    def get(self, name: str) -> Optional[Any]:
+        """获取智能体，首次调用时创建；创建失败返回None，retry_interval 后再次尝试"""
+        entry = self._entries[name]
+        if entry.instance is not None:
+            return entry.instance
+        with entry.lock:
+            if entry.instance is not None:
+                return entry.instance
+            if entry.error is not None and time.monotonic() - entry.failed_at < self.retry_interval:
+                return None
+            started = time.perf_counter()
+            try:
+                with get_startup_timer().stage(f"agent:{name}", "agent"):
+                    entry.instance = entry.factory()
+                entry.error = None
+                print(f"智能体 {name} 初始化成功")
+            except Exception as e:
+                entry.error = str(e)
+                entry.failed_at = time.monotonic()
+                print(f"智能体 {name} 初始化失败: {e}")
+            entry.init_ms = round((time.perf_counter() - started) * 1000, 1)
+            return entry.instance
+
+    async def aget(self, name: str) -> Optional[Any]:
+        """异步获取智能体：尚未创建时在线程中创建，不阻塞事件循环"""
+        entry = self._entries[name]
+        if entry.instance is not None:
+            return entry.instance
+        return await asyncio.get_running_loop().run_in_executor(None, self.get, name)
+
+    def warm_up(self, modules: Iterable[str] = ()):
+        """预热：导入重量级依赖并创建全部已注册的智能体（导入失败的可选依赖只记录耗时）"""
+        timer = get_startup_timer()
+        for module in modules:
+            try:
+                timer.import_module(module)
+            except ImportError as e:
+                print(f"预热导入 {module} 失败: {e}")
+        for name in list(self._entries):
+            self.get(name)
+        timer.mark("warmed_up")
+        self._warmed_up.set()
+        report = timer.report(top=5)
+        slowest = ", ".join(f"{stage['name']} {stage['ms']}ms" for stage in report["stages"])
+        print(f"启动预热完成: {report['milestones']['warmed_up']}s，耗时最多的阶段: {slowest}")
+
+    def start_warm_up(self, modules: Iterable[str] = ()) -> threading.Thread:
+        """在后台线程中预热，服务在预热期间即可接收请求"""
+        if self._warm_up_thread is None:
+            self._warm_up_thread = threading.Thread(
+                target=self.warm_up, args=(tuple(modules),), name="agent-warm-up", daemon=True
+            )
+            self._warm_up_thread.start()
+        return self._warm_up_thread
+
+    def status(self) -> Dict[str, Dict]:
+        """各智能体状态：ready / failed / pending"""
+        return {
+            name: {
+                "state": "ready" if entry.instance is not None else ("failed" if entry.error else "pending"),
+                "required": entry.required,
+                "init_ms": entry.init_ms,
+                "error": entry.error
+            }
+            for name, entry in self._entries.items()
+        }
+
+    @property
+    def warmed_up(self) -> bool:
+        return self._warmed_up.is_set()
+
+    def ready(self) -> bool:
+        """预热已完成且所有必需的智能体都已创建"""
+        return self.warmed_up and all(
+            entry.instance is not None for entry in self._entries.values() if entry.required
+        )
+
+
+_registry = AgentRegistry()
+
+
+def get_agent_registry() -> AgentRegistry:
+    """获取进程内共享的智能体注册表"""
+    return _registry
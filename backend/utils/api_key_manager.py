@@ -1,26 +1,30 @@
-// backend/utils/api_key_manager.py
+# backend/utils/api_key_manager.py
 import os
-import yaml
-from datetime import datetime, timedelta
+import threading
+from collections import deque
+from datetime import datetime
 from typing import Dict, Optional
 
+from utils.api_key_pool import APIKeyPool, KeyLease, PooledKey
+from utils.app_config import get_app_config
+from utils.server_profile import quota_share
+from utils.usage_counter import UsageCounters
+
 class APIKeyManager:
     """API密钥管理器"""
     
     def __init__(self, config_file: str = "configs/recruitment_config.yml"):
         self.config_file = config_file
         self.keys = self._load_keys()
-        self.access_logs = []
+        # 最近的访问记录（仅用于排查问题），请求量统计使用分桶计数器
+        self.access_logs = deque(maxlen=500)
+        self.usage = UsageCounters()
+        self._pools: Dict[str, APIKeyPool] = {}
+        self._pools_lock = threading.Lock()
     
     def _load_keys(self) -> Dict[str, Dict]:
         """加载API密钥配置"""
-        try:
-            with open(self.config_file, "r") as f:
-                config = yaml.safe_load(f)
-            return config.get("api_keys", {})
-        except Exception as e:
-            print(f"加载API密钥配置失败: {e}")
-            return {}
+        return get_app_config(self.config_file).section("api_keys")
     
     def get_key(self, service: str) -> Optional[str]:
         """获取指定服务的API密钥"""
@@ -39,6 +43,70 @@ class APIKeyManager:
         # 返回密钥值
         return key_info.get("value") or key_info.get("key")
     
+    def _load_pool_config(self, service: str) -> Dict:
+        """加载指定服务的密钥池配置"""
+        return get_app_config(self.config_file).section("key_pools").get(service, {}) or {}
+    
+    def get_key_pool(self, service: str) -> APIKeyPool:
+        """
+        获取指定服务的多密钥池
+        密钥来源：配置 key_pools.<service>.keys，环境变量 key_pools.<service>.env（逗号分隔，默认 <SERVICE>_API_KEYS），
+        以及 fallback_env 指定的单个密钥（默认 <SERVICE>_API_KEY）；重复的密钥只保留一个
+        """
+        with self._pools_lock:
+            pool = self._pools.get(service)
+            if pool is None:
+                pool = self._build_key_pool(service, self._load_pool_config(service))
+                self._pools[service] = pool
+            return pool
+    
+    def _build_key_pool(self, service: str, config: Dict) -> APIKeyPool:
+        entries = []
+        for item in config.get("keys") or []:
+            entries.append(item if isinstance(item, dict) else {"value": item})
+        env_names = (config.get("env", f"{service.upper()}_API_KEYS"),
+                     config.get("fallback_env", f"{service.upper()}_API_KEY"))
+        for env_name in env_names:
+            if env_name:
+                entries.extend({"value": value.strip()} for value in os.getenv(env_name, "").split(",") if value.strip())
+        
+        keys, seen = [], set()
+        for key_info in entries:
+            value = key_info.get("value") or key_info.get("key")
+            if not value or value in seen or str(value).startswith("YOUR_"):
+                continue
+            seen.add(value)
+            keys.append(PooledKey(
+                str(value),
+                key_info,
+                rpm=config.get("rpm", 60),
+                tpm=config.get("tpm", 100000),
+                share=quota_share()
+            ))
+        return APIKeyPool(
+            service,
+            keys,
+            is_expired=self._is_key_expired,
+            cooldown_seconds=config.get("cooldown_seconds", 30),
+            max_cooldown_seconds=config.get("max_cooldown_seconds", 300),
+            on_acquire=self._on_lease_acquired,
+            on_release=self._on_lease_released
+        )
+    
+    def _on_lease_acquired(self, lease: KeyLease):
+        """密钥池占用密钥时记录一次请求（服务和密钥摘要两级）"""
+        self._log_access(lease.pool.service, lease.key.name)
+    
+    def _on_lease_released(self, lease: KeyLease, outcome: str):
+        """密钥归还时按结果（completed/rate_limited/failed）记录"""
+        self.usage.record(f"{lease.pool.service}:{lease.key.name}:{outcome}")
+    
+    def key_pool_metrics(self) -> Dict[str, Dict]:
+        """导出已创建的密钥池状态"""
+        with self._pools_lock:
+            pools = dict(self._pools)
+        return {service: pool.stats() for service, pool in pools.items()}
+    
     def _is_key_expired(self, key_info: Dict) -> bool:
         """检查密钥是否过期"""
         expiry_date = key_info.get("expiry_date")
@@ -51,18 +119,17 @@ class APIKeyManager:
         except Exception:
             return False
     
-    def _log_access(self, service: str):
-        """记录密钥访问日志"""
-        log_entry = {
+    def _log_access(self, service: str, key_name: Optional[str] = None):
+        """记录密钥访问日志（key_name 为密钥池中密钥的摘要）"""
+        self.usage.record(service)
+        if key_name:
+            self.usage.record(f"{service}:{key_name}")
+        self.access_logs.append({
             "service": service,
+            "key": key_name,
             "timestamp": datetime.now().isoformat(),
             "ip_address": os.getenv("REMOTE_ADDR", "unknown")
-        }
-        self.access_logs.append(log_entry)
-        
-        # 限制日志数量
-        if len(self.access_logs) > 1000:
-            self.access_logs = self.access_logs[-500:]
+        })
     
     def rotate_key(self, service: str) -> bool:
         """轮换指定服务的API密钥"""
@@ -72,16 +139,23 @@ class APIKeyManager:
         return True
     
     def check_key_usage(self, service: str) -> Dict:
-        """检查密钥使用情况"""
-        service_logs = [log for log in self.access_logs if log["service"] == service]
-        
+        """检查密钥使用情况（recent_requests 为最近1小时的请求数）"""
+        usage = self.usage.snapshot(names=[service]).get(service, {})
         return {
             "service": service,
-            "total_requests": len(service_logs),
-            "recent_requests": len([log for log in service_logs 
-                                  if datetime.fromisoformat(log["timestamp"]) > datetime.now() - timedelta(hours=1)])
+            "total_requests": usage.get("total", 0),
+            "recent_requests": usage.get("1h", 0),
+            "requests_1m": usage.get("1m", 0),
+            "requests_24h": usage.get("24h", 0)
         }
     
+    def usage_metrics(self) -> Dict[str, Dict[str, int]]:
+        """
+        导出请求量指标：{名称: {"total", "1m", "1h", "24h"}}
+        名称为 <服务>（全部请求）、<服务>:<密钥摘要>（该密钥的请求）和 <服务>:<密钥摘要>:<结果>（归还结果）
+        """
+        return self.usage.snapshot()
+    
     def validate_key_permissions(self, service: str, required_permissions: list) -> bool:
         """验证密钥权限"""
         key_info = self.keys.get(service)
@@ -90,4 +164,17 @@ class APIKeyManager:
         
         key_permissions = key_info.get("permissions", [])
         # 检查是否包含所有必需权限
-        return all(perm in key_permissions for perm in required_permissions)
\ No newline at end of file
+        return all(perm in key_permissions for perm in required_permissions)
+
+_manager: Optional[APIKeyManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_api_key_manager() -> APIKeyManager:
+    """获取进程内共享的API密钥管理器"""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = APIKeyManager()
+    return _manager
@@ -0,0 +1,231 @@
+# backend/utils/api_key_pool.py
+import asyncio
+import hashlib
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Callable, Dict, List, Optional
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """判断异常是否为服务端限流（HTTP 429）"""
+    if getattr(error, "status_code", None) == 429 or getattr(error, "status", None) == 429:
+        return True
+    response = getattr(error, "response", None)
+    if getattr(response, "status_code", None) == 429:
+        return True
+    message = str(error).lower()
+    return type(error).__name__ == "RateLimitError" or "429" in message or "rate limit" in message \
+        or "throttl" in message
+
+
+class TokenBucket:
+    """令牌桶：按 rate_per_minute 匀速补充，容量为一分钟的额度"""
+
+    def __init__(self, rate_per_minute: float):
+        self.capacity = float(rate_per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def fill_ratio(self, now: float) -> float:
+        self._refill(now)
+        return self.tokens / self.capacity if self.capacity else 0.0
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """还需等待多少秒才能取出 amount 个令牌（超过容量的请求按装满计算）"""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        return 0.0 if self.tokens >= amount else (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float, now: float):
+        self._refill(now)
+        self.tokens -= min(amount, self.capacity)
+
+
+class PooledKey:
+    """密钥池中的单个密钥及其限流状态"""
+
+    def __init__(self, value: str, key_info: Optional[Dict] = None, rpm: float = 60, tpm: float = 100000,
+                 share: float = 1.0):
+        self.value = value
+        self.key_info = key_info or {}
+        # 对外只暴露密钥摘要
+        self.name = hashlib.sha256(value.encode()).hexdigest()[:12]
+        # share：多进程部署时本进程分到的额度比例
+        self.requests = TokenBucket(self.key_info.get("rpm", rpm) * share)
+        self.tokens = TokenBucket(self.key_info.get("tpm", tpm) * share)
+        self.in_flight = 0
+        self.cooldown_until = 0.0
+        self.consecutive_rate_limits = 0
+        self.completed = 0
+        self.rate_limited = 0
+        self.failed = 0
+
+    def wait_time(self, tokens: float, now: float) -> float:
+        return max(self.cooldown_until - now, self.requests.wait_time(1, now), self.tokens.wait_time(tokens, now))
+
+    def load_score(self, now: float) -> float:
+        """剩余额度越多、在途请求越少，得分越高"""
+        headroom = min(self.requests.fill_ratio(now), self.tokens.fill_ratio(now))
+        return headroom / (1 + self.in_flight)
+
+
+class KeyLease:
+    """一次请求对密钥的占用，请求结束后通过 release/rate_limited/failed 归还"""
+
+    def __init__(self, pool: "APIKeyPool", key: PooledKey, tokens: float):
+        self.pool = pool
+        self.key = key
+        self.tokens = tokens
+        self.outcome: Optional[str] = None
+
+    @property
+    def value(self) -> str:
+        return self.key.value
+
+    def rate_limited(self, retry_after: Optional[float] = None):
+        """请求被限流（429）：该密钥进入冷却"""
+        self.pool._release(self, "rate_limited", retry_after)
+
+    def failed(self):
+        self.pool._release(self, "failed")
+
+    def release(self):
+        self.pool._release(self, "completed")
+
+
+class APIKeyPool:
+    """
+    单个服务的多密钥池
+    每个密钥按各自的RPM/TPM令牌桶记录剩余额度，每次请求选择当前负载最低的可用密钥；
+    返回429的密钥按指数退避冷却，已过期的密钥（is_expired 判断）自动跳过。
+    on_acquire(租约) / on_release(租约, 结果) 在占用和归还密钥后调用，用于记录各密钥的使用量
+    """
+
+    def __init__(self, service: str, keys: List[PooledKey], is_expired: Optional[Callable[[Dict], bool]] = None,
+                 cooldown_seconds: float = 30, max_cooldown_seconds: float = 300,
+                 on_acquire: Optional[Callable[["KeyLease"], None]] = None,
+                 on_release: Optional[Callable[["KeyLease", str], None]] = None):
+        self.service = service
+        self.keys = keys
+        self.is_expired = is_expired or (lambda key_info: False)
+        self.cooldown_seconds = cooldown_seconds
+        self.max_cooldown_seconds = max_cooldown_seconds
+        self.on_acquire = on_acquire
+        self.on_release = on_release
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _try_acquire(self, tokens: float) -> tuple:
+        """尝试占用一个密钥，返回 (租约, 0) 或 (None, 需要等待的秒数)"""
+        now = time.monotonic()
+        with self._lock:
+            candidates = [key for key in self.keys if not self.is_expired(key.key_info)]
+            if not candidates:
+                raise RuntimeError(f"服务 {self.service} 没有可用的API密钥（未配置或已全部过期）")
+            ready = [key for key in candidates if key.wait_time(tokens, now) <= 0]
+            if not ready:
+                return None, min(key.wait_time(tokens, now) for key in candidates)
+            key = max(ready, key=lambda k: k.load_score(now))
+            key.requests.consume(1, now)
+            key.tokens.consume(tokens, now)
+            key.in_flight += 1
+            lease = KeyLease(self, key, tokens)
+        if self.on_acquire is not None:
+            self.on_acquire(lease)
+        return lease, 0.0
+
+    def acquire(self, tokens: float = 1, timeout: Optional[float] = None) -> KeyLease:
+        """占用一个密钥（阻塞等待额度），超时抛出 TimeoutError"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            lease, wait = self._try_acquire(tokens)
+            if lease is not None:
+                return lease
+            if deadline is not None and time.monotonic() + wait > deadline:
+                raise TimeoutError(f"等待服务 {self.service} 的API密钥额度超时")
+            time.sleep(min(wait, 1.0))
+
+    async def acquire_async(self, tokens: float = 1, timeout: Optional[float] = None) -> KeyLease:
+        """异步占用一个密钥，等待额度时不阻塞事件循环"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            lease, wait = self._try_acquire(tokens)
+            if lease is not None:
+                return lease
+            if deadline is not None and time.monotonic() + wait > deadline:
+                raise TimeoutError(f"等待服务 {self.service} 的API密钥额度超时")
+            await asyncio.sleep(min(wait, 1.0))
+
+    def _release(self, lease: KeyLease, outcome: str, retry_after: Optional[float] = None):
+        if lease.outcome is not None:
+            return
+        lease.outcome = outcome
+        key = lease.key
+        with self._lock:
+            key.in_flight -= 1
+            if outcome == "rate_limited":
+                key.rate_limited += 1
+                key.consecutive_rate_limits += 1
+                cooldown = retry_after or min(
+                    self.cooldown_seconds * 2 ** (key.consecutive_rate_limits - 1), self.max_cooldown_seconds
+                )
+                key.cooldown_until = time.monotonic() + cooldown
+            elif outcome == "failed":
+                key.failed += 1
+            else:
+                key.completed += 1
+                key.consecutive_rate_limits = 0
+        if self.on_release is not None:
+            self.on_release(lease, outcome)
+
+    @contextmanager
+    def lease(self, tokens: float = 1, timeout: Optional[float] = None):
+        """with pool.lease(tokens) as lease: 使用 lease.value 调用接口；限流异常自动标记冷却"""
+        lease = self.acquire(tokens, timeout)
+        try:
+            yield lease
+        except BaseException as e:
+            lease.rate_limited() if is_rate_limit_error(e) else lease.failed()
+            raise
+        lease.release()
+
+    @asynccontextmanager
+    async def lease_async(self, tokens: float = 1, timeout: Optional[float] = None):
+        """异步版本的 lease"""
+        lease = await self.acquire_async(tokens, timeout)
+        try:
+            yield lease
+        except BaseException as e:
+            lease.rate_limited() if is_rate_limit_error(e) else lease.failed()
+            raise
+        lease.release()
+
+    def stats(self) -> Dict:
+        """各密钥的负载和限流统计（只包含密钥摘要）"""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "service": self.service,
+                "keys": [
+                    {
+                        "key": key.name,
+                        "expired": self.is_expired(key.key_info),
+                        "in_flight": key.in_flight,
+                        "cooling_down_seconds": round(max(0.0, key.cooldown_until - now), 1),
+                        "request_headroom": round(key.requests.fill_ratio(now), 3),
+                        "token_headroom": round(key.tokens.fill_ratio(now), 3),
+                        "completed": key.completed,
+                        "rate_limited": key.rate_limited,
+                        "failed": key.failed
+                    }
+                    for key in self.keys
+                ]
+            }
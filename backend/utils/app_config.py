@@ -0,0 +1,147 @@
+# backend/utils/app_config.py
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+import yaml
+
+DEFAULT_CONFIG_FILE = "configs/recruitment_config.yml"
+
+
+@dataclass(frozen=True)
+class ModelConfig:
+    """单个模型（服务商）的调用参数"""
+    model_name: str = "qwen-plus"
+    base_url: str = "https://dashscope.aliyuncs.com/compatible-mode/v1"
+    temperature: Optional[float] = 0.7
+    max_tokens: Optional[int] = 2048
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ModelConfig":
+        defaults = cls()
+        return cls(
+            model_name=data.get("model_name", defaults.model_name),
+            base_url=data.get("base_url", defaults.base_url),
+            temperature=data.get("temperature", defaults.temperature),
+            max_tokens=data.get("max_tokens", defaults.max_tokens)
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "model_name": self.model_name,
+            "base_url": self.base_url,
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens
+        }
+
+
+@dataclass(frozen=True)
+class ProductionServerConfig:
+    """生产模式下的uvicorn参数"""
+    workers: int = 0  # 0 表示使用CPU核数
+    loop: str = "uvloop"
+    http: str = "httptools"
+    backlog: int = 2048
+    timeout_keep_alive: int = 5
+    timeout_graceful_shutdown: int = 30
+    limit_max_requests: int = 0  # 0 表示不限制
+    limit_max_requests_jitter: int = 0
+    limit_concurrency: int = 0  # 0 表示不限制
+    access_log: bool = False
+    proxy_headers: bool = True
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ProductionServerConfig":
+        defaults = cls()
+        return cls(**{name: data.get(name, getattr(defaults, name)) for name in cls.__dataclass_fields__})
+
+
+@dataclass(frozen=True)
+class ServiceConfig:
+    """服务进程配置"""
+    host: str = "0.0.0.0"
+    port: int = 8000
+    debug: bool = False
+    profile: str = "development"
+    agent_workers: int = 16
+    warm_up: bool = True
+    orjson: bool = True
+    production: ProductionServerConfig = field(default_factory=ProductionServerConfig)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ServiceConfig":
+        defaults = cls()
+        return cls(
+            host=str(data.get("host", defaults.host)),
+            port=int(data.get("port", defaults.port)),
+            debug=bool(data.get("debug", defaults.debug)),
+            profile=str(data.get("profile", defaults.profile)),
+            agent_workers=int(data.get("agent_workers", defaults.agent_workers)),
+            warm_up=bool(data.get("warm_up", defaults.warm_up)),
+            orjson=bool(data.get("orjson", defaults.orjson)),
+            production=ProductionServerConfig.from_dict(data.get("production", {}) or {})
+        )
+
+
+@dataclass(frozen=True)
+class AppConfig:
+    """
+    进程内共享的配置对象
+    常用配置（模型、服务）解析为带类型的字段，其余配置段通过 section() 按原始字典读取
+    """
+    path: str
+    models: Dict[str, ModelConfig] = field(default_factory=dict)
+    service: ServiceConfig = field(default_factory=ServiceConfig)
+    raw: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, config_file: str = DEFAULT_CONFIG_FILE) -> "AppConfig":
+        """读取配置文件，读取失败时使用默认值"""
+        try:
+            with open(config_file, "r") as f:
+                data = yaml.safe_load(f) or {}
+        except Exception as e:
+            print(f"加载配置文件失败: {e}")
+            data = {}
+        models = {
+            name: ModelConfig.from_dict(value)
+            for name, value in (data.get("models", {}) or {}).items()
+            if isinstance(value, dict) and ("model_name" in value or "base_url" in value)
+        }
+        return cls(
+            path=config_file,
+            models=models,
+            service=ServiceConfig.from_dict(data.get("service", {}) or {}),
+            raw=data
+        )
+
+    def section(self, name: str) -> Dict[str, Any]:
+        """获取原始配置段（不存在时返回空字典）"""
+        return self.raw.get(name, {}) or {}
+
+    def model(self, name: str = "qwen") -> ModelConfig:
+        """获取 models 下指定服务商的模型配置，未配置时返回默认的Qwen配置"""
+        return self.models.get(name) or ModelConfig()
+
+
+_configs: Dict[str, AppConfig] = {}
+_config_lock = threading.Lock()
+
+
+def get_app_config(config_file: str = DEFAULT_CONFIG_FILE) -> AppConfig:
+    """获取进程内共享的配置对象（每个配置文件只读取、解析一次）"""
+    config = _configs.get(config_file)
+    if config is None:
+        with _config_lock:
+            config = _configs.get(config_file)
+            if config is None:
+                config = AppConfig.load(config_file)
+                _configs[config_file] = config
+    return config
+
+
+def reload_app_config(config_file: str = DEFAULT_CONFIG_FILE) -> AppConfig:
+    """重新读取配置文件（已创建的单例组件不会自动应用新配置）"""
+    with _config_lock:
+        _configs[config_file] = AppConfig.load(config_file)
+        return _configs[config_file]
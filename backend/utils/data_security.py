@@ -1,10 +1,236 @@
-// backend/utils/data_security.py
+# backend/utils/data_security.py
+from cryptography.exceptions import InvalidTag
 from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 import os
+import re
 import base64
-from datetime import datetime, timedelta
+import struct
+from datetime import datetime
+from typing import BinaryIO, Callable, Dict, Iterable, List, Optional, Union
 import hashlib
 
+from utils.app_config import get_app_config
+from utils.retention import retention_deadline
+
+# 敏感信息类型：名称 -> (正则, 替换文本或替换函数, 首字符集合)
+# 正则内部只能使用非捕获分组或匿名分组；数字类规则在首字符之后检查前一位不是数字，避免截断更长的号码。
+# 首字符集合（正则字符类写法）用于合并正则的前置断言，让扫描直接跳过不可能命中的位置
+_WECHAT_ID_RE = re.compile(r'[a-zA-Z][-_a-zA-Z0-9]{5,19}$')
+_LABELED_VALUE_RE = re.compile(r'([:：]\s*).*$')
+
+PII_TYPES = {
+    # 身份证号需排在手机号、银行卡号之前
+    "id_card": (r'\d(?<!\d\d)\d{16}[\dXx](?![\dXx])', '******************', r'\d'),
+    "phone": (r'(?:\+86[-\s]?1|8(?<!\d8)6[-\s]?1|1(?<!\d1))[3-9]\d{9}(?!\d)', '1**********', '1+8'),
+    "email": (r'[A-Za-z0-9_.%+-](?<![A-Za-z0-9_.%+-][A-Za-z0-9_.%+-])[A-Za-z0-9_.%+-]*+@[A-Za-z0-9.-]+',
+              '***@***.***', r'A-Za-z0-9_.%+\-'),
+    "bank_card": (r'\d(?<!\d\d)(?:\d{3}(?:[ -]\d{4}){3}(?:[ -]\d{3})?|\d{15,18})(?!\d)', '****************', r'\d'),
+    "wechat": (r'(?:微信号?|[Ww]e[Cc]hat(?: ID)?|[wv]x)\s*[:：]\s*[a-zA-Z][-_a-zA-Z0-9]{5,19}',
+               lambda m: _WECHAT_ID_RE.sub('******', m.group(0)), '微Wwv'),
+    "address": (r'(?:家庭住址|通讯地址|联系地址|现住址|居住地址|住址|地址)\s*[:：][^\n]+',
+                lambda m: _LABELED_VALUE_RE.sub(r'\1******', m.group(0)), '家通联现居住地'),
+}
+
+# 未配置时默认遮蔽的类型
+DEFAULT_PII_TYPES = ("id_card", "phone", "email")
+
+
+class PIIMasker:
+    """
+    敏感信息遮蔽引擎
+    把所有启用的规则编译为一个带命名分组的合并正则，一次扫描完成全部遮蔽；
+    所有规则都给出首字符集合时，合并正则前加首字符断言，扫描时快速跳过无关字符（如中文正文）。
+    可通过 register 接入新的敏感信息类型
+    """
+    
+    def __init__(self, types: Optional[Iterable[str]] = None):
+        self._rules: Dict[str, tuple] = {}
+        self._compile()
+        for name in (DEFAULT_PII_TYPES if types is None else types):
+            if name not in PII_TYPES:
+                raise ValueError(f"未知的敏感信息类型: {name}")
+            self.register(name, *PII_TYPES[name])
+    
+    def register(self, name: str, pattern: str, replacement: Union[str, Callable[[re.Match], str]],
+                 first_chars: Optional[str] = None):
+        """
+        注册（或覆盖）一种敏感信息类型，规则按注册顺序匹配
+        first_chars 为匹配可能的首字符（正则字符类写法，如 r'\\d'），不确定时留空
+        """
+        if not name.isidentifier():
+            raise ValueError(f"敏感信息类型名称必须是合法标识符: {name}")
+        re.compile(pattern)
+        if isinstance(replacement, str):
+            replacement = (lambda value: lambda m: value)(replacement)
+        self._rules[name] = (pattern, replacement, first_chars)
+        self._compile()
+    
+    def _compile(self):
+        pattern = "|".join(f"(?P<{name}>{pattern})" for name, (pattern, _, _) in self._rules.items())
+        first_chars = [chars for _, _, chars in self._rules.values()]
+        if first_chars and all(first_chars):
+            pattern = f"(?=[{''.join(first_chars)}])(?:{pattern})"
+        self._pattern = re.compile(pattern)
+        self._replacements = {name: replacement for name, (_, replacement, _) in self._rules.items()}
+    
+    def _replace(self, match: re.Match) -> str:
+        return self._replacements[match.lastgroup](match)
+    
+    @property
+    def types(self) -> List[str]:
+        """当前启用的敏感信息类型"""
+        return list(self._rules)
+    
+    def mask(self, text: str) -> str:
+        """单次扫描遮蔽文本中的全部敏感信息"""
+        if not text or not self._rules:
+            return text
+        return self._pattern.sub(self._replace, text)
+    
+    def mask_batch(self, texts: Iterable[str]) -> List[str]:
+        """批量遮蔽"""
+        if not self._rules:
+            return list(texts)
+        sub, replace = self._pattern.sub, self._replace
+        return [sub(replace, text) if text else text for text in texts]
+
+
+def _load_pii_types(config_file: str = "configs/recruitment_config.yml") -> Optional[List[str]]:
+    """加载需要遮蔽的敏感信息类型，未配置时返回None（使用默认类型）"""
+    return get_app_config(config_file).section("security").get("pii_types")
+
+# 分块流式加密格式：
+#   文件头 = 魔数(4) + 版本(1) + 明文分块大小(4) + 随机nonce前缀(8)
+#   数据帧 = 结束标记(1) + 密文长度(4) + AES-256-GCM密文（含16字节认证标签）
+# 每帧nonce = nonce前缀 + 帧序号；附加认证数据 = 文件头 + 帧序号 + 结束标记，
+# 因此帧被篡改、重排、截断或在结尾追加数据都能被发现
+STREAM_MAGIC = b"DXE1"
+STREAM_VERSION = 1
+STREAM_CHUNK_SIZE = 1024 * 1024
+_STREAM_HEADER = struct.Struct(">4sBI8s")
+_FRAME_HEADER = struct.Struct(">BI")
+_TAG_SIZE = 16
+
+
+def _frame_aad(header: bytes, index: int, final: bool) -> bytes:
+    return header + struct.pack(">IB", index, final)
+
+
+class StreamEncryptor:
+    """
+    增量加密器：update 输入任意长度的明文片段并返回已完成的密文帧，finalize 输出最后一帧。
+    内存占用只与分块大小有关，可直接用于上传流（如 encryptor.update(await upload.read(n))）
+    """
+    
+    def __init__(self, key: bytes, chunk_size: int = STREAM_CHUNK_SIZE):
+        if not 0 < chunk_size < 2 ** 31:
+            raise ValueError(f"分块大小无效: {chunk_size}")
+        self._aead = AESGCM(key)
+        self._nonce_prefix = os.urandom(8)
+        self._header = _STREAM_HEADER.pack(STREAM_MAGIC, STREAM_VERSION, chunk_size, self._nonce_prefix)
+        self.chunk_size = chunk_size
+        self._buffer = bytearray()
+        self._index = 0
+        self._header_sent = False
+        self._finalized = False
+    
+    def _frame(self, plaintext: bytes, final: bool) -> bytes:
+        if self._index >= 2 ** 32:
+            raise ValueError("加密数据超出单个文件允许的分块数")
+        nonce = self._nonce_prefix + struct.pack(">I", self._index)
+        ciphertext = self._aead.encrypt(nonce, bytes(plaintext), _frame_aad(self._header, self._index, final))
+        self._index += 1
+        return _FRAME_HEADER.pack(final, len(ciphertext)) + ciphertext
+    
+    def _take_header(self) -> bytes:
+        if self._header_sent:
+            return b""
+        self._header_sent = True
+        return self._header
+    
+    def update(self, data: bytes) -> bytes:
+        """输入明文片段，返回可以立即写出的密文（可能为空）"""
+        if self._finalized:
+            raise ValueError("加密器已结束")
+        out = [self._take_header()]
+        self._buffer += data
+        # 至少保留一个字节到下一次调用，保证最后一帧一定带结束标记
+        while len(self._buffer) > self.chunk_size:
+            out.append(self._frame(self._buffer[:self.chunk_size], final=False))
+            del self._buffer[:self.chunk_size]
+        return b"".join(out)
+    
+    def finalize(self) -> bytes:
+        """输出剩余数据和结束帧"""
+        if self._finalized:
+            raise ValueError("加密器已结束")
+        self._finalized = True
+        out = self._take_header() + self._frame(self._buffer, final=True)
+        self._buffer = bytearray()
+        return out
+
+
+class StreamDecryptor:
+    """
+    增量解密器：update 输入任意长度的密文片段，返回已通过认证的明文。
+    finalize 检查是否读到结束帧，未调用 finalize 前输出的明文不能视为完整文件
+    """
+    
+    def __init__(self, key: bytes):
+        self._aead = AESGCM(key)
+        self._buffer = bytearray()
+        self._header: Optional[bytes] = None
+        self._nonce_prefix = b""
+        self._max_frame = 0
+        self._index = 0
+        self._done = False
+    
+    def _read_header(self) -> bool:
+        if len(self._buffer) < _STREAM_HEADER.size:
+            return False
+        magic, version, chunk_size, nonce_prefix = _STREAM_HEADER.unpack_from(self._buffer)
+        if magic != STREAM_MAGIC or version != STREAM_VERSION:
+            raise ValueError("不是受支持的加密文件格式")
+        self._header = bytes(self._buffer[:_STREAM_HEADER.size])
+        self._nonce_prefix = nonce_prefix
+        self._max_frame = chunk_size + _TAG_SIZE
+        del self._buffer[:_STREAM_HEADER.size]
+        return True
+    
+    def update(self, data: bytes) -> bytes:
+        """输入密文片段，返回已解密的明文（可能为空）"""
+        self._buffer += data
+        if self._header is None and not self._read_header():
+            return b""
+        out = []
+        while len(self._buffer) >= _FRAME_HEADER.size:
+            if self._done:
+                raise ValueError("加密文件结束帧之后存在多余数据")
+            final, length = _FRAME_HEADER.unpack_from(self._buffer)
+            if final > 1 or length > self._max_frame:
+                raise ValueError("加密文件已损坏")
+            if len(self._buffer) < _FRAME_HEADER.size + length:
+                break
+            ciphertext = bytes(self._buffer[_FRAME_HEADER.size:_FRAME_HEADER.size + length])
+            del self._buffer[:_FRAME_HEADER.size + length]
+            nonce = self._nonce_prefix + struct.pack(">I", self._index)
+            try:
+                out.append(self._aead.decrypt(nonce, ciphertext, _frame_aad(self._header, self._index, bool(final))))
+            except InvalidTag:
+                raise ValueError("加密文件已损坏或密钥不匹配")
+            self._index += 1
+            self._done = bool(final)
+        return b"".join(out)
+    
+    def finalize(self):
+        """确认密文完整（读到结束帧且没有残留数据），否则抛出 ValueError"""
+        if not self._done or self._buffer:
+            raise ValueError("加密文件不完整或已被截断")
+
+
 class DataSecurity:
     """数据安全和隐私保护工具"""
     
@@ -12,6 +238,8 @@ class DataSecurity:
         # 从环境变量获取加密密钥，如果不存在则生成
         self.encryption_key = self._get_or_create_key()
         self.cipher = Fernet(self.encryption_key)
+        self.stream_key = self._derive_stream_key(self.encryption_key)
+        self.masker = PIIMasker(_load_pii_types())
     
     def _get_or_create_key(self):
         """获取或创建加密密钥"""
@@ -23,39 +251,93 @@ class DataSecurity:
             # 生成新的密钥
             return Fernet.generate_key()
     
+    @staticmethod
+    def _derive_stream_key(encryption_key: bytes) -> bytes:
+        """从主密钥派生文件流加密使用的AES-256密钥"""
+        return HKDF(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=None,
+            info=b"resume-attachment-stream-v1"
+        ).derive(base64.urlsafe_b64decode(encryption_key))
+    
     def encrypt_resume(self, resume_text: str) -> str:
-        """加密简历内容"""
-        encrypted_data = self.cipher.encrypt(resume_text.encode())
-        return base64.urlsafe_b64encode(encrypted_data).decode()
+        """加密简历内容（Fernet令牌本身已是URL安全的base64文本，不再重复编码）"""
+        return self.cipher.encrypt(resume_text.encode()).decode()
     
     def decrypt_resume(self, encrypted_resume: str) -> str:
-        """解密简历内容"""
-        encrypted_data = base64.urlsafe_b64decode(encrypted_resume.encode())
+        """解密简历内容，兼容旧版本额外做过一次base64编码的数据"""
+        encrypted_data = encrypted_resume.encode()
+        # Fernet令牌以版本字节0x80开头，base64后固定为 "gAAAAA"
+        if not encrypted_data.startswith(b"gAAAAA"):
+            encrypted_data = base64.urlsafe_b64decode(encrypted_data)
         decrypted_data = self.cipher.decrypt(encrypted_data)
         return decrypted_data.decode()
     
+    def create_encryptor(self, chunk_size: int = STREAM_CHUNK_SIZE) -> StreamEncryptor:
+        """创建增量加密器，用于边接收上传边加密"""
+        return StreamEncryptor(self.stream_key, chunk_size)
+    
+    def create_decryptor(self) -> StreamDecryptor:
+        """创建增量解密器"""
+        return StreamDecryptor(self.stream_key)
+    
+    def encrypt_stream(self, src: BinaryIO, dst: BinaryIO, chunk_size: int = STREAM_CHUNK_SIZE) -> int:
+        """分块加密二进制流（如简历附件、上传文件），返回写出的字节数"""
+        encryptor = self.create_encryptor(chunk_size)
+        written = 0
+        for data in iter(lambda: src.read(chunk_size), b""):
+            written += dst.write(encryptor.update(data))
+        written += dst.write(encryptor.finalize())
+        return written
+    
+    def decrypt_stream(self, src: BinaryIO, dst: BinaryIO, chunk_size: int = STREAM_CHUNK_SIZE) -> int:
+        """分块解密 encrypt_stream 生成的数据，返回写出的明文字节数；数据被篡改或截断时抛出 ValueError"""
+        decryptor = self.create_decryptor()
+        written = 0
+        for data in iter(lambda: src.read(chunk_size), b""):
+            written += dst.write(decryptor.update(data))
+        decryptor.finalize()
+        return written
+    
+    def _transform_file(self, transform: Callable[[BinaryIO, BinaryIO], int], src_path: str, dst_path: str) -> int:
+        """写入临时文件，成功后再原子替换目标文件，失败时不留下不完整的输出"""
+        tmp_path = f"{dst_path}.{os.getpid()}.tmp"
+        try:
+            with open(src_path, "rb") as src, open(tmp_path, "wb") as dst:
+                written = transform(src, dst)
+            os.replace(tmp_path, dst_path)
+            return written
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    
+    def encrypt_file(self, src_path: str, dst_path: str, chunk_size: int = STREAM_CHUNK_SIZE) -> int:
+        """加密文件（常量内存），返回密文字节数"""
+        return self._transform_file(lambda src, dst: self.encrypt_stream(src, dst, chunk_size), src_path, dst_path)
+    
+    def decrypt_file(self, src_path: str, dst_path: str) -> int:
+        """解密文件（常量内存），返回明文字节数"""
+        return self._transform_file(self.decrypt_stream, src_path, dst_path)
+    
     def hash_candidate_info(self, candidate_info: dict) -> str:
         """对候选人信息进行哈希处理，用于匿名化"""
         # 将字典转换为字符串并排序以确保一致性
         info_str = str(sorted(candidate_info.items()))
         return hashlib.sha256(info_str.encode()).hexdigest()
     
-    def should_delete_resume(self, upload_date: datetime, retention_days: int = 30) -> bool:
-        """检查简历是否应该被删除"""
-        retention_date = upload_date + timedelta(days=retention_days)
-        return datetime.now() > retention_date
+    def should_delete_resume(self, upload_date: datetime, retention_days: Optional[int] = None) -> bool:
+        """
+        检查简历是否应该被删除（未指定保留天数时使用 security.resume_retention_days）
+        批量清理请使用 utils.retention 中按到期时间建立索引的 ResumeRetentionIndex
+        """
+        return datetime.now() > retention_deadline(upload_date, retention_days)
     
     def mask_sensitive_info(self, text: str) -> str:
-        """遮蔽敏感信息（如手机号、邮箱等）"""
-        import re
-        
-        # 遮蔽手机号
-        text = re.sub(r'1[3-9]\d{9}', '1**********', text)
-        
-        # 遮蔽邮箱
-        text = re.sub(r'[\w\.-]+@[\w\.-]+', '***@***.***', text)
-        
-        # 遮蔽身份证号
-        text = re.sub(r'\d{17}[\dXx]', '******************', text)
-        
-        return text
\ No newline at end of file
+        """遮蔽敏感信息（如手机号、邮箱、身份证号等，类型见 security.pii_types）"""
+        return self.masker.mask(text)
+    
+    def mask_sensitive_info_batch(self, texts: List[str]) -> List[str]:
+        """批量遮蔽敏感信息"""
+        return self.masker.mask_batch(texts)
@@ -1,89 +1,368 @@
-// backend/utils/document_parser.py
-import PyPDF2
-import docx
-import pandas as pd
-from typing import Union
+# backend/utils/document_parser.py
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, Iterator, Optional, Union
+import math
 import os
+import signal
+import time
+
+from utils.app_config import get_app_config
+from utils.parse_cache import ParseResultCache, get_parse_cache
+from utils.resume_extractor import extract_resume_info
+from utils.spreadsheet_reader import iter_candidate_records
+from utils.token_budget import estimate_tokens
+
+try:
+    import resource  # 仅Unix可用，用于限制解析子进程内存
+except ImportError:
+    resource = None
+
+
+# 解析结果缓存版本：文本提取或候选人信息提取逻辑变化时递增，使旧缓存失效
+PARSE_CACHE_VERSION = 3
+
+
+def _parse_cache_key(content_hash: str, max_chars: Optional[int], max_tokens: Optional[int]) -> str:
+    """解析缓存键：文件内容摘要 + 缓存版本 + 文本预算"""
+    return f"{content_hash}-v{PARSE_CACHE_VERSION}-{max_chars or 0}-{max_tokens or 0}"
+
+
+def _load_parsing_config(config_file: str = "configs/recruitment_config.yml") -> Dict:
+    """加载文档解析配置"""
+    return get_app_config(config_file).section("document_parsing")
+
+
+def _init_parse_worker(memory_limit_mb: Optional[int]):
+    """解析子进程初始化：限制进程地址空间，异常文件只会让本进程内存不足而不影响主进程"""
+    if resource is not None and memory_limit_mb:
+        limit = int(memory_limit_mb) * 1024 * 1024
+        try:
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ValueError, OSError) as e:
+            print(f"设置解析进程内存上限失败: {e}")
+
+
+def _raise_parse_timeout(signum, frame):
+    raise TimeoutError("文档解析超时")
+
+
+def _parse_in_worker(file_path: str, timeout: Optional[float], max_chars: Optional[int] = None,
+                     max_tokens: Optional[int] = None) -> Dict:
+    """在子进程中解析单个文件，支持SIGALRM的平台上按文件限制解析时间"""
+    use_alarm = bool(timeout) and hasattr(signal, "SIGALRM")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _raise_parse_timeout)
+        signal.alarm(max(1, math.ceil(timeout)))
+    started_at = time.monotonic()
+    try:
+        text = DocumentParser.parse_document(file_path, max_chars=max_chars, max_tokens=max_tokens)
+        candidate_info = DocumentParser.extract_candidate_info(text)
+    finally:
+        if use_alarm:
+            signal.alarm(0)
+    return {
+        "file_path": file_path,
+        "status": "success",
+        "text": text,
+        "candidate_info": candidate_info,
+        "elapsed": round(time.monotonic() - started_at, 3)
+    }
+
+
+def _terminate_workers(pool: ProcessPoolExecutor):
+    """
+    终止进程池中的全部子进程（卡住的解析无法单独取消）
+    进程池随即损坏，未完成的任务以 BrokenProcessPool 结束
+    """
+    for process in list((getattr(pool, "_processes", None) or {}).values()):
+        try:
+            process.terminate()
+        except (OSError, ValueError):
+            pass
+
+
+def _parse_error(file_path: str, message: str) -> Dict:
+    """批量解析中单个文件的错误结果"""
+    return {
+        "file_path": file_path,
+        "status": "error",
+        "message": message
+    }
 
 class DocumentParser:
     """支持多种格式的文档解析器"""
     
     @staticmethod
-    def parse_document(file_path: str) -> str:
+    def parse_document(file_path: str, max_chars: Optional[int] = None, max_tokens: Optional[int] = None) -> str:
         """
         根据文件扩展名解析不同格式的文档
         支持PDF、DOCX、TXT、Excel等格式
+        可指定字符/token预算，达到预算后停止读取后续页面（筛选通常只需要前几页）
+        """
+        return DocumentParser._join_chunks(DocumentParser.iter_document_chunks(file_path), max_chars, max_tokens)
+    
+    @staticmethod
+    def parse_resume(file_path: str, max_chars: Optional[int] = None, max_tokens: Optional[int] = None,
+                     use_cache: bool = True) -> Dict:
+        """
+        解析简历文件并提取候选人信息
+        以文件内容摘要为键缓存结果，同一份文件再次上传时只需计算哈希并读取缓存
+        返回 {"content_hash", "text", "candidate_info", "cached"}
         """
+        content_hash = ParseResultCache.hash_file(file_path)
+        cache = get_parse_cache()
+        cache_key = _parse_cache_key(content_hash, max_chars, max_tokens)
+        if use_cache:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return {"content_hash": content_hash, **cached, "cached": True}
+        
+        text = DocumentParser.parse_document(file_path, max_chars=max_chars, max_tokens=max_tokens)
+        entry = {
+            "text": text,
+            "candidate_info": DocumentParser.extract_candidate_info(text)
+        }
+        if use_cache:
+            cache.set(cache_key, entry)
+        return {"content_hash": content_hash, **entry, "cached": False}
+    
+    @staticmethod
+    def iter_document_chunks(file_path: str) -> Iterator[str]:
+        """按页（PDF）、段落（DOCX）、数据块（TXT）或数据行（Excel）惰性产出文档文本"""
         _, ext = os.path.splitext(file_path)
         ext = ext.lower()
         
         if ext == '.pdf':
-            return DocumentParser._parse_pdf(file_path)
+            return DocumentParser._iter_pdf_pages(file_path)
         elif ext == '.docx':
-            return DocumentParser._parse_docx(file_path)
+            return DocumentParser._iter_docx_paragraphs(file_path)
         elif ext == '.txt':
-            return DocumentParser._parse_txt(file_path)
+            return DocumentParser._iter_txt_chunks(file_path)
         elif ext in ['.xlsx', '.xls']:
-            return DocumentParser._parse_excel(file_path)
+            return DocumentParser._iter_excel_rows(file_path)
         else:
             raise ValueError(f"不支持的文件格式: {ext}")
     
     @staticmethod
-    def _parse_pdf(file_path: str) -> str:
-        """解析PDF文件"""
+    def _join_chunks(chunks: Iterable[str], max_chars: Optional[int] = None, max_tokens: Optional[int] = None) -> str:
+        """一次性拼接文本块；超出字符或token预算时截断并停止读取"""
+        parts = []
+        total_chars = 0
+        total_tokens = 0
+        for chunk in chunks:
+            if not chunk:
+                continue
+            if max_chars is not None and total_chars + len(chunk) > max_chars:
+                parts.append(chunk[:max(0, max_chars - total_chars)])
+                break
+            if max_tokens is not None:
+                chunk_tokens = estimate_tokens(chunk)
+                if total_tokens + chunk_tokens > max_tokens:
+                    # 按token占比截取最后一块
+                    ratio = (max_tokens - total_tokens) / chunk_tokens
+                    parts.append(chunk[:int(len(chunk) * ratio)])
+                    break
+                total_tokens += chunk_tokens
+            parts.append(chunk)
+            total_chars += len(chunk)
+        return "".join(parts)
+    
+    @staticmethod
+    def parse_documents(file_paths: Iterable[str], max_workers: Optional[int] = None,
+                        timeout: Optional[float] = None, memory_limit_mb: Optional[int] = None,
+                        max_chars: Optional[int] = None, max_tokens: Optional[int] = None,
+                        use_cache: bool = True) -> Iterator[Dict]:
+        """
+        批量并行解析文档，按完成顺序逐个产出结果
+        每个文件在进程池中解析（PDF解析受GIL限制，多进程才能利用多核），
+        支持单文件超时和子进程内存上限；损坏的文件导致子进程崩溃时，
+        受影响的文件会在独立进程中逐个重试，不影响其他文件。
+        未指定 max_chars/max_tokens 时使用配置中的筛选文本预算。
+        启用缓存时，内容与之前解析过的文件相同则直接返回缓存结果，不再提交给进程池。
+        结果格式：{"file_path", "status": "success", "text", "candidate_info", "content_hash", "cached", ...}
+        或 {"file_path", "status": "error", "message"}
+        """
+        config = _load_parsing_config()
+        max_workers = max_workers or config.get("max_workers") or os.cpu_count() or 1
+        timeout = timeout if timeout is not None else config.get("timeout_seconds", 60)
+        memory_limit_mb = memory_limit_mb if memory_limit_mb is not None else config.get("memory_limit_mb", 1024)
+        max_chars = max_chars if max_chars is not None else config.get("max_chars")
+        max_tokens = max_tokens if max_tokens is not None else config.get("max_tokens")
+        budget = (max_chars, max_tokens)
+        
+        # 先按内容摘要查缓存，命中的文件直接返回
+        cache = get_parse_cache()
+        cache_keys = {}
+        paths = []
+        for path in file_paths:
+            try:
+                content_hash = ParseResultCache.hash_file(path)
+            except OSError as e:
+                yield _parse_error(path, f"读取文件失败: {e}")
+                continue
+            cache_keys[path] = (content_hash, _parse_cache_key(content_hash, max_chars, max_tokens))
+            cached = cache.get(cache_keys[path][1]) if use_cache else None
+            if cached is not None:
+                yield {"file_path": path, "status": "success", **cached, "content_hash": content_hash, "cached": True}
+            else:
+                paths.append(path)
+        if not paths:
+            return
+        
+        def finish(result: Dict) -> Dict:
+            """为解析结果补充内容摘要并写入缓存"""
+            if result["status"] == "success":
+                content_hash, cache_key = cache_keys[result["file_path"]]
+                if use_cache:
+                    cache.set(cache_key, {"text": result["text"], "candidate_info": result["candidate_info"]})
+                result.update({"content_hash": content_hash, "cached": False})
+            return result
+        
+        def collect(future) -> Optional[Dict]:
+            """取出已结束任务的结果，进程池损坏导致的失败记入待隔离重试的列表"""
+            path = futures[future]
+            try:
+                return finish(future.result())
+            except BrokenProcessPool:
+                # 进程池已损坏，无法确定是哪个文件导致的，稍后逐个隔离重试
+                suspects.append(path)
+            except TimeoutError:
+                return _parse_error(path, f"解析超时（超过{timeout}秒）")
+            except MemoryError:
+                return _parse_error(path, f"解析内存超出上限（{memory_limit_mb}MB）")
+            except Exception as e:
+                return _parse_error(path, str(e))
+            return None
+        
+        # 子进程内的超时无法生效时（如Windows没有SIGALRM），由主进程兜底：文件开始解析后超过该时间仍未完成即视为超时
+        deadline = timeout + 5 if timeout else None
+        workers = min(max_workers, len(paths))
+        suspects = []
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_parse_worker,
+            initargs=(memory_limit_mb,)
+        )
+        try:
+            futures = {pool.submit(_parse_in_worker, path, timeout, *budget): path for path in paths}
+            pending = set(futures)
+            started_at = {}
+            while pending:
+                done, pending = wait(pending, timeout=1.0 if deadline else None, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = collect(future)
+                    if result is not None:
+                        yield result
+                if deadline is None or not pending:
+                    continue
+                # 进程池会提前把任务放入调用队列并标记为运行中，按提交顺序前 workers 个才是正在解析的
+                now = time.monotonic()
+                running = [future for future in futures if future in pending and future.running()][:workers]
+                for future in running:
+                    started_at.setdefault(future, now)
+                expired = [future for future in running if now - started_at[future] > deadline]
+                if expired:
+                    for future in expired:
+                        pending.discard(future)
+                        yield _parse_error(futures[future], f"解析超时（超过{timeout}秒）")
+                    # 卡住的子进程无法单独停止，终止整个进程池，其余未完成的文件随后逐个隔离重试
+                    _terminate_workers(pool)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+        
+        for path in suspects:
+            yield finish(DocumentParser._parse_isolated(path, timeout, memory_limit_mb, budget))
+    
+    @staticmethod
+    def _parse_isolated(file_path: str, timeout: Optional[float], memory_limit_mb: Optional[int],
+                        budget: tuple = (None, None)) -> Dict:
+        """在独立的子进程中解析单个文件，用于进程池崩溃后的隔离重试"""
+        pool = ProcessPoolExecutor(max_workers=1, initializer=_init_parse_worker, initargs=(memory_limit_mb,))
+        try:
+            future = pool.submit(_parse_in_worker, file_path, timeout, *budget)
+            # 子进程内的超时无法生效时（如非Unix平台），由主进程兜底等待
+            return future.result(timeout=timeout + 5 if timeout else None)
+        except BrokenProcessPool:
+            return _parse_error(file_path, "解析进程异常退出，文件可能已损坏")
+        except (TimeoutError, FutureTimeoutError):
+            _terminate_workers(pool)
+            return _parse_error(file_path, f"解析超时（超过{timeout}秒）")
+        except MemoryError:
+            return _parse_error(file_path, f"解析内存超出上限（{memory_limit_mb}MB）")
+        except Exception as e:
+            return _parse_error(file_path, str(e))
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+    
+    @staticmethod
+    def _iter_pdf_pages(file_path: str) -> Iterator[str]:
+        """逐页解析PDF文件，页之间以分页符 \\f 分隔"""
+        import PyPDF2  # 按需导入，避免拖慢服务启动
         try:
             with open(file_path, 'rb') as file:
                 pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text()
-                return text
+                for page_number, page in enumerate(pdf_reader.pages):
+                    # 页与页之间插入分页符（单独一行），便于识别每页重复的页眉页脚
+                    yield ("\n\f\n" if page_number else "") + (page.extract_text() or "")
+        except (TimeoutError, MemoryError):
+            # 超时和内存超限原样抛出，由调用方给出对应的错误信息
+            raise
         except Exception as e:
-            raise Exception(f"PDF解析失败: {str(e)}")
+            raise Exception(f"PDF解析失败: {str(e)}") from e
     
     @staticmethod
-    def _parse_docx(file_path: str) -> str:
-        """解析DOCX文件"""
+    def _iter_docx_paragraphs(file_path: str) -> Iterator[str]:
+        """逐段解析DOCX文件"""
+        import docx  # 按需导入，避免拖慢服务启动
         try:
             doc = docx.Document(file_path)
-            text = ""
             for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text
+                yield paragraph.text + "\n"
+        except (TimeoutError, MemoryError):
+            raise
         except Exception as e:
-            raise Exception(f"DOCX解析失败: {str(e)}")
+            raise Exception(f"DOCX解析失败: {str(e)}") from e
     
     @staticmethod
-    def _parse_txt(file_path: str) -> str:
-        """解析TXT文件"""
+    def _iter_txt_chunks(file_path: str, chunk_size: int = 64 * 1024) -> Iterator[str]:
+        """分块读取TXT文件"""
         try:
             with open(file_path, 'r', encoding='utf-8') as file:
-                return file.read()
+                for chunk in iter(lambda: file.read(chunk_size), ""):
+                    yield chunk
+        except (TimeoutError, MemoryError):
+            raise
         except Exception as e:
-            raise Exception(f"TXT解析失败: {str(e)}")
+            raise Exception(f"TXT解析失败: {str(e)}") from e
     
     @staticmethod
-    def _parse_excel(file_path: str) -> str:
-        """解析Excel文件"""
+    def _iter_excel_rows(file_path: str) -> Iterator[str]:
+        """流式解析Excel文件：识别表头后逐行产出“列名: 值”文本，行之间空一行"""
         try:
-            df = pd.read_excel(file_path)
-            return df.to_string()
+            for record in iter_candidate_records(file_path):
+                yield record["text"] + "\n"
+        except (TimeoutError, MemoryError):
+            raise
         except Exception as e:
-            raise Exception(f"Excel解析失败: {str(e)}")
+            raise Exception(f"Excel解析失败: {str(e)}") from e
+    
+    @staticmethod
+    def iter_candidate_records(file_path: str, sheet_name: Optional[str] = None) -> Iterator[Dict]:
+        """
+        批量候选人表格（如招聘网站导出的Excel/CSV）按行产出结构化候选人记录，
+        每条记录的 text 可直接作为一份简历送入筛选流程
+        """
+        return iter_candidate_records(file_path, sheet_name=sheet_name)
     
     @staticmethod
     def extract_candidate_info(resume_text: str) -> dict:
         """
         从简历文本中提取候选人信息
-        返回结构化数据
+        返回结构化数据：姓名、邮箱、电话、最高学历、工作年限、工作经历、技能及识别出的段落
         """
-        # 这里可以使用NLP技术或正则表达式提取信息
-        # 简化实现，实际应更复杂
-        return {
-            "name": "候选人姓名",
-            "email": "candidate@example.com",
-            "phone": "13800138000",
-            "education": "学历信息",
-            "experience": "工作经验",
-            "skills": ["技能1", "技能2", "技能3"]
-        }
\ No newline at end of file
+        info = extract_resume_info(resume_text)
+        # 段落全文不重复保存，只记录识别出的段落类型
+        info["sections"] = list(info["sections"])
+        return info
@@ -0,0 +1,549 @@
+# backend/utils/job_queue.py
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from utils.app_config import get_app_config
+from utils.retention import get_retention_index, register_retention_purger
+
+# 任务状态
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+ACTIVE_STATUSES = (JOB_QUEUED, JOB_RUNNING)
+
+# 任务项状态：pending 待处理，done 已完成，error 处理出错，filtered 提交时已有结果（如未通过预筛选）
+ITEM_PENDING = "pending"
+ITEM_DONE = "done"
+ITEM_ERROR = "error"
+ITEM_FILTERED = "filtered"
+
+# 保留期限索引中任务记录的 resume_id 前缀
+RETENTION_PREFIX = "job"
+
+
+class JobQueue:
+    """
+    基于SQLite的持久化任务队列
+    每个任务拆成逐项记录，每完成一项立即写入结果（检查点），进程重启或崩溃后只处理未完成的项，
+    已完成的项不会再次调用模型。多个uvicorn worker共享同一个数据库，通过租约（心跳超时）领取任务
+    """
+
+    def __init__(self, db_path: str = "data/jobs.sqlite3"):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        """每个线程使用独立连接"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_db(self):
+        """初始化任务表和任务项表"""
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                status TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                total INTEGER NOT NULL,
+                completed INTEGER NOT NULL DEFAULT 0,
+                failed INTEGER NOT NULL DEFAULT 0,
+                worker_id TEXT,
+                heartbeat_at REAL,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                error TEXT
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, created_at)")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS job_items (
+                job_id TEXT NOT NULL,
+                item_index INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                input TEXT,
+                result TEXT,
+                finished_at REAL,
+                PRIMARY KEY (job_id, item_index)
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_job_items_status ON job_items(job_id, status, item_index)")
+
+    def submit(self, kind: str, inputs: Sequence[str], payload: Optional[Dict] = None,
+               precomputed: Optional[Dict[int, Dict]] = None) -> str:
+        """
+        提交任务，返回任务ID
+        precomputed 为提交时已有结果的项（如未通过预筛选的简历），直接记为完成，不会送入处理
+        """
+        job_id = uuid.uuid4().hex
+        precomputed = precomputed or {}
+        now = time.time()
+        rows = []
+        for index, text in enumerate(inputs):
+            if index in precomputed:
+                rows.append((job_id, index, ITEM_FILTERED, None, json.dumps(precomputed[index], ensure_ascii=False), now))
+            else:
+                rows.append((job_id, index, ITEM_PENDING, text, None, None))
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT INTO jobs (job_id, kind, status, payload, total, completed, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, JOB_QUEUED, json.dumps(payload or {}, ensure_ascii=False), len(rows),
+                 len(precomputed), now)
+            )
+            conn.executemany(
+                "INSERT INTO job_items (job_id, item_index, status, input, result, finished_at) VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        # 没有待处理项的任务直接完成
+        if len(precomputed) == len(rows):
+            self.finish(job_id, JOB_COMPLETED, force=True)
+        else:
+            # 待处理和出错的项会保存简历内容，登记到保留期限索引，到期后由清理线程删除
+            try:
+                get_retention_index().register(f"{RETENTION_PREFIX}:{job_id}")
+            except (sqlite3.Error, OSError) as e:
+                print(f"登记任务 {job_id} 保留期限失败: {e}")
+        return job_id
+
+    @staticmethod
+    def _job_dict(row: tuple) -> Dict:
+        (job_id, kind, status, payload, total, completed, failed, heartbeat_at,
+         created_at, started_at, finished_at, error) = row
+        return {
+            "job_id": job_id,
+            "kind": kind,
+            "status": status,
+            "payload": json.loads(payload),
+            "total": total,
+            "completed": completed,
+            "failed": failed,
+            "progress": round(completed / total, 4) if total else 1.0,
+            "heartbeat_at": heartbeat_at,
+            "created_at": created_at,
+            "started_at": started_at,
+            "finished_at": finished_at,
+            "error": error
+        }
+
+    _JOB_COLUMNS = ("job_id, kind, status, payload, total, completed, failed, heartbeat_at, "
+                    "created_at, started_at, finished_at, error")
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """查询任务状态和进度，任务不存在时返回None"""
+        row = self._connect().execute(
+            f"SELECT {self._JOB_COLUMNS} FROM jobs WHERE job_id = ?", (job_id,)
+        ).fetchone()
+        return self._job_dict(row) if row else None
+
+    def results(self, job_id: str, offset: int = 0, limit: int = 100) -> List[Dict]:
+        """按下标顺序分页获取已完成项的结果"""
+        rows = self._connect().execute(
+            "SELECT item_index, status, result FROM job_items WHERE job_id = ? AND status != ? "
+            "ORDER BY item_index LIMIT ? OFFSET ?",
+            (job_id, ITEM_PENDING, limit, offset)
+        ).fetchall()
+        return [
+            {"resume_index": index, "status": status, "result": json.loads(result) if result else None}
+            for index, status, result in rows
+        ]
+
+    def cancel(self, job_id: str) -> bool:
+        """取消排队中或运行中的任务（运行中的任务在下一次检查时停止），已完成的项保留结果"""
+        cursor = self._connect().execute(
+            f"UPDATE jobs SET status = ?, finished_at = ? WHERE job_id = ? AND status IN ({','.join('?' * len(ACTIVE_STATUSES))})",
+            (JOB_CANCELLED, time.time(), job_id, *ACTIVE_STATUSES)
+        )
+        return cursor.rowcount > 0
+
+    def claim(self, worker_id: str, kinds: Sequence[str], lease_seconds: float) -> Optional[Dict]:
+        """
+        领取一个任务：排队中的任务，或心跳已超时（处理进程已退出）的运行中任务
+        使用 BEGIN IMMEDIATE 保证多个进程不会领取同一个任务
+        """
+        if not kinds:
+            return None
+        now = time.time()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            placeholders = ",".join("?" * len(kinds))
+            row = conn.execute(
+                f"SELECT job_id FROM jobs WHERE kind IN ({placeholders}) AND "
+                "(status = ? OR (status = ? AND heartbeat_at < ?)) ORDER BY created_at LIMIT 1",
+                (*kinds, JOB_QUEUED, JOB_RUNNING, now - lease_seconds)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker_id = ?, heartbeat_at = ?, started_at = COALESCE(started_at, ?) "
+                "WHERE job_id = ?",
+                (JOB_RUNNING, worker_id, now, now, row[0])
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return self.get(row[0])
+
+    def heartbeat(self, job_id: str, worker_id: str) -> Optional[str]:
+        """续租并返回任务当前状态（被取消或已被其他进程接管时调用方应停止处理）"""
+        conn = self._connect()
+        conn.execute(
+            "UPDATE jobs SET heartbeat_at = ? WHERE job_id = ? AND worker_id = ? AND status = ?",
+            (time.time(), job_id, worker_id, JOB_RUNNING)
+        )
+        row = conn.execute("SELECT status, worker_id FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        status, owner = row
+        return status if owner == worker_id else JOB_CANCELLED
+
+    def iter_pending(self, job_id: str, page_size: int = 100) -> Iterator[List[Tuple[int, str]]]:
+        """按下标顺序分页产出待处理项 [(下标, 输入)]"""
+        last_index = -1
+        while True:
+            rows = self._connect().execute(
+                "SELECT item_index, input FROM job_items WHERE job_id = ? AND status = ? AND item_index > ? "
+                "ORDER BY item_index LIMIT ?",
+                (job_id, ITEM_PENDING, last_index, page_size)
+            ).fetchall()
+            if not rows:
+                return
+            yield rows
+            last_index = rows[-1][0]
+
+    def complete_item(self, job_id: str, index: int, result: Any, failed: bool = False) -> bool:
+        """
+        写入一项的结果（检查点）并更新任务进度；成功项的输入内容随即清除，失败项保留输入以便重试
+        同一项只会记录一次，重复写入返回False
+        """
+        now = time.time()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = conn.execute(
+                "UPDATE job_items SET status = ?, result = ?, input = CASE WHEN ? THEN input END, finished_at = ? "
+                "WHERE job_id = ? AND item_index = ? AND status = ?",
+                (ITEM_ERROR if failed else ITEM_DONE, json.dumps(result, ensure_ascii=False, default=str), failed,
+                 now, job_id, index, ITEM_PENDING)
+            )
+            if cursor.rowcount:
+                conn.execute(
+                    "UPDATE jobs SET completed = completed + 1, failed = failed + ?, heartbeat_at = ? WHERE job_id = ?",
+                    (1 if failed else 0, now, job_id)
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return cursor.rowcount > 0
+
+    def finish(self, job_id: str, status: str, error: Optional[str] = None, force: bool = False):
+        """结束任务（默认只结束运行中的任务，不覆盖已取消的状态）"""
+        condition = "" if force else " AND status = ?"
+        params = (status, time.time(), error, job_id) + (() if force else (JOB_RUNNING,))
+        self._connect().execute(
+            f"UPDATE jobs SET status = ?, finished_at = ?, error = ? WHERE job_id = ?{condition}", params
+        )
+
+    def retry_failed(self, job_id: str) -> int:
+        """
+        把出错的项重新置为待处理并让任务重新排队（已成功的项不受影响），返回将重新处理的项数
+        处理函数异常导致任务失败时尚未处理的项一并继续处理；简历内容已超过保留期限被删除的项不能重试
+        只能重试已结束的任务，排队中或运行中的任务返回0
+        """
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT status FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if row is None or row[0] in ACTIVE_STATUSES:
+                conn.execute("COMMIT")
+                return 0
+            cursor = conn.execute(
+                "UPDATE job_items SET status = ?, result = NULL, finished_at = NULL "
+                "WHERE job_id = ? AND status = ? AND input IS NOT NULL",
+                (ITEM_PENDING, job_id, ITEM_ERROR)
+            )
+            retried = cursor.rowcount
+            pending = conn.execute(
+                "SELECT COUNT(*) FROM job_items WHERE job_id = ? AND status = ?", (job_id, ITEM_PENDING)
+            ).fetchone()[0]
+            if pending:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, worker_id = NULL, completed = completed - ?, failed = failed - ?, "
+                    "finished_at = NULL, error = NULL WHERE job_id = ?",
+                    (JOB_QUEUED, retried, retried, job_id)
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return pending
+
+    def purge_inputs(self, job_id: str) -> int:
+        """
+        删除任务中保存的简历内容（超过保留期限时由清理线程调用），返回因此无法处理的项数
+        尚未处理的项记为出错，出错的项不能再重试
+        """
+        now = time.time()
+        result = json.dumps({"status": "error", "message": "简历内容已超过保留期限被删除"}, ensure_ascii=False)
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = conn.execute(
+                "UPDATE job_items SET status = ?, result = ?, finished_at = ? WHERE job_id = ? AND status = ?",
+                (ITEM_ERROR, result, now, job_id, ITEM_PENDING)
+            )
+            expired = cursor.rowcount
+            if expired:
+                conn.execute(
+                    "UPDATE jobs SET completed = completed + ?, failed = failed + ? WHERE job_id = ?",
+                    (expired, expired, job_id)
+                )
+            conn.execute("UPDATE job_items SET input = NULL WHERE job_id = ? AND input IS NOT NULL", (job_id,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return expired
+
+    def release(self, job_id: str, worker_id: str):
+        """正常停机时把运行中的任务放回队列，由下一个进程立即接管"""
+        self._connect().execute(
+            "UPDATE jobs SET status = ?, worker_id = NULL, heartbeat_at = NULL WHERE job_id = ? AND worker_id = ? "
+            "AND status = ?",
+            (JOB_QUEUED, job_id, worker_id, JOB_RUNNING)
+        )
+
+    def stats(self) -> Dict:
+        """各状态的任务数"""
+        rows = self._connect().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+
+# 任务处理函数：handler(任务信息, 待处理项的异步迭代器) -> 产出 (下标, 结果, 是否失败) 的异步迭代器
+JobHandler = Callable[[Dict, AsyncIterator[Tuple[int, str]]], AsyncIterator[Tuple[int, Any, bool]]]
+
+
+class JobWorker:
+    """
+    后台任务处理器（每个进程一个，运行在服务的事件循环中）
+    定期领取任务，把待处理项交给对应的处理函数，逐项写入检查点；
+    处理期间定期续租，发现任务已被取消时立即停止
+    """
+
+    def __init__(self, queue: JobQueue, poll_interval: float = 2.0, lease_seconds: float = 60.0,
+                 max_concurrent_jobs: int = 1):
+        self.queue = queue
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.max_concurrent_jobs = max(1, int(max_concurrent_jobs))
+        self.worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._handlers: Dict[str, JobHandler] = {}
+        self._jobs: Dict[str, asyncio.Task] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._stopping = False
+
+    def register(self, kind: str, handler: JobHandler):
+        """注册任务类型的处理函数"""
+        self._handlers[kind] = handler
+
+    async def _call(self, func: Callable, *args) -> Any:
+        """数据库操作放到线程中执行，避免锁等待阻塞事件循环"""
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    async def _pending_items(self, job_id: str) -> AsyncIterator[Tuple[int, str]]:
+        pages = self.queue.iter_pending(job_id)
+        while True:
+            page = await self._call(next, pages, None)
+            if page is None:
+                return
+            for index, text in page:
+                yield index, text
+
+    async def _keep_alive(self, job_id: str, job_task: asyncio.Task):
+        """定期续租；任务被取消或被其他进程接管时停止处理"""
+        while not job_task.done():
+            # 续租间隔同时决定取消的响应速度，最长5秒
+            await asyncio.sleep(min(self.lease_seconds / 3, 5.0))
+            status = await self._call(self.queue.heartbeat, job_id, self.worker_id)
+            if status != JOB_RUNNING:
+                print(f"任务 {job_id} 状态为 {status}，停止处理")
+                job_task.cancel()
+                return
+
+    async def _run_job(self, job: Dict):
+        job_id = job["job_id"]
+        results = self._handlers[job["kind"]](job, self._pending_items(job_id))
+        try:
+            async for index, result, failed in results:
+                await self._call(self.queue.complete_item, job_id, index, result, failed)
+            await self._call(self.queue.finish, job_id, JOB_COMPLETED)
+            print(f"任务 {job_id} 处理完成")
+        except asyncio.CancelledError:
+            if self._stopping:
+                await self._call(self.queue.release, job_id, self.worker_id)
+            raise
+        except Exception as e:
+            print(f"任务 {job_id} 处理失败: {e}")
+            await self._call(self.queue.finish, job_id, JOB_FAILED, str(e))
+        finally:
+            await results.aclose()
+
+    async def _supervise(self, job: Dict):
+        job_task = asyncio.ensure_future(self._run_job(job))
+        keep_alive = asyncio.ensure_future(self._keep_alive(job["job_id"], job_task))
+        try:
+            await job_task
+        except asyncio.CancelledError:
+            if not job_task.done():
+                job_task.cancel()
+                await asyncio.gather(job_task, return_exceptions=True)
+        finally:
+            keep_alive.cancel()
+            self._jobs.pop(job["job_id"], None)
+
+    async def _loop(self):
+        while not self._stopping:
+            job = None
+            if len(self._jobs) < self.max_concurrent_jobs:
+                try:
+                    job = await self._call(self.queue.claim, self.worker_id, list(self._handlers), self.lease_seconds)
+                except Exception as e:
+                    print(f"领取任务失败: {e}")
+            if job is None:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            print(f"开始处理任务 {job['job_id']}: 共{job['total']}项，已完成{job['completed']}项")
+            self._jobs[job["job_id"]] = asyncio.ensure_future(self._supervise(job))
+
+    def start(self):
+        """在当前事件循环中启动后台处理"""
+        if self._task is None:
+            self._stopping = False
+            self._wake = asyncio.Event()
+            self._task = asyncio.ensure_future(self._loop())
+
+    def notify(self):
+        """有新任务时立即检查队列，不必等到下次轮询（须在事件循环线程中调用）"""
+        if self._wake is not None:
+            self._wake.set()
+
+    async def stop(self):
+        """停止处理，运行中的任务放回队列（已完成的项均已写入检查点）"""
+        self._stopping = True
+        tasks = list(self._jobs.values()) + ([self._task] if self._task else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+
+    def stats(self) -> Dict:
+        return {
+            "worker_id": self.worker_id,
+            "running_jobs": list(self._jobs),
+            "jobs": self.queue.stats()
+        }
+
+
+_queue: Optional[JobQueue] = None
+_worker: Optional[JobWorker] = None
+_queue_lock = threading.Lock()
+# 各API模块注册的任务处理函数，创建任务处理器时统一注册
+_job_handlers: Dict[str, JobHandler] = {}
+
+
+def _load_queue_config() -> Dict:
+    """加载任务队列配置"""
+    return get_app_config().section("job_queue")
+
+
+def get_job_queue() -> JobQueue:
+    """获取进程内共享的任务队列"""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = JobQueue(_load_queue_config().get("db_path", "data/jobs.sqlite3"))
+    return _queue
+
+
+def register_job_handler(kind: str, handler: JobHandler):
+    """注册任务类型的处理函数；只记录处理函数，不会创建队列数据库，可在模块导入时调用"""
+    with _queue_lock:
+        _job_handlers[kind] = handler
+        if _worker is not None:
+            _worker.register(kind, handler)
+
+
+def _purge_job_inputs(job_id: str):
+    """保留期限到期时删除任务数据库中的简历内容"""
+    get_job_queue().purge_inputs(job_id)
+
+
+register_retention_purger(RETENTION_PREFIX, _purge_job_inputs)
+
+
+def get_job_worker() -> JobWorker:
+    """获取进程内共享的任务处理器（处理函数通过 register_job_handler 注册）"""
+    global _worker
+    if _worker is None:
+        queue = get_job_queue()
+        with _queue_lock:
+            if _worker is None:
+                config = _load_queue_config()
+                _worker = JobWorker(
+                    queue,
+                    poll_interval=config.get("poll_interval_seconds", 2.0),
+                    lease_seconds=config.get("lease_seconds", 60.0),
+                    max_concurrent_jobs=config.get("max_concurrent_jobs", 1)
+                )
+                for kind, handler in _job_handlers.items():
+                    _worker.register(kind, handler)
+    return _worker
+
+
+def start_job_worker() -> Optional[JobWorker]:
+    """按配置启动后台任务处理（job_queue.enabled 为 false 时不启动）"""
+    if not _load_queue_config().get("enabled", True):
+        return None
+    worker = get_job_worker()
+    worker.start()
+    return worker
+
+
+async def stop_job_worker():
+    """停止后台任务处理"""
+    if _worker is not None:
+        await _worker.stop()
@@ -0,0 +1,285 @@
+# backend/utils/llm_cache.py
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from utils.app_config import get_app_config
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# 每写入多少次执行一次过期/容量淘汰
+_EVICT_EVERY_N_WRITES = 32
+
+# 命中统计和最近访问时间先记在内存中，每隔多少秒（或积累多少条）批量写入一次
+_FLUSH_INTERVAL_SECONDS = 5.0
+_FLUSH_MAX_PENDING = 500
+
+
+def _normalize(value: Any) -> Any:
+    """规范化提示输入：字符串压缩空白，字典按键排序，保证语义相同的输入得到相同的键"""
+    if isinstance(value, str):
+        return _WHITESPACE_RE.sub(" ", value).strip()
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in sorted(value.items(), key=lambda item: str(item[0]))}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+class LLMResponseCache:
+    """
+    基于内容寻址的LLM响应缓存
+    键为 (模型名, 温度, 系统提示, 规范化后的输入) 的SHA-256摘要，
+    数据保存在本地SQLite中，进程重启后仍然有效，并可在多个uvicorn worker之间共享。
+    支持TTL过期和按条数/总大小的LRU淘汰。
+    读取只执行查询，命中统计和最近访问时间在内存中累积后批量写入；
+    异步代码请使用 aget/aset，数据库操作在线程池中执行，不阻塞事件循环
+    """
+
+    def __init__(self, db_path: str = "data/llm_cache.sqlite3", ttl_seconds: int = 7 * 24 * 3600,
+                 max_entries: int = 20000, max_size_mb: float = 256, enabled: bool = True):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.enabled = enabled
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._writes = 0
+        # 待写入的共享统计增量和 {键: 最近访问时间}
+        self._pending_stats = {"hits": 0, "misses": 0}
+        self._pending_access: Dict[str, float] = {}
+        self._last_flush = time.monotonic()
+        if self.enabled:
+            self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        """每个线程使用独立连接"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_db(self):
+        """初始化缓存表"""
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache(last_access)")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_cache_stats (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            )
+        """)
+        conn.execute("INSERT OR IGNORE INTO llm_cache_stats(name, value) VALUES ('hits', 0), ('misses', 0)")
+
+    @staticmethod
+    def make_key(model: str, temperature: Optional[float], system_prompt: str, inputs: Any) -> str:
+        """根据模型参数和提示输入生成缓存键"""
+        payload = json.dumps({
+            "model": model,
+            "temperature": temperature,
+            "system_prompt": _normalize(system_prompt or ""),
+            "inputs": _normalize(inputs)
+        }, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _record(self, name: str, key: Optional[str] = None, accessed_at: Optional[float] = None):
+        """在内存中累计命中统计（命中时同时记录访问时间），到期后批量写入"""
+        with self._lock:
+            if name == "hits":
+                self._hits += 1
+                self._pending_access[key] = accessed_at
+            else:
+                self._misses += 1
+            self._pending_stats[name] += 1
+            due = (len(self._pending_access) >= _FLUSH_MAX_PENDING
+                   or time.monotonic() - self._last_flush >= _FLUSH_INTERVAL_SECONDS)
+        if due:
+            self.flush()
+
+    def flush(self):
+        """把内存中累积的命中统计和最近访问时间在一个事务中写入数据库"""
+        if not self.enabled:
+            return
+        with self._lock:
+            stats, self._pending_stats = self._pending_stats, {"hits": 0, "misses": 0}
+            access, self._pending_access = self._pending_access, {}
+            self._last_flush = time.monotonic()
+        if not access and not any(stats.values()):
+            return
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN")
+            conn.executemany("UPDATE llm_cache SET last_access = ? WHERE key = ?",
+                             [(accessed_at, key) for key, accessed_at in access.items()])
+            conn.executemany("UPDATE llm_cache_stats SET value = value + ? WHERE name = ?",
+                             [(count, name) for name, count in stats.items() if count])
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            logger.warning(f"写入LLM缓存统计失败: {type(e).__name__}: {e}")
+
+    def get(self, key: str) -> Optional[Any]:
+        """读取缓存，未命中或已过期返回None（只执行查询，访问记录批量写入）"""
+        if not self.enabled:
+            return None
+        now = time.time()
+        try:
+            row = self._connect().execute("SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                self._record("misses")
+                return None
+            value = json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"读取LLM缓存失败: {type(e).__name__}: {e}")
+            return None
+        self._record("hits", key, now)
+        return value
+
+    async def aget(self, key: str) -> Optional[Any]:
+        """异步读取缓存：数据库操作在线程池中执行"""
+        if not self.enabled:
+            return None
+        return await asyncio.get_running_loop().run_in_executor(None, self.get, key)
+
+    async def aset(self, key: str, value: Any):
+        """异步写入缓存：数据库操作在线程池中执行"""
+        if self.enabled:
+            await asyncio.get_running_loop().run_in_executor(None, self.set, key, value)
+
+    def set(self, key: str, value: Any):
+        """写入缓存"""
+        if not self.enabled:
+            return
+        now = time.time()
+        data = json.dumps(value, ensure_ascii=False, default=str)
+        try:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO llm_cache(key, value, size, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, data, len(data.encode("utf-8")), now, now)
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"写入LLM缓存失败: {type(e).__name__}: {e}")
+            return
+        with self._lock:
+            self._writes += 1
+            should_evict = self._writes % _EVICT_EVERY_N_WRITES == 0
+        if should_evict:
+            self.evict()
+
+    def evict(self):
+        """删除过期条目，并按最近访问时间淘汰超出条数/大小上限的条目"""
+        if not self.enabled:
+            return
+        # 先写入内存中的访问时间，淘汰顺序才准确
+        self.flush()
+        try:
+            conn = self._connect()
+            conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+            count, total_size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache").fetchone()
+            if count > self.max_entries:
+                conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN (SELECT key FROM llm_cache ORDER BY last_access LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+            if total_size > self.max_bytes:
+                excess = total_size - self.max_bytes
+                freed = 0
+                victims = []
+                for key, size in conn.execute("SELECT key, size FROM llm_cache ORDER BY last_access"):
+                    victims.append((key,))
+                    freed += size
+                    if freed >= excess:
+                        break
+                conn.executemany("DELETE FROM llm_cache WHERE key = ?", victims)
+        except sqlite3.Error as e:
+            logger.warning(f"LLM缓存淘汰失败: {type(e).__name__}: {e}")
+
+    def clear(self):
+        """清空缓存"""
+        if self.enabled:
+            self._connect().execute("DELETE FROM llm_cache")
+
+    def stats(self) -> Dict[str, Any]:
+        """获取缓存统计：当前进程与所有worker共享的命中/未命中次数"""
+        with self._lock:
+            local_hits, local_misses = self._hits, self._misses
+        result = {
+            "enabled": self.enabled,
+            "hits": local_hits,
+            "misses": local_misses,
+            "hit_rate": round(local_hits / (local_hits + local_misses), 4) if local_hits + local_misses else 0.0
+        }
+        if not self.enabled:
+            return result
+        self.flush()
+        try:
+            conn = self._connect()
+            shared = dict(conn.execute("SELECT name, value FROM llm_cache_stats").fetchall())
+            count, total_size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache").fetchone()
+            result.update({
+                "shared_hits": shared.get("hits", 0),
+                "shared_misses": shared.get("misses", 0),
+                "entries": count,
+                "size_bytes": total_size
+            })
+        except sqlite3.Error as e:
+            logger.warning(f"读取LLM缓存统计失败: {type(e).__name__}: {e}")
+        return result
+
+
+_cache: Optional[LLMResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def _load_cache_config(config_file: str = "configs/recruitment_config.yml") -> Dict:
+    """加载LLM缓存配置"""
+    return get_app_config(config_file).section("llm_cache")
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """获取进程内共享的LLM响应缓存"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                config = _load_cache_config()
+                try:
+                    _cache = LLMResponseCache(
+                        db_path=config.get("db_path", "data/llm_cache.sqlite3"),
+                        ttl_seconds=config.get("ttl_seconds", 7 * 24 * 3600),
+                        max_entries=config.get("max_entries", 20000),
+                        max_size_mb=config.get("max_size_mb", 256),
+                        enabled=config.get("enabled", True)
+                    )
+                except Exception as e:
+                    logger.error(f"初始化LLM缓存失败，缓存将被禁用: {type(e).__name__}: {e}", exc_info=True)
+                    _cache = LLMResponseCache(enabled=False)
+    return _cache
@@ -0,0 +1,63 @@
+# backend/utils/llm_configs.py
+import threading
+from typing import Any, Callable, Dict, Optional
+
+
+class LLMConfigCache:
+    """
+    进程内共享的LLM模型配置缓存
+    相同 (配置类型, 模型, 地址, 密钥, 参数) 的模型配置对象只创建一次，所有智能体复用，避免重复校验配置。
+    只缓存配置对象：HTTP客户端由工具包根据配置在智能体内部创建，无法从外部注入，连接不在智能体间共享
+    """
+
+    def __init__(self):
+        self._configs: Dict[tuple, Any] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, factory: Callable, **params) -> Any:
+        """获取（必要时创建）共享的模型配置对象"""
+        key = (f"{factory.__module__}.{factory.__qualname__}", tuple(sorted(params.items())))
+        config = self._configs.get(key)
+        if config is not None:
+            with self._lock:
+                self._hits += 1
+            return config
+        with self._lock:
+            config = self._configs.get(key)
+            if config is None:
+                config = factory(**params)
+                self._configs[key] = config
+                self._misses += 1
+            else:
+                self._hits += 1
+        return config
+
+    def stats(self) -> Dict[str, Any]:
+        """共享配置对象数量和复用次数"""
+        with self._lock:
+            return {
+                "configs": len(self._configs),
+                "reused": self._hits,
+                "created": self._misses
+            }
+
+
+_cache: Optional[LLMConfigCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_config_cache() -> LLMConfigCache:
+    """获取进程内共享的LLM模型配置缓存"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LLMConfigCache()
+    return _cache
+
+
+def get_llm_config(factory: Callable, **params) -> Any:
+    """获取共享的模型配置对象，如 get_llm_config(OpenAICompatible, model=..., api_key=...)"""
+    return get_llm_config_cache().get(factory, **params)
@@ -0,0 +1,188 @@
+# backend/utils/llm_governor.py
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Callable, Dict, Optional
+
+from utils.app_config import get_app_config
+from utils.api_key_pool import TokenBucket, is_rate_limit_error
+from utils.server_profile import quota_share
+from utils.token_budget import estimate_tokens
+
+# 等待并发名额时的轮询间隔（秒）
+_POLL_INTERVAL = 0.05
+
+
+def is_throttle_error(error: BaseException) -> bool:
+    """限流（429）或超时都说明已超出服务端实际承载能力"""
+    if is_rate_limit_error(error) or isinstance(error, (TimeoutError, asyncio.TimeoutError)):
+        return True
+    return "timeout" in type(error).__name__.lower() or "timed out" in str(error).lower()
+
+
+class LLMGovernor:
+    """
+    全局LLM调用调控器（所有智能体共享）
+    - RPM/TPM令牌桶：按账号额度平滑发出请求，避免突发流量触发限流
+    - AIMD并发控制：调用成功时并发上限加性增长（每轮约+increase_step），
+      遇到429或超时时乘性下降（×decrease_factor，decrease_interval 内最多下降一次），
+      使在途请求数逼近服务端的实际承载上限而不引发大量报错
+    """
+
+    def __init__(self, rpm: Optional[float] = None, tpm: Optional[float] = None, initial_concurrency: float = 8,
+                 min_concurrency: float = 1, max_concurrency: float = 64, increase_step: float = 1.0,
+                 decrease_factor: float = 0.5, decrease_interval: float = 2.0):
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.min_concurrency = max(1.0, float(min_concurrency))
+        self.max_concurrency = max(self.min_concurrency, float(max_concurrency))
+        self.limit = min(max(float(initial_concurrency), self.min_concurrency), self.max_concurrency)
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.decrease_interval = decrease_interval
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+        self._completed = 0
+        self._throttled = 0
+        self._failed = 0
+
+    def _try_acquire(self, tokens: float) -> float:
+        """尝试占用一个调用名额，成功返回0，否则返回建议等待的秒数（调用方需持有锁）"""
+        if self.in_flight >= int(self.limit):
+            return _POLL_INTERVAL
+        now = time.monotonic()
+        wait = max(
+            self.requests.wait_time(1, now) if self.requests else 0.0,
+            self.tokens.wait_time(tokens, now) if self.tokens else 0.0
+        )
+        if wait > 0:
+            return wait
+        if self.requests:
+            self.requests.consume(1, now)
+        if self.tokens:
+            self.tokens.consume(tokens, now)
+        self.in_flight += 1
+        return 0.0
+
+    def acquire(self, tokens: float = 1):
+        """阻塞等待调用名额"""
+        with self._condition:
+            while True:
+                wait = self._try_acquire(tokens)
+                if not wait:
+                    return
+                self._condition.wait(wait)
+
+    async def acquire_async(self, tokens: float = 1):
+        """异步等待调用名额，不阻塞事件循环"""
+        while True:
+            with self._condition:
+                wait = self._try_acquire(tokens)
+            if not wait:
+                return
+            await asyncio.sleep(min(wait, 1.0))
+
+    def release(self, outcome: str = "completed"):
+        """归还名额并调整并发上限：completed 加性增长，throttled 乘性下降，failed 不调整"""
+        with self._condition:
+            self.in_flight -= 1
+            if outcome == "completed":
+                self._completed += 1
+                self.limit = min(self.max_concurrency, self.limit + self.increase_step / self.limit)
+            elif outcome == "throttled":
+                self._throttled += 1
+                now = time.monotonic()
+                if now - self._last_decrease >= self.decrease_interval:
+                    self.limit = max(self.min_concurrency, self.limit * self.decrease_factor)
+                    self._last_decrease = now
+            else:
+                self._failed += 1
+            self._condition.notify_all()
+
+    @contextmanager
+    def slot(self, tokens: float = 1):
+        """with governor.slot(tokens): 调用模型"""
+        self.acquire(tokens)
+        try:
+            yield
+        except BaseException as e:
+            self.release("throttled" if is_throttle_error(e) else "failed")
+            raise
+        self.release()
+
+    @asynccontextmanager
+    async def slot_async(self, tokens: float = 1):
+        """异步版本的 slot"""
+        await self.acquire_async(tokens)
+        try:
+            yield
+        except BaseException as e:
+            self.release("throttled" if is_throttle_error(e) else "failed")
+            raise
+        self.release()
+
+    def call(self, func: Callable, *args, tokens: float = 1, **kwargs) -> Any:
+        """在调控下同步调用"""
+        with self.slot(tokens):
+            return func(*args, **kwargs)
+
+    async def acall(self, func: Callable, *args, tokens: float = 1, **kwargs) -> Any:
+        """在调控下异步调用（func 须为协程函数）"""
+        async with self.slot_async(tokens):
+            return await func(*args, **kwargs)
+
+    def stats(self) -> Dict:
+        """当前并发上限、在途调用数和各类结果计数"""
+        with self._condition:
+            now = time.monotonic()
+            return {
+                "concurrency_limit": round(self.limit, 2),
+                "in_flight": self.in_flight,
+                "request_headroom": round(self.requests.fill_ratio(now), 3) if self.requests else None,
+                "token_headroom": round(self.tokens.fill_ratio(now), 3) if self.tokens else None,
+                "completed": self._completed,
+                "throttled": self._throttled,
+                "failed": self._failed
+            }
+
+
+_governor: Optional[LLMGovernor] = None
+_governor_lock = threading.Lock()
+_default_output_tokens = 500
+
+
+def _load_governor_config(config_file: str = "configs/recruitment_config.yml") -> Dict:
+    """加载LLM调用调控配置"""
+    return get_app_config(config_file).section("llm_governor")
+
+
+def get_llm_governor() -> LLMGovernor:
+    """获取进程内共享的LLM调用调控器"""
+    global _governor, _default_output_tokens
+    if _governor is None:
+        with _governor_lock:
+            if _governor is None:
+                config = _load_governor_config()
+                _default_output_tokens = config.get("default_output_tokens", 500)
+                # 多进程部署时账号级额度和并发上限按工作进程数分摊
+                share = quota_share()
+                rpm, tpm = config.get("rpm"), config.get("tpm")
+                _governor = LLMGovernor(
+                    rpm=rpm * share if rpm else None,
+                    tpm=tpm * share if tpm else None,
+                    initial_concurrency=config.get("initial_concurrency", 8) * share,
+                    min_concurrency=config.get("min_concurrency", 1),
+                    max_concurrency=config.get("max_concurrency", 64) * share,
+                    increase_step=config.get("increase_step", 1.0),
+                    decrease_factor=config.get("decrease_factor", 0.5),
+                    decrease_interval=config.get("decrease_interval_seconds", 2.0)
+                )
+    return _governor
+
+
+def estimate_request_tokens(prompt: str, output_tokens: Optional[int] = None) -> int:
+    """估算一次调用消耗的token：输入 + 预留输出（默认 llm_governor.default_output_tokens）"""
+    get_llm_governor()
+    return estimate_tokens(prompt) + (_default_output_tokens if output_tokens is None else output_tokens)
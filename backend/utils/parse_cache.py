@@ -0,0 +1,169 @@
+# backend/utils/parse_cache.py
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import zlib
+from typing import Any, Dict, Optional
+
+from utils.app_config import get_app_config
+from utils.retention import get_retention_index
+
+# 缓存文件后缀：zlib压缩的JSON
+_ENTRY_SUFFIX = ".json.z"
+
+
+class ParseResultCache:
+    """
+    文档解析结果缓存
+    以文件内容的BLAKE2b摘要为键，把提取出的文本和候选人信息压缩后保存在本地磁盘，
+    同一份简历重复上传时只需计算哈希并读取缓存；总大小超过上限时按最近访问时间淘汰。
+    缓存中含简历原文和联系方式，每个条目写入时登记到保留期限索引，到期后由清理线程删除
+    """
+
+    def __init__(self, cache_dir: str = "data/parse_cache", max_size_mb: float = 512, enabled: bool = True):
+        self.cache_dir = cache_dir
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None
+        self._hits = 0
+        self._misses = 0
+        if self.enabled:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def hash_file(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+        """分块计算文件内容的BLAKE2b摘要"""
+        digest = hashlib.blake2b(digest_size=20)
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        """按键的前两位分目录存放，避免单目录文件过多"""
+        return os.path.join(self.cache_dir, key[:2], key + _ENTRY_SUFFIX)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """读取缓存，未命中返回None"""
+        if not self.enabled:
+            return None
+        path = self._entry_path(key)
+        try:
+            with open(path, "rb") as f:
+                value = json.loads(zlib.decompress(f.read()).decode("utf-8"))
+            # 更新访问时间，供LRU淘汰使用
+            os.utime(path, None)
+        except FileNotFoundError:
+            with self._lock:
+                self._misses += 1
+            return None
+        except (OSError, ValueError, zlib.error) as e:
+            print(f"读取解析缓存失败: {e}")
+            with self._lock:
+                self._misses += 1
+            return None
+        with self._lock:
+            self._hits += 1
+        return value
+
+    def set(self, key: str, value: Dict[str, Any]):
+        """压缩写入缓存（先写临时文件再原子替换，多进程并发写入同一键也是安全的）"""
+        if not self.enabled:
+            return
+        path = self._entry_path(key)
+        data = zlib.compress(json.dumps(value, ensure_ascii=False).encode("utf-8"), 6)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"写入解析缓存失败: {e}")
+            return
+        try:
+            get_retention_index().register(f"parse_cache:{key}", os.path.abspath(path))
+        except (sqlite3.Error, OSError) as e:
+            print(f"登记解析缓存保留期限失败: {e}")
+
+        with self._lock:
+            if self._size is not None:
+                self._size += len(data)
+            over_limit = self._size is None or self._size > self.max_bytes
+        if over_limit:
+            self.evict()
+
+    def _scan(self) -> list:
+        """扫描缓存目录，返回 [(访问时间, 大小, 路径)]"""
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(_ENTRY_SUFFIX):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def evict(self):
+        """总大小超过上限时，删除最久未访问的条目直到降到上限的90%"""
+        entries = self._scan()
+        total = sum(size for _, size, _ in entries)
+        if total > self.max_bytes:
+            target = int(self.max_bytes * 0.9)
+            for _, size, path in sorted(entries):
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    continue
+                if total <= target:
+                    break
+        with self._lock:
+            self._size = total
+
+    def stats(self) -> Dict[str, Any]:
+        """获取缓存统计"""
+        with self._lock:
+            hits, misses, size = self._hits, self._misses, self._size
+        return {
+            "enabled": self.enabled,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "size_bytes": size
+        }
+
+
+_cache: Optional[ParseResultCache] = None
+_cache_lock = threading.Lock()
+
+
+def _load_cache_config(config_file: str = "configs/recruitment_config.yml") -> Dict:
+    """加载解析缓存配置"""
+    return get_app_config(config_file).section("document_parsing").get("cache", {}) or {}
+
+
+def get_parse_cache() -> ParseResultCache:
+    """获取进程内共享的解析结果缓存"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                config = _load_cache_config()
+                try:
+                    _cache = ParseResultCache(
+                        cache_dir=config.get("cache_dir", "data/parse_cache"),
+                        max_size_mb=config.get("max_size_mb", 512),
+                        enabled=config.get("enabled", True)
+                    )
+                except OSError as e:
+                    print(f"初始化解析缓存失败，缓存将被禁用: {e}")
+                    _cache = ParseResultCache(enabled=False)
+    return _cache
@@ -0,0 +1,156 @@
+# backend/utils/prefilter.py
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+from utils.skill_matcher import get_skill_matcher
+
+# 英文/数字词（保留 c++、c#、node.js 这类技能写法）
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+# 连续的中文字符
+_CJK_RUN_RE = re.compile(r"[\u3400-\u4dbf\u4e00-\u9fff]+")
+
+# 职位要求中表示技能列表的字段名
+SKILL_KEYS = ("skills", "skill", "required_skills", "技能", "技能要求")
+
+
+def tokenize(text: str) -> List[str]:
+    """分词：英文按单词切分，中文按相邻两字（bigram）切分，单字词保留原字"""
+    if not text:
+        return []
+    text = text.lower()
+    tokens = [word.rstrip(".") for word in _WORD_RE.findall(text)]
+    for run in _CJK_RUN_RE.findall(text):
+        if len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return [token for token in tokens if token]
+
+
+def extract_job_skills(job_requirements: dict) -> List[str]:
+    """从职位要求（可能嵌套）中提取技能列表，保持原顺序并去重"""
+    skills = []
+
+    def collect(value):
+        if isinstance(value, str):
+            skills.extend(part.strip() for part in re.split(r"[,，、;；/]", value) if part.strip())
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                collect(item)
+
+    def walk(node):
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if str(key).lower() in SKILL_KEYS:
+                    collect(value)
+                else:
+                    walk(value)
+        elif isinstance(node, list):
+            for item in node:
+                walk(item)
+
+    walk(job_requirements or {})
+    seen = set()
+    unique_skills = []
+    for skill in skills:
+        if skill.lower() not in seen:
+            seen.add(skill.lower())
+            unique_skills.append(skill)
+    return unique_skills
+
+
+def _flatten_text(node) -> Iterable[str]:
+    """展开职位要求中的全部文本值，作为检索查询"""
+    if isinstance(node, dict):
+        for value in node.values():
+            yield from _flatten_text(value)
+    elif isinstance(node, (list, tuple)):
+        for item in node:
+            yield from _flatten_text(item)
+    elif node is not None:
+        yield str(node)
+
+
+class ResumePrefilter:
+    """
+    简历本地预筛选
+    在调用LLM之前，用BM25（中文bigram分词）对简历与职位要求做相关性排序，
+    并结合职位技能关键词的覆盖率计算预筛选分数，只把排名靠前或超过阈值的简历送入模型
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75, skill_weight: float = 0.6):
+        self.k1 = k1
+        self.b = b
+        self.skill_weight = skill_weight
+
+    def _bm25_scores(self, documents: List[List[str]], query_terms: List[str]) -> List[float]:
+        """在当前批次简历上构建BM25索引并计算查询得分"""
+        doc_count = len(documents)
+        if doc_count == 0 or not query_terms:
+            return [0.0] * doc_count
+
+        term_freqs = [Counter(tokens) for tokens in documents]
+        doc_lengths = [len(tokens) for tokens in documents]
+        avg_length = sum(doc_lengths) / doc_count or 1.0
+        doc_freq = Counter()
+        for freqs in term_freqs:
+            doc_freq.update(freqs.keys())
+
+        idf = {
+            term: math.log(1 + (doc_count - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5))
+            for term in query_terms
+        }
+        scores = []
+        for freqs, length in zip(term_freqs, doc_lengths):
+            norm = self.k1 * (1 - self.b + self.b * length / avg_length)
+            score = 0.0
+            for term in query_terms:
+                tf = freqs.get(term)
+                if tf:
+                    score += idf[term] * tf * (self.k1 + 1) / (tf + norm)
+            scores.append(score)
+        return scores
+
+    def match_skills(self, resume_text: str, skills: List[str]) -> List[str]:
+        """技能关键词匹配（支持同义词）：返回简历中出现的职位技能"""
+        return get_skill_matcher().match(resume_text or "", skills)["matched_skills"]
+
+    def rank(self, resume_texts: List[str], job_requirements: dict) -> List[Dict]:
+        """
+        计算每份简历的预筛选分数，返回与输入顺序一致的列表
+        score = (1 - skill_weight) × 归一化BM25 + skill_weight × 技能覆盖率；
+        职位要求中没有任何文本和技能时无从比较，所有简历记为1.0，不会被阈值过滤
+        """
+        skills = extract_job_skills(job_requirements)
+        query_terms = list(dict.fromkeys(tokenize(" ".join(_flatten_text(job_requirements)))))
+        bm25_scores = self._bm25_scores([tokenize(text) for text in resume_texts], query_terms)
+        max_bm25 = max(bm25_scores, default=0.0) or 1.0
+        skill_weight = self.skill_weight if skills else 0.0
+        has_criteria = bool(query_terms or skills)
+
+        ranking = []
+        for index, (resume_text, bm25_score) in enumerate(zip(resume_texts, bm25_scores)):
+            matched_skills = self.match_skills(resume_text, skills)
+            coverage = len(matched_skills) / len(skills) if skills else 0.0
+            score = (1 - skill_weight) * bm25_score / max_bm25 + skill_weight * coverage if has_criteria else 1.0
+            ranking.append({
+                "resume_index": index,
+                "score": round(score, 4),
+                "bm25_score": round(bm25_score, 4),
+                "skill_coverage": round(coverage, 4),
+                "matched_skills": matched_skills
+            })
+        return ranking
+
+    @staticmethod
+    def select(ranking: List[Dict], top_n: Optional[int] = None, threshold: Optional[float] = None) -> List[int]:
+        """
+        选出需要送入LLM的简历下标（按原始顺序）
+        同时指定时需满足分数不低于阈值，且数量不超过 top_n；都未指定时全部保留
+        """
+        candidates = [item for item in ranking if threshold is None or item["score"] >= threshold]
+        if top_n is not None:
+            candidates = sorted(candidates, key=lambda item: item["score"], reverse=True)[:max(0, top_n)]
+        return sorted(item["resume_index"] for item in candidates)
@@ -0,0 +1,157 @@
+# backend/utils/prompt_compression.py
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Sequence
+
+from utils.resume_extractor import RELEVANT_SECTIONS, SECTION_TITLES, build_resume_excerpt, extract_resume_info
+from utils.screening_engine import load_screening_config
+from utils.token_budget import count_tokens, tokenizer_name
+
+# 预算不足时优先保留的段落（靠前的优先）
+DEFAULT_SECTION_PRIORITY = ("work", "projects", "skills", "education", "summary", "objective", "certificates")
+
+# 预算内放不下完整段落时，剩余预算低于该值则不再截取该段落
+_MIN_PARTIAL_TOKENS = 50
+_TRUNCATED_MARK = "……"
+
+_ZERO_WIDTH_RE = re.compile(r"[\u200b-\u200d\u2060\ufeff]")
+_INLINE_SPACE_RE = re.compile(r"[ \t\u00a0\u3000]+")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+_DIGITS_RE = re.compile(r"\d+")
+_SPACE_RE = re.compile(r"\s+")
+# 页码行：第1页 / 第 1 页 共 3 页 / Page 1 of 3 / - 2 - / 1/3
+_PAGE_NUMBER_RE = re.compile(
+    r"^(?:第\s*\d+\s*页(?:\s*[/,，]?\s*共\s*\d+\s*页)?|page\s*\d+(?:\s*(?:of|/)\s*\d+)?|[-—]?\s*\d{1,3}\s*[-—]?|\d+\s*/\s*\d+)$",
+    re.IGNORECASE
+)
+
+
+def normalize_whitespace(text: str) -> str:
+    """去掉零宽字符，合并行内连续空白，去掉行首尾空白，连续空行只保留一个（分页符保留）"""
+    text = _ZERO_WIDTH_RE.sub("", text or "").replace("\r\n", "\n").replace("\r", "\n")
+    # 只去掉空格（行内空白已统一为空格），分页符所在的行需要保留
+    lines = [_INLINE_SPACE_RE.sub(" ", line).strip(" ") for line in text.split("\n")]
+    return _BLANK_LINES_RE.sub("\n\n", "\n".join(lines)).strip()
+
+
+def _line_key(line: str) -> str:
+    """页眉页脚比较用的键：忽略数字（页码）和空白"""
+    return _SPACE_RE.sub("", _DIGITS_RE.sub("#", line))
+
+
+def strip_page_boilerplate(text: str, edge_lines: int = 2) -> str:
+    """
+    去掉每页重复的页眉页脚和页码行，页之间以分页符 \\f 分隔（PDF解析结果）
+    每页首尾 edge_lines 行中，在至少一半的页面（且不少于2页）上重复出现的行视为页眉页脚；
+    没有分页符的文本只去掉页码行
+    """
+    pages = [page.strip("\n") for page in text.split("\f")]
+    page_lines = [page.split("\n") for page in pages]
+    repeated = set()
+    if len(pages) >= 2:
+        counts = Counter()
+        for lines in page_lines:
+            edges = [line for line in lines if line.strip()]
+            counts.update({_line_key(line) for line in edges[:edge_lines] + edges[-edge_lines:]})
+        min_pages = max(2, (len(pages) + 1) // 2)
+        repeated = {key for key, count in counts.items() if count >= min_pages and key}
+
+    kept_pages = []
+    for lines in page_lines:
+        kept = [
+            line for line in lines
+            if not _PAGE_NUMBER_RE.match(line.strip()) and _line_key(line) not in repeated
+        ]
+        kept_pages.append("\n".join(kept).strip("\n"))
+    return "\n".join(page for page in kept_pages if page)
+
+
+def truncate_to_budget(text: str, token_budget: int) -> str:
+    """按行截取到token预算以内（单行超出时按比例截取该行）"""
+    lines = []
+    used = 0
+    for line in text.split("\n"):
+        line_tokens = count_tokens(line) + 1
+        if used + line_tokens > token_budget:
+            remaining = token_budget - used
+            if remaining > 0 and line_tokens > 1:
+                lines.append(line[:int(len(line) * remaining / line_tokens)])
+            lines.append(_TRUNCATED_MARK)
+            break
+        lines.append(line)
+        used += line_tokens
+    return "\n".join(lines)
+
+
+def _select_sections(info: Dict, token_budget: int, priority: Sequence[str]) -> str:
+    """按优先级在预算内选取段落，输出时仍按简历中的常规顺序排列"""
+    sections = info["sections"]
+    facts = []
+    if info.get("education"):
+        facts.append(f"最高学历：{info['education']}")
+    if info.get("experience_years") is not None:
+        facts.append(f"工作年限：约{info['experience_years']:g}年")
+    header = "；".join(facts)
+    remaining = token_budget - count_tokens(header)
+
+    order = [name for name in priority if name in sections]
+    order += [name for name in RELEVANT_SECTIONS if name in sections and name not in order]
+    selected: Dict[str, str] = {}
+    skipped = []
+    # 先按优先级放入完整段落，再用剩余预算截取放不下的段落中优先级最高的一个，
+    # 避免一个超长段落挤掉后面较短的技能、教育段落
+    for name in order:
+        block = f"【{SECTION_TITLES[name]}】\n{sections[name]}"
+        block_tokens = count_tokens(block) + 2
+        if block_tokens <= remaining:
+            selected[name] = block
+            remaining -= block_tokens
+        else:
+            skipped.append((name, block))
+    if skipped and remaining >= _MIN_PARTIAL_TOKENS:
+        name, block = skipped[0]
+        selected[name] = truncate_to_budget(block, remaining)
+    parts = [header] if header else []
+    parts += [selected[name] for name in RELEVANT_SECTIONS if name in selected]
+    return "\n\n".join(parts)
+
+
+def compress_resume(resume_text: str, token_budget: Optional[int] = None,
+                    section_priority: Optional[Sequence[str]] = None) -> Dict:
+    """
+    压缩送入模型的简历：合并空白 → 去掉每页重复的页眉页脚 → 只保留相关段落（不含联系方式），
+    超出预算时按段落优先级取舍。未识别出足够的段落时退回按行截取清理后的全文。
+    未指定时使用 screening.compression 中的预算和优先级，返回
+    {"text", "tokens": {"original", "compressed", "saved", "counter"}}
+    """
+    config = load_screening_config().get("compression", {}) or {}
+    if token_budget is None:
+        token_budget = config.get("resume_token_budget", 2000)
+    priority: List[str] = list(section_priority or config.get("section_priority") or DEFAULT_SECTION_PRIORITY)
+
+    if config.get("enabled", True):
+        cleaned = normalize_whitespace(resume_text)
+        if config.get("strip_page_boilerplate", True):
+            cleaned = strip_page_boilerplate(cleaned)
+        info = extract_resume_info(cleaned)
+        sections = info["sections"]
+        relevant_chars = sum(len(sections[name]) for name in RELEVANT_SECTIONS if name in sections)
+        # 与 build_resume_excerpt 一致：相关段落不足全文一半时段落识别可能不完整，保留全文
+        if relevant_chars * 2 < len(cleaned):
+            text = truncate_to_budget(cleaned, token_budget) if token_budget else cleaned
+        else:
+            text = _select_sections(info, token_budget or float("inf"), priority)
+    else:
+        text = build_resume_excerpt(resume_text)
+
+    original = count_tokens(resume_text)
+    compressed = count_tokens(text)
+    return {
+        "text": text,
+        "tokens": {
+            "original": original,
+            "compressed": compressed,
+            "saved": max(0, original - compressed),
+            "counter": tokenizer_name()
+        }
+    }
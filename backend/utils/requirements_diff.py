@@ -0,0 +1,78 @@
+# backend/utils/requirements_diff.py
+import json
+from typing import Any, Dict, List
+
+from utils.prefilter import SKILL_KEYS, extract_job_skills
+from utils.skill_matcher import get_skill_matcher
+
+# 职位要求字段名中的关键词 -> 受影响的评估维度；未匹配的字段归入整体评估
+DIMENSION_KEYWORDS = {
+    "experience_match": ("experience", "years", "经验", "年限", "资历"),
+    "education_match": ("education", "degree", "major", "学历", "教育", "专业"),
+}
+OVERALL_DIMENSION = "overall_assessment"
+
+# 各评估维度重新评估时需要的简历段落（未识别出这些段落时发送完整摘录）
+DIMENSION_SECTIONS = {
+    "experience_match": ("work", "projects"),
+    "education_match": ("education",),
+}
+
+
+def _strip_skills(node: Any) -> Any:
+    """去掉职位要求中的技能字段（技能变化单独比较）"""
+    if isinstance(node, dict):
+        return {key: _strip_skills(value) for key, value in node.items() if str(key).lower() not in SKILL_KEYS}
+    if isinstance(node, list):
+        return [_strip_skills(item) for item in node]
+    return node
+
+
+def _dimension_of(field: str) -> str:
+    name = str(field).lower()
+    for dimension, keywords in DIMENSION_KEYWORDS.items():
+        if any(keyword in name for keyword in keywords):
+            return dimension
+    return OVERALL_DIMENSION
+
+
+def _canonical_skills(job_requirements: dict) -> Dict[str, str]:
+    """{标准技能名（小写）: 原始写法}，同义词视为同一技能"""
+    matcher = get_skill_matcher()
+    skills = {}
+    for skill in extract_job_skills(job_requirements):
+        skills.setdefault(matcher.canonicalize(skill).lower(), skill)
+    return skills
+
+
+def diff_requirements(old: dict, new: dict) -> Dict:
+    """
+    比较新旧职位要求
+    技能按标准名称比较（仅改写法或换成同义词不算变化），其余字段按顶层字段比较，
+    返回 added_skills/removed_skills、changed_fields（{字段: {"old", "new"}}）和受影响的评估维度
+    """
+    old_skills = _canonical_skills(old or {})
+    new_skills = _canonical_skills(new or {})
+    old_fields = _strip_skills(old or {})
+    new_fields = _strip_skills(new or {})
+
+    changed_fields = {}
+    for field in list(old_fields) + [field for field in new_fields if field not in old_fields]:
+        old_value, new_value = old_fields.get(field), new_fields.get(field)
+        if json.dumps(old_value, sort_keys=True, default=str) != json.dumps(new_value, sort_keys=True, default=str):
+            changed_fields[field] = {"old": old_value, "new": new_value}
+    dimensions: List[str] = []
+    for field in changed_fields:
+        dimension = _dimension_of(field)
+        if dimension not in dimensions:
+            dimensions.append(dimension)
+    return {
+        "added_skills": [label for canonical, label in new_skills.items() if canonical not in old_skills],
+        "removed_skills": [label for canonical, label in old_skills.items() if canonical not in new_skills],
+        "changed_fields": changed_fields,
+        "dimensions": dimensions
+    }
+
+
+def skills_changed(diff: Dict) -> bool:
+    return bool(diff["added_skills"] or diff["removed_skills"])
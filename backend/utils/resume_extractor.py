@@ -0,0 +1,202 @@
+# backend/utils/resume_extractor.py
+import datetime
+import re
+from typing import Dict, List, Optional
+
+from utils.skill_matcher import get_skill_matcher
+
+# 简历段落标题：段落类型 -> 常见标题写法（中英文）
+SECTION_HEADERS = {
+    "personal": ["个人信息", "基本信息", "基本资料", "个人资料", "联系方式", "Personal Information", "Personal Info",
+                 "Contact", "Contact Information"],
+    "summary": ["自我评价", "个人简介", "个人总结", "个人优势", "自我介绍", "Summary", "Profile", "About Me",
+                "Professional Summary"],
+    "objective": ["求职意向", "期望职位", "Objective", "Career Objective"],
+    "education": ["教育经历", "教育背景", "学习经历", "教育", "Education", "Educational Background", "Academic Background"],
+    "work": ["工作经历", "工作经验", "工作履历", "实习经历", "职业经历", "Work Experience", "Professional Experience",
+             "Employment History", "Work History", "Experience", "Internship", "Internships"],
+    "projects": ["项目经历", "项目经验", "项目", "Projects", "Project Experience"],
+    "skills": ["技能", "专业技能", "技能特长", "技能清单", "技能证书", "个人技能", "Skills", "Technical Skills",
+               "Core Skills", "Skills & Certifications"],
+    "certificates": ["证书", "资格证书", "获奖情况", "荣誉奖项", "获奖经历", "Certifications", "Certificates", "Awards",
+                     "Honors"],
+}
+
+# 筛选时保留的段落及顺序（不含联系方式等个人信息）
+RELEVANT_SECTIONS = ("summary", "objective", "work", "projects", "education", "skills", "certificates")
+
+SECTION_TITLES = {
+    "personal": "个人信息", "summary": "自我评价", "objective": "求职意向", "education": "教育经历",
+    "work": "工作经历", "projects": "项目经历", "skills": "技能", "certificates": "证书与奖项",
+}
+
+# 学历关键词，按从高到低排列
+DEGREE_LEVELS = [
+    ("博士", ["博士", "Ph.D", "PhD", "Doctor", "Doctorate"]),
+    ("硕士", ["硕士", "研究生", "Master", "MBA", "M.S.", "M.Sc"]),
+    ("本科", ["本科", "学士", "Bachelor", "B.S.", "B.Sc", "B.E.", "B.A."]),
+    ("大专", ["大专", "专科", "高职", "Associate"]),
+    ("高中", ["高中", "中专", "中技", "High School"]),
+]
+
+
+def _alternation(words: List[str]) -> str:
+    # 长词优先，避免“教育”抢先匹配“教育经历”
+    return "|".join(re.escape(word) for word in sorted(words, key=len, reverse=True))
+
+
+# 标题行：可带序号、【】/[] 包围、#/* 装饰，标题后可跟冒号及同一行的内容
+_SECTION_RE = re.compile(
+    r"^[ \t]*(?:[#*>\-•·]+[ \t]*)?(?:[0-9一二三四五六七八九十]+[.、)）][ \t]*)?[【\[]?[ \t]*(?:"
+    + "|".join(f"(?P<{section}>{_alternation(headers)})" for section, headers in SECTION_HEADERS.items())
+    + r")[ \t]*[】\]]?[ \t]*(?:[:：][ \t]*(?P<inline>[^\n]*))?[ \t]*$",
+    re.IGNORECASE | re.MULTILINE
+)
+_EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}")
+_PHONE_RE = re.compile(r"(?<![\d])(?:\+?86[-\s]?)?(1[3-9]\d)[-\s]?(\d{4})[-\s]?(\d{4})(?!\d)")
+_NAME_LABEL_RE = re.compile(r"(?:姓\s*名|(?i:name))\s*[:：]\s*([^\s:：|,，;；/]{1,30}(?: [A-Z][a-z]+){0,2})")
+_CJK_NAME_RE = re.compile(r"^[\u4e00-\u9fff]{2,4}(?:[·•][\u4e00-\u9fff]{1,6})?$")
+_EN_NAME_RE = re.compile(r"^[A-Z][a-z]+(?: [A-Z][a-z]*\.?){1,2}$")
+_NAME_NOISE_RE = re.compile(r"(?:个人简历|求职简历|简历|Resume|Curriculum Vitae|CV)", re.IGNORECASE)
+_DEGREE_RE = re.compile(
+    "|".join(f"(?P<level{i}>{_alternation(words)})" for i, (_, words) in enumerate(DEGREE_LEVELS)),
+    re.IGNORECASE
+)
+_CN_NUMBERS = {"一": 1, "两": 2, "二": 2, "三": 3, "四": 4, "五": 5, "六": 6, "七": 7, "八": 8, "九": 9, "十": 10}
+_YEARS_RE = re.compile(
+    r"(?:工作年限|工作经验|从业年限)\s*[:：]?\s*(?P<cn_label>\d+(?:\.\d+)?)\s*年"
+    r"|(?P<cn>\d+(?:\.\d+)?|[一两二三四五六七八九十]+)\s*\+?\s*年(?:以上)?[^\n，。,.；;]{0,8}?经验"
+    r"|(?P<en>\d+(?:\.\d+)?)\+?\s*years?\s+(?:of\s+)?(?:[A-Za-z-]+\s+){0,3}?experience",
+    re.IGNORECASE
+)
+# 日期区间：2018.03 - 2021.05 / 2019年3月-至今 / 2020/01 – Present
+_DATE_RANGE_RE = re.compile(
+    r"(?P<y1>(?:19|20)\d{2})\s*(?:[年./-]\s*(?P<m1>\d{1,2})\s*月?)?\s*(?:-|–|—|~|～|至|到|to)\s*"
+    r"(?:(?P<y2>(?:19|20)\d{2})\s*(?:[年./-]\s*(?P<m2>\d{1,2})\s*月?)?|(?P<now>至今|现在|目前|今|present|now|current))",
+    re.IGNORECASE
+)
+
+
+def split_sections(resume_text: str) -> Dict[str, str]:
+    """
+    按段落标题切分简历，返回 {段落类型: 段落文本}
+    第一个标题之前的内容归入 "header"，同类段落出现多次时合并
+    """
+    sections: Dict[str, List[str]] = {}
+    current, start = "header", 0
+    for match in _SECTION_RE.finditer(resume_text):
+        sections.setdefault(current, []).append(resume_text[start:match.start()])
+        current, start = _matched_section(match), match.end()
+        if match.group("inline"):
+            sections.setdefault(current, []).append(match.group("inline") + "\n")
+    sections.setdefault(current, []).append(resume_text[start:])
+    return {name: "".join(parts).strip() for name, parts in sections.items() if "".join(parts).strip()}
+
+
+def _matched_section(match: re.Match) -> str:
+    """找出标题匹配的段落类型（标题带同行内容时 lastgroup 为 inline，不能直接使用）"""
+    for section in SECTION_HEADERS:
+        if match.group(section):
+            return section
+    return "header"
+
+
+def _extract_name(resume_text: str, header_text: str) -> Optional[str]:
+    """优先取“姓名：”标注，否则取开头几行中形如中文姓名或英文姓名的一行"""
+    match = _NAME_LABEL_RE.search(resume_text)
+    if match:
+        return match.group(1).strip()
+    for line in header_text.splitlines()[:5]:
+        line = _NAME_NOISE_RE.sub("", line).strip(" \t|:：-")
+        if _CJK_NAME_RE.match(line) or _EN_NAME_RE.match(line):
+            return line
+    return None
+
+
+def _extract_education(education_text: str, resume_text: str) -> Optional[str]:
+    """取教育经历（没有时为全文）中出现的最高学历"""
+    levels = {int(m.lastgroup[5:]) for m in _DEGREE_RE.finditer(education_text or resume_text)}
+    return DEGREE_LEVELS[min(levels)][0] if levels else None
+
+
+def _parse_years(value: str) -> float:
+    if value in _CN_NUMBERS:
+        return float(_CN_NUMBERS[value])
+    if value.startswith("十") and len(value) == 2:
+        return 10.0 + _CN_NUMBERS.get(value[1], 0)
+    try:
+        return float(value)
+    except ValueError:
+        return 0.0
+
+
+def _years_from_date_ranges(work_text: str, today: Optional[datetime.date] = None) -> Optional[float]:
+    """根据工作经历中的日期区间估算工作年限（最早开始到最晚结束）"""
+    today = today or datetime.date.today()
+    starts, ends = [], []
+    for match in _DATE_RANGE_RE.finditer(work_text):
+        start = int(match.group("y1")) * 12 + int(match.group("m1") or 1) - 1
+        if match.group("now"):
+            end = today.year * 12 + today.month - 1
+        else:
+            end = int(match.group("y2")) * 12 + int(match.group("m2") or 12) - 1
+        if end >= start:
+            starts.append(start)
+            ends.append(end)
+    if not starts:
+        return None
+    return round((max(ends) - min(starts) + 1) / 12, 1)
+
+
+def _extract_experience_years(resume_text: str, work_text: str) -> Optional[float]:
+    """优先取“N年工作经验”类表述，否则按工作经历的日期区间估算"""
+    years = [
+        _parse_years(m.group("cn_label") or m.group("cn") or m.group("en"))
+        for m in _YEARS_RE.finditer(resume_text)
+    ]
+    years = [y for y in years if 0 < y < 60]
+    if years:
+        return max(years)
+    return _years_from_date_ranges(work_text) if work_text else None
+
+
+def extract_resume_info(resume_text: str) -> Dict:
+    """
+    本地提取简历结构化信息（全部为预编译正则，单核每秒可处理数千份简历）
+    返回 name/email/phone/education/experience_years/experience/skills/sections
+    """
+    resume_text = resume_text or ""
+    sections = split_sections(resume_text)
+
+    email = _EMAIL_RE.search(resume_text)
+    phone = _PHONE_RE.search(resume_text)
+    return {
+        "name": _extract_name(resume_text, sections.get("header", "") + "\n" + sections.get("personal", "")),
+        "email": email.group(0) if email else None,
+        "phone": "".join(phone.groups()) if phone else None,
+        "education": _extract_education(sections.get("education", ""), resume_text),
+        "experience_years": _extract_experience_years(resume_text, sections.get("work", "")),
+        "experience": sections.get("work", ""),
+        "skills": get_skill_matcher().find_skills(resume_text),
+        "sections": sections
+    }
+
+
+def build_resume_excerpt(resume_text: str, info: Optional[Dict] = None) -> str:
+    """
+    生成筛选用的简历摘录：只保留工作/项目/教育/技能等相关段落，去掉联系方式等个人信息。
+    未识别出相关段落，或相关段落不足全文一半（段落识别可能不完整）时返回原文
+    """
+    info = info or extract_resume_info(resume_text)
+    sections = info["sections"]
+    parts = [f"【{SECTION_TITLES[name]}】\n{sections[name]}" for name in RELEVANT_SECTIONS if name in sections]
+    if sum(len(sections[name]) for name in RELEVANT_SECTIONS if name in sections) * 2 < len(resume_text.strip()):
+        return resume_text
+    facts = []
+    if info.get("education"):
+        facts.append(f"最高学历：{info['education']}")
+    if info.get("experience_years") is not None:
+        facts.append(f"工作年限：约{info['experience_years']:g}年")
+    if facts:
+        parts.insert(0, "；".join(facts))
+    return "\n\n".join(parts)
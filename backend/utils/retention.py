@@ -0,0 +1,296 @@
+# backend/utils/retention.py
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from utils.app_config import get_app_config
+
+DEFAULT_RETENTION_DAYS = 30
+
+# 不以文件形式存储的简历内容（如任务队列数据库中的简历文本）：resume_id 前缀 -> 删除函数
+# 登记时 resume_id 写作 "前缀:键"，到期后以键调用删除函数
+_purgers: Dict[str, Callable[[str], None]] = {}
+
+
+def register_retention_purger(prefix: str, purge: Callable[[str], None]):
+    """注册非文件存储的删除函数；只记录函数，不会创建索引数据库，可在模块导入时调用"""
+    _purgers[prefix] = purge
+
+
+def load_security_config(config_file: str = "configs/recruitment_config.yml") -> Dict:
+    """加载安全相关配置"""
+    return get_app_config(config_file).section("security")
+
+
+def retention_deadline(upload_date: datetime, retention_days: Optional[int] = None) -> datetime:
+    """计算简历的删除期限，未指定保留天数时使用 security.resume_retention_days"""
+    if retention_days is None:
+        retention_days = load_security_config().get("resume_retention_days", DEFAULT_RETENTION_DAYS)
+    return upload_date + timedelta(days=retention_days)
+
+
+class ResumeRetentionIndex:
+    """
+    简历保留期限索引
+    每份已存储的简历登记一条 (resume_id, 文件路径, 到期时间)，到期时间列建有索引，
+    清理时按到期时间顺序只读取已过期的记录，开销与过期数量成正比，与存储总量无关。
+    多个工作进程共享同一个索引，通过表中的清理锁（带过期时间）保证同一时间只有一个进程执行清理
+    """
+
+    def __init__(self, db_path: str = "data/retention.sqlite3", retention_days: int = DEFAULT_RETENTION_DAYS):
+        self.db_path = db_path
+        self.retention_days = retention_days
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._deleted = 0
+        self._last_sweep_at: Optional[float] = None
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        """每个线程使用独立连接"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_db(self):
+        """初始化索引表"""
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS resume_retention (
+                resume_id TEXT PRIMARY KEY,
+                path TEXT,
+                uploaded_at REAL NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_resume_retention_expires_at ON resume_retention(expires_at)")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS retention_locks (
+                name TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """)
+
+    def acquire_lock(self, owner: str, ttl_seconds: float, name: str = "sweeper") -> bool:
+        """
+        获取（或续期）清理锁，成功返回True
+        锁未被占用、已过期或本来就属于 owner 时获取成功；持有者退出后锁在 ttl_seconds 后由其他进程接管
+        """
+        now = time.time()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT owner, expires_at FROM retention_locks WHERE name = ?", (name,)).fetchone()
+            acquired = row is None or row[0] == owner or row[1] <= now
+            if acquired:
+                conn.execute(
+                    "INSERT OR REPLACE INTO retention_locks (name, owner, expires_at) VALUES (?, ?, ?)",
+                    (name, owner, now + ttl_seconds)
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return acquired
+
+    def release_lock(self, owner: str, name: str = "sweeper"):
+        """释放 owner 持有的清理锁，其他进程可立即接管"""
+        self._connect().execute("DELETE FROM retention_locks WHERE name = ? AND owner = ?", (name, owner))
+
+    def lock_owner(self, name: str = "sweeper") -> Optional[str]:
+        """当前持有清理锁（且未过期）的进程标识"""
+        row = self._connect().execute(
+            "SELECT owner FROM retention_locks WHERE name = ? AND expires_at > ?", (name, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def register(self, resume_id: str, path: Optional[str] = None, upload_date: Optional[datetime] = None,
+                 retention_days: Optional[int] = None):
+        """登记（或更新）一份已存储的简历"""
+        upload_date = upload_date or datetime.now()
+        expires_at = retention_deadline(
+            upload_date, self.retention_days if retention_days is None else retention_days
+        )
+        self._connect().execute(
+            "INSERT OR REPLACE INTO resume_retention (resume_id, path, uploaded_at, expires_at) VALUES (?, ?, ?, ?)",
+            (resume_id, path, upload_date.timestamp(), expires_at.timestamp())
+        )
+
+    def unregister(self, resume_id: str):
+        """简历已被其他途径删除时移除登记"""
+        self._connect().execute("DELETE FROM resume_retention WHERE resume_id = ?", (resume_id,))
+
+    def expired(self, limit: int = 100, now: Optional[datetime] = None) -> List[Dict]:
+        """按到期时间顺序返回最多 limit 条已过期记录"""
+        now_ts = (now or datetime.now()).timestamp()
+        rows = self._connect().execute(
+            "SELECT resume_id, path, expires_at FROM resume_retention WHERE expires_at <= ? "
+            "ORDER BY expires_at LIMIT ?",
+            (now_ts, limit)
+        ).fetchall()
+        return [{"resume_id": resume_id, "path": path, "expires_at": expires_at} for resume_id, path, expires_at in rows]
+
+    def sweep(self, batch_size: int = 200, max_batches: Optional[int] = None, now: Optional[datetime] = None) -> int:
+        """
+        分批删除已过期简历的文件和登记记录，返回删除数量
+        前缀注册了删除函数的记录交给该函数删除（见 register_retention_purger）；
+        文件已不存在的视为删除成功；删除失败的保留登记，下次清理时重试
+        """
+        deleted = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            batch = self.expired(batch_size, now)
+            if not batch:
+                break
+            removed = []
+            for item in batch:
+                prefix, _, key = item["resume_id"].partition(":")
+                purge = _purgers.get(prefix) if key else None
+                try:
+                    if purge is not None:
+                        purge(key)
+                    elif item["path"]:
+                        os.remove(item["path"])
+                    removed.append(item["resume_id"])
+                except FileNotFoundError:
+                    removed.append(item["resume_id"])
+                except (OSError, sqlite3.Error) as e:
+                    print(f"删除过期简历失败 {item['path'] or item['resume_id']}: {e}")
+            if removed:
+                self._connect().executemany(
+                    "DELETE FROM resume_retention WHERE resume_id = ?", [(resume_id,) for resume_id in removed]
+                )
+            deleted += len(removed)
+            batches += 1
+            if len(removed) < len(batch):
+                # 本批有删除失败的记录，避免在同一批上反复重试
+                break
+        with self._lock:
+            self._deleted += deleted
+            self._last_sweep_at = time.time()
+        return deleted
+
+    def stats(self) -> Dict:
+        """获取索引统计"""
+        conn = self._connect()
+        total = conn.execute("SELECT COUNT(*) FROM resume_retention").fetchone()[0]
+        expired = conn.execute(
+            "SELECT COUNT(*) FROM resume_retention WHERE expires_at <= ?", (time.time(),)
+        ).fetchone()[0]
+        with self._lock:
+            deleted, last_sweep_at = self._deleted, self._last_sweep_at
+        return {
+            "tracked": total,
+            "expired_pending": expired,
+            "deleted": deleted,
+            "last_sweep_at": last_sweep_at,
+            "sweeper_owner": self.lock_owner()
+        }
+
+
+class RetentionSweeper:
+    """
+    后台定时清理线程：每隔 interval_seconds 分批删除过期简历
+    每个工作进程都会启动，但只有持有索引中清理锁的进程执行清理；
+    持有者每轮续期，退出后锁在两个清理周期后过期，由其他进程接管
+    """
+
+    def __init__(self, index: ResumeRetentionIndex, interval_seconds: float = 3600, batch_size: int = 200,
+                 max_batches: Optional[int] = 50):
+        self.index = index
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.lock_ttl_seconds = interval_seconds * 2 + 60
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def run_once(self) -> Optional[int]:
+        """获得清理锁时执行一轮清理并返回删除数量，锁被其他进程持有时返回None"""
+        if not self.index.acquire_lock(self.owner, self.lock_ttl_seconds):
+            return None
+        return self.index.sweep(self.batch_size, self.max_batches)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                deleted = self.run_once()
+                if deleted:
+                    print(f"已清理过期简历: {deleted}份")
+            except Exception as e:
+                print(f"清理过期简历失败: {e}")
+            self._stop.wait(self.interval_seconds)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="retention-sweeper", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 5.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        try:
+            self.index.release_lock(self.owner)
+        except sqlite3.Error as e:
+            print(f"释放过期简历清理锁失败: {e}")
+
+
+_index: Optional[ResumeRetentionIndex] = None
+_sweeper: Optional[RetentionSweeper] = None
+_retention_lock = threading.Lock()
+
+
+def get_retention_index() -> ResumeRetentionIndex:
+    """获取进程内共享的保留期限索引"""
+    global _index
+    if _index is None:
+        with _retention_lock:
+            if _index is None:
+                config = load_security_config()
+                retention_config = config.get("retention", {}) or {}
+                _index = ResumeRetentionIndex(
+                    db_path=retention_config.get("db_path", "data/retention.sqlite3"),
+                    retention_days=config.get("resume_retention_days", DEFAULT_RETENTION_DAYS)
+                )
+    return _index
+
+
+def start_retention_sweeper() -> Optional[RetentionSweeper]:
+    """按配置启动后台清理线程（security.retention.enabled 为 false 时不启动）"""
+    global _sweeper
+    retention_config = load_security_config().get("retention", {}) or {}
+    if not retention_config.get("enabled", True):
+        return None
+    index = get_retention_index()
+    with _retention_lock:
+        if _sweeper is None:
+            _sweeper = RetentionSweeper(
+                index,
+                interval_seconds=retention_config.get("sweep_interval_seconds", 3600),
+                batch_size=retention_config.get("batch_size", 200),
+                max_batches=retention_config.get("max_batches_per_sweep", 50)
+            )
+    _sweeper.start()
+    return _sweeper
+
+
+def stop_retention_sweeper():
+    """停止后台清理线程"""
+    if _sweeper is not None:
+        _sweeper.stop()
@@ -0,0 +1,212 @@
+# backend/utils/screening_artifacts.py
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from utils.resume_extractor import extract_resume_info
+from utils.screening_engine import load_screening_config
+
+# 每写入多少次清理一次过期记录
+_EVICT_EVERY_N_WRITES = 64
+
+
+class ScreeningArtifactStore:
+    """
+    简历筛选中间结果存储
+    按简历内容摘要保存本地提取的技能、学历、工作年限和段落概要，
+    并按 (简历, 职位要求) 保存筛选结果，职位要求调整后据此增量重新筛选。
+    不保存简历原文和联系方式。异步代码请使用 arecord/aget_result，提取和数据库操作在线程池中执行
+    """
+
+    def __init__(self, db_path: str = "data/screening_artifacts.sqlite3", ttl_seconds: int = 30 * 24 * 3600,
+                 enabled: bool = True):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        if self.enabled:
+            self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        """每个线程使用独立连接"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_db(self):
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS resume_artifacts (
+                resume_hash TEXT PRIMARY KEY,
+                skills TEXT NOT NULL,
+                education TEXT,
+                experience_years REAL,
+                sections TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS screening_results (
+                resume_hash TEXT NOT NULL,
+                requirements_hash TEXT NOT NULL,
+                result TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (resume_hash, requirements_hash)
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_screening_results_created ON screening_results(created_at)")
+
+    @staticmethod
+    def hash_resume(resume_text: str) -> str:
+        return hashlib.sha256((resume_text or "").encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def hash_requirements(job_requirements: dict) -> str:
+        payload = json.dumps(job_requirements or {}, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def record(self, resume_text: str, job_requirements: dict, result: Dict, info: Optional[Dict] = None):
+        """保存一份简历的提取结果和筛选结果（只保存成功的结果）"""
+        if not self.enabled or result.get("status") != "success":
+            return
+        info = info or extract_resume_info(resume_text)
+        resume_hash = self.hash_resume(resume_text)
+        now = time.time()
+        # 段落概要：段落名称及长度，不保存段落内容
+        sections = {name: len(text) for name, text in info["sections"].items() if name not in ("header", "personal")}
+        try:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO resume_artifacts(resume_hash, skills, education, experience_years, sections, "
+                "updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (resume_hash, json.dumps(info["skills"], ensure_ascii=False), info.get("education"),
+                 info.get("experience_years"), json.dumps(sections, ensure_ascii=False), now)
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO screening_results(resume_hash, requirements_hash, result, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (resume_hash, self.hash_requirements(job_requirements),
+                 json.dumps(result, ensure_ascii=False, default=str), now)
+            )
+        except sqlite3.Error as e:
+            print(f"保存筛选中间结果失败: {e}")
+            return
+        with self._lock:
+            self._writes += 1
+            should_evict = self._writes % _EVICT_EVERY_N_WRITES == 0
+        if should_evict:
+            self.evict()
+
+    def get_result(self, resume_text: str, job_requirements: dict) -> Optional[Dict]:
+        """读取该简历在指定职位要求下的筛选结果，不存在或已过期返回None"""
+        if not self.enabled:
+            return None
+        try:
+            row = self._connect().execute(
+                "SELECT result, created_at FROM screening_results WHERE resume_hash = ? AND requirements_hash = ?",
+                (self.hash_resume(resume_text), self.hash_requirements(job_requirements))
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"读取筛选中间结果失败: {e}")
+            return None
+        if row is None or time.time() - row[1] > self.ttl_seconds:
+            return None
+        return json.loads(row[0])
+
+    async def arecord(self, resume_text: str, job_requirements: dict, result: Dict, info: Optional[Dict] = None):
+        """异步保存中间结果：本地提取和数据库写入在线程池中执行，不阻塞事件循环"""
+        if self.enabled and result.get("status") == "success":
+            await asyncio.get_running_loop().run_in_executor(
+                None, self.record, resume_text, job_requirements, result, info
+            )
+
+    async def aget_result(self, resume_text: str, job_requirements: dict) -> Optional[Dict]:
+        """异步读取筛选结果：数据库查询在线程池中执行"""
+        if not self.enabled:
+            return None
+        return await asyncio.get_running_loop().run_in_executor(None, self.get_result, resume_text, job_requirements)
+
+    def get_resume(self, resume_text: str) -> Optional[Dict[str, Any]]:
+        """读取简历的本地提取结果（技能、学历、工作年限、段落概要）"""
+        if not self.enabled:
+            return None
+        try:
+            row = self._connect().execute(
+                "SELECT skills, education, experience_years, sections, updated_at FROM resume_artifacts "
+                "WHERE resume_hash = ?",
+                (self.hash_resume(resume_text),)
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"读取简历提取结果失败: {e}")
+            return None
+        if row is None:
+            return None
+        return {
+            "skills": json.loads(row[0]),
+            "education": row[1],
+            "experience_years": row[2],
+            "sections": json.loads(row[3]),
+            "updated_at": row[4]
+        }
+
+    def evict(self):
+        """删除过期的筛选结果及不再被引用的简历提取结果"""
+        if not self.enabled:
+            return
+        try:
+            conn = self._connect()
+            conn.execute("DELETE FROM screening_results WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+            conn.execute(
+                "DELETE FROM resume_artifacts WHERE resume_hash NOT IN (SELECT resume_hash FROM screening_results)"
+            )
+        except sqlite3.Error as e:
+            print(f"清理筛选中间结果失败: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        result = {"enabled": self.enabled}
+        if not self.enabled:
+            return result
+        try:
+            conn = self._connect()
+            result["resumes"] = conn.execute("SELECT COUNT(*) FROM resume_artifacts").fetchone()[0]
+            result["results"] = conn.execute("SELECT COUNT(*) FROM screening_results").fetchone()[0]
+        except sqlite3.Error as e:
+            print(f"读取筛选中间结果统计失败: {e}")
+        return result
+
+
+_store: Optional[ScreeningArtifactStore] = None
+_store_lock = threading.Lock()
+
+
+def get_screening_artifacts() -> ScreeningArtifactStore:
+    """获取进程内共享的筛选中间结果存储"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                config = load_screening_config().get("artifacts", {}) or {}
+                try:
+                    _store = ScreeningArtifactStore(
+                        db_path=config.get("db_path", "data/screening_artifacts.sqlite3"),
+                        ttl_seconds=config.get("ttl_days", 30) * 24 * 3600,
+                        enabled=config.get("enabled", True)
+                    )
+                except Exception as e:
+                    print(f"初始化筛选中间结果存储失败，增量重新筛选将被禁用: {e}")
+                    _store = ScreeningArtifactStore(enabled=False)
+    return _store
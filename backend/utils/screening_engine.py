@@ -0,0 +1,118 @@
+# backend/utils/screening_engine.py
+import asyncio
+import inspect
+import weakref
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from utils.agent_executor import get_agent_executor
+from utils.app_config import get_app_config
+
+# 默认每个模型/API密钥的最大并发LLM调用数
+DEFAULT_MAX_CONCURRENCY = 8
+
+# 按事件循环隔离的信号量注册表：{loop: {limiter_key: Semaphore}}
+# 同一个模型/API密钥在同一事件循环内共享一个信号量，不同请求之间也受同一上限约束
+_limiters: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+
+
+def load_screening_config(config_file: str = "configs/recruitment_config.yml") -> Dict:
+    """加载简历筛选相关配置"""
+    return get_app_config(config_file).section("screening")
+
+
+async def _aiter_items(items: Union[Iterable, AsyncIterator]) -> AsyncIterator:
+    """把同步或异步可迭代对象统一为异步迭代"""
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+def get_limiter(limiter_key: str, max_concurrency: int) -> asyncio.Semaphore:
+    """
+    获取指定模型/API密钥对应的并发信号量
+    信号量在首次创建时确定上限，之后的调用复用同一个实例
+    """
+    loop = asyncio.get_running_loop()
+    loop_limiters = _limiters.setdefault(loop, {})
+    limiter = loop_limiters.get(limiter_key)
+    if limiter is None:
+        limiter = asyncio.Semaphore(max(1, int(max_concurrency)))
+        loop_limiters[limiter_key] = limiter
+    return limiter
+
+
+class ScreeningEngine:
+    """
+    简历批量筛选引擎
+    在有限并发下并行调用单份简历筛选函数，输出按 resume_index 保持原始顺序，
+    单份简历出错只影响该简历的结果。
+    筛选函数可以是异步函数，也可以是同步函数（同步函数放入智能体执行器线程池执行）
+    """
+
+    def __init__(self, screen_func: Callable[[str, dict], Any], limiter_key: str = "default",
+                 max_concurrency: Optional[int] = None):
+        self.screen_func = screen_func
+        self.limiter_key = limiter_key
+        if max_concurrency is None:
+            max_concurrency = load_screening_config().get("max_concurrency", DEFAULT_MAX_CONCURRENCY)
+        self.max_concurrency = max(1, int(max_concurrency))
+
+    async def run_limited(self, func: Callable, *args) -> Any:
+        """在当前模型/API密钥的并发限制内执行一次调用（同步函数放入智能体执行器）"""
+        async with get_limiter(self.limiter_key, self.max_concurrency):
+            if inspect.iscoroutinefunction(func):
+                return await func(*args)
+            return await get_agent_executor().run(func, *args)
+
+    async def screen_one(self, resume_index: int, resume_text: str, job_requirements: dict) -> Dict:
+        """在并发限制内筛选单份简历"""
+        try:
+            result = await self.run_limited(self.screen_func, resume_text, job_requirements)
+        except Exception as e:
+            result = {
+                "status": "error",
+                "message": f"处理简历时出错: {str(e)}"
+            }
+        return {
+            "resume_index": resume_index,
+            "result": result
+        }
+
+    async def iter_results(self, items: Union[Iterable[Tuple[int, str]], AsyncIterator[Tuple[int, str]]],
+                           job_requirements: dict) -> AsyncIterator[Dict]:
+        """
+        流式筛选：items 为 (resume_index, resume_text) 的同步或异步可迭代对象，
+        每完成一份简历立即产出 {resume_index, result}（按完成顺序）。
+        在途任务数不超过并发上限，输入按需读取，内存占用与批量大小无关
+        """
+        source = _aiter_items(items)
+        pending = set()
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(pending) < self.max_concurrency:
+                    try:
+                        resume_index, resume_text = await source.__anext__()
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+                    pending.add(asyncio.ensure_future(self.screen_one(resume_index, resume_text, job_requirements)))
+                if not pending:
+                    break
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            # 调用方提前停止（如客户端断开）时取消未完成的筛选
+            for task in pending:
+                task.cancel()
+
+    async def screen(self, resume_texts: List[str], job_requirements: dict) -> List[Dict]:
+        """并发筛选一批简历，返回结果顺序与输入顺序一致"""
+        results = [None] * len(resume_texts)
+        async for item in self.iter_results(enumerate(resume_texts), job_requirements):
+            results[item["resume_index"]] = item
+        return results
@@ -0,0 +1,78 @@
+# backend/utils/server_profile.py
+import importlib.util
+import inspect
+import os
+from typing import Any, Dict
+
+from utils.app_config import ServiceConfig
+
+# 运行模式：development 单进程（debug 时自动重载），production 多进程并启用下列调优
+PROFILES = ("development", "production")
+
+# 生产模式下由启动进程写入，供各工作进程按进程数分摊账号级额度
+WORKERS_ENV = "SERVICE_WORKERS"
+
+
+def worker_count() -> int:
+    """当前服务的工作进程数（未以生产模式启动时为1）"""
+    try:
+        return max(1, int(os.getenv(WORKERS_ENV, "1")))
+    except ValueError:
+        return 1
+
+
+def quota_share() -> float:
+    """每个工作进程分到的账号级额度比例（RPM/TPM、并发上限在进程内独立计数）"""
+    return 1.0 / worker_count()
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def _supported_options(options: Dict[str, Any]) -> Dict[str, Any]:
+    """去掉当前uvicorn版本不支持的参数（如旧版本没有 limit_max_requests_jitter）"""
+    import uvicorn
+    supported = inspect.signature(uvicorn.Config).parameters
+    unsupported = [name for name in options if name not in supported]
+    if unsupported:
+        print(f"当前uvicorn版本不支持以下参数，已忽略: {', '.join(unsupported)}")
+    return {name: value for name, value in options.items() if name in supported}
+
+
+def build_uvicorn_options(service: ServiceConfig, profile: str = "development", port: int = None,
+                          debug: bool = None) -> Dict[str, Any]:
+    """
+    根据 service 配置生成 uvicorn.run 的参数
+    port/debug 未指定时使用配置值（环境变量 SERVICE_PORT/DEBUG_MODE 由调用方传入以覆盖配置）
+    """
+    if profile not in PROFILES:
+        raise ValueError(f"未知的运行模式: {profile}，可选: {', '.join(PROFILES)}")
+    port = service.port if port is None else port
+    debug = service.debug if debug is None else debug
+    if profile == "development":
+        return {"host": service.host, "port": port, "reload": debug}
+
+    production = service.production
+    workers = production.workers or os.cpu_count() or 1
+    # uvloop/httptools 未安装时退回标准实现
+    loop = production.loop if production.loop != "uvloop" or _installed("uvloop") else "asyncio"
+    http = production.http if production.http != "httptools" or _installed("httptools") else "h11"
+    options = {
+        "host": service.host,
+        "port": port,
+        "workers": workers,
+        "loop": loop,
+        "http": http,
+        "backlog": production.backlog,
+        "timeout_keep_alive": production.timeout_keep_alive,
+        "timeout_graceful_shutdown": production.timeout_graceful_shutdown,
+        "limit_max_requests": production.limit_max_requests or None,
+        "limit_max_requests_jitter": production.limit_max_requests_jitter,
+        "limit_concurrency": production.limit_concurrency or None,
+        "access_log": production.access_log,
+        "proxy_headers": production.proxy_headers
+    }
+    # 工作进程继承环境变量，据此分摊账号级限流额度
+    os.environ[WORKERS_ENV] = str(workers)
+    return _supported_options(options)
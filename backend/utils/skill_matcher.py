@@ -0,0 +1,250 @@
+# backend/utils/skill_matcher.py
+import re
+import threading
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from utils.app_config import get_app_config
+
+# 内置技能词典：标准名称 -> 同义词/别名
+DEFAULT_SKILL_TAXONOMY = {
+    "Python": ["python3"],
+    "Java": [],
+    "JavaScript": ["JS", "ECMAScript", "ES6"],
+    "TypeScript": ["TS"],
+    "C++": ["cpp"],
+    "C#": ["csharp", ".NET"],
+    "Go": ["Golang", "Go语言"],
+    "SQL": [],
+    "MySQL": [],
+    "PostgreSQL": ["Postgres"],
+    "Redis": [],
+    "Linux": [],
+    "Docker": ["容器化"],
+    "Kubernetes": ["K8s"],
+    "React": ["React.js", "ReactJS"],
+    "Vue": ["Vue.js", "VueJS"],
+    "Node.js": ["NodeJS", "Node"],
+    "Spring": ["Spring Boot", "SpringBoot"],
+    "Git": [],
+    "机器学习": ["Machine Learning", "ML"],
+    "深度学习": ["Deep Learning"],
+    "数据分析": ["Data Analysis", "数据分析能力"],
+    "Excel": ["电子表格", "Microsoft Excel", "MS Excel"],
+    "Word": ["Microsoft Word", "MS Word"],
+    "PPT": ["PowerPoint", "演示文稿"],
+    "Photoshop": [],
+    "项目管理": ["Project Management", "PMP"],
+    "沟通协调": ["沟通能力", "协调能力", "沟通协调能力"],
+    "文档编写": ["文档撰写", "公文写作"],
+    "英语": ["English", "CET-4", "CET-6", "英语四级", "英语六级"],
+}
+
+
+# 同时是常见英文单词的技能名称/别名（如 "I go to work"、"react quickly"），需要结合上下文判断：
+# 紧邻中文时不区分大小写；否则须与词典写法（或全大写）一致，且紧邻列表分隔符，或附近出现其他明确的技能
+DEFAULT_AMBIGUOUS_TERMS = ("Go", "React", "Word", "Spring", "Node", "TS", "ML", "Excel")
+
+# 判断歧义技能上下文时，向前后查看其他明确技能的字符范围
+_AMBIGUOUS_CONTEXT_CHARS = 40
+_CJK_RE = re.compile(r"[\u3400-\u4dbf\u4e00-\u9fff]")
+_LIST_SEPARATORS = set(",，、;；/|()（）[]【】:：+&\n")
+
+
+def _is_word_char(char: str) -> bool:
+    """ASCII字母数字视为单词字符，用于英文技能的边界判断"""
+    return char.isascii() and char.isalnum()
+
+
+class AhoCorasick:
+    """Aho-Corasick多模式匹配自动机，一次线性扫描找出文本中出现的所有模式"""
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[int, str]]] = [[]]
+        self._built = False
+
+    def add(self, pattern: str, value: str):
+        """添加模式（不区分大小写），value 为匹配后返回的值"""
+        pattern = pattern.lower()
+        if not pattern:
+            return
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = next_node
+        self._output[node].append((len(pattern), value))
+        self._built = False
+
+    def build(self):
+        """按广度优先计算失败指针并合并输出"""
+        queue = deque(self._goto[0].values())
+        for node in queue:
+            self._fail[node] = 0
+        while queue:
+            node = queue.popleft()
+            for char, next_node in self._goto[node].items():
+                queue.append(next_node)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_node] = self._goto[fail].get(char, 0)
+                self._output[next_node] = self._output[next_node] + self._output[self._fail[next_node]]
+        self._built = True
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """扫描文本，产出 (起始位置, 结束位置, value)；以英文字母数字开头/结尾的模式要求完整单词匹配"""
+        if not self._built:
+            self.build()
+        lowered = text.lower()
+        goto, fail, output = self._goto, self._fail, self._output
+        node = 0
+        for position, char in enumerate(lowered):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for length, value in output[node]:
+                start = position - length + 1
+                end = position + 1
+                if _is_word_char(lowered[start]) and start > 0 and _is_word_char(lowered[start - 1]):
+                    continue
+                if _is_word_char(lowered[position]) and end < len(lowered) and _is_word_char(lowered[end]):
+                    continue
+                yield start, end, value
+
+
+class SkillMatcher:
+    """
+    基于技能词典（含同义词）的确定性技能匹配
+    把所有技能名称和同义词编译进一个Aho-Corasick自动机，单次线性扫描简历文本，
+    在本地计算 matched/missing/additional 技能列表。
+    ambiguous_terms 中的名称/别名同时是常见英文单词，只在上下文表明是技能时计入（见 DEFAULT_AMBIGUOUS_TERMS）
+    """
+
+    def __init__(self, taxonomy: Optional[Dict[str, List[str]]] = None,
+                 ambiguous_terms: Optional[Iterable[str]] = None):
+        self.taxonomy = dict(DEFAULT_SKILL_TAXONOMY if taxonomy is None else taxonomy)
+        self.ambiguous_terms = tuple(DEFAULT_AMBIGUOUS_TERMS if ambiguous_terms is None else ambiguous_terms)
+        # {小写写法: 允许的原始写法}，不在上下文中时必须与词典写法或全大写一致
+        self._ambiguous: Dict[str, set] = {}
+        for term in self.ambiguous_terms:
+            term = str(term).strip()
+            self._ambiguous.setdefault(term.lower(), set()).update((term, term.upper()))
+        self._aliases: Dict[str, str] = {}
+        self._automaton = AhoCorasick()
+        for canonical, synonyms in self.taxonomy.items():
+            for term in [canonical] + list(synonyms or []):
+                self._add_term(term, canonical)
+        self._automaton.build()
+
+    def _add_term(self, term: str, canonical: str):
+        term = str(term).strip()
+        if term and term.lower() not in self._aliases:
+            self._aliases[term.lower()] = canonical
+            self._automaton.add(term, canonical)
+
+    def canonicalize(self, skill: str) -> str:
+        """把技能名称/同义词映射为标准名称，词典中不存在时原样返回"""
+        return self._aliases.get(str(skill).strip().lower(), str(skill).strip())
+
+    def with_skills(self, skills: List[str]) -> "SkillMatcher":
+        """返回包含额外技能（如职位要求中词典外的技能）的匹配器，词典已覆盖时返回自身"""
+        extra = tuple(sorted({str(s).strip() for s in skills if str(s).strip().lower() not in self._aliases}))
+        if not extra:
+            return self
+        return _extend_matcher(self, extra)
+
+    @staticmethod
+    def _neighbor(text: str, position: int, step: int) -> Optional[str]:
+        """跳过空格后相邻的字符，到达文本边界时返回None"""
+        while 0 <= position < len(text) and text[position] in " \t":
+            position += step
+        return text[position] if 0 <= position < len(text) else None
+
+    def _in_skill_context(self, text: str, start: int, end: int, anchors: List[Tuple[int, int]]) -> bool:
+        """歧义写法是否处于技能上下文：紧邻中文，或写法一致且紧邻分隔符/附近有其他明确技能"""
+        neighbors = (self._neighbor(text, start - 1, -1), self._neighbor(text, end, 1))
+        if any(char is not None and _CJK_RE.match(char) for char in neighbors):
+            return True
+        if text[start:end] not in self._ambiguous[text[start:end].lower()]:
+            return False
+        if any(char is None or char in _LIST_SEPARATORS for char in neighbors):
+            return True
+        return any(
+            anchor_start - _AMBIGUOUS_CONTEXT_CHARS <= end and start <= anchor_end + _AMBIGUOUS_CONTEXT_CHARS
+            for anchor_start, anchor_end in anchors
+        )
+
+    def find_skills(self, text: str) -> List[str]:
+        """找出文本中出现的全部技能（标准名称，按首次出现顺序），歧义写法只在技能上下文中计入"""
+        text = text or ""
+        matches = list(self._automaton.iter_matches(text))
+        anchors = [(start, end) for start, end, _ in matches if text[start:end].lower() not in self._ambiguous]
+        found = {}
+        for start, end, canonical in matches:
+            if text[start:end].lower() in self._ambiguous and not self._in_skill_context(text, start, end, anchors):
+                continue
+            found.setdefault(canonical, None)
+        return list(found)
+
+    def match(self, resume_text: str, required_skills: List[str]) -> Dict[str, List[str]]:
+        """
+        计算简历与职位技能要求的匹配情况
+        matched/missing 使用职位要求中的原始写法，additional 为简历中出现但未被要求的技能
+        """
+        matcher = self.with_skills(required_skills)
+        found = matcher.find_skills(resume_text)
+        found_set = set(found)
+        required = {}
+        for skill in required_skills:
+            required.setdefault(matcher.canonicalize(skill), str(skill).strip())
+        return {
+            "matched_skills": [label for canonical, label in required.items() if canonical in found_set],
+            "missing_skills": [label for canonical, label in required.items() if canonical not in found_set],
+            "additional_skills": [canonical for canonical in found if canonical not in required]
+        }
+
+
+@lru_cache(maxsize=64)
+def _extend_matcher(base: SkillMatcher, extra_skills: Tuple[str, ...]) -> SkillMatcher:
+    """按额外技能组合缓存扩展后的匹配器，同一职位的批量筛选只编译一次"""
+    taxonomy = dict(base.taxonomy)
+    for skill in extra_skills:
+        taxonomy.setdefault(skill, [])
+    return SkillMatcher(taxonomy, base.ambiguous_terms)
+
+
+_matcher: Optional[SkillMatcher] = None
+_matcher_lock = threading.Lock()
+
+
+def _load_taxonomy(config_file: str = "configs/recruitment_config.yml") -> Dict[str, List[str]]:
+    """加载技能词典：内置词典 + 配置文件中的 skill_taxonomy（同名技能的同义词合并）"""
+    taxonomy = {canonical: list(synonyms) for canonical, synonyms in DEFAULT_SKILL_TAXONOMY.items()}
+    for canonical, synonyms in get_app_config(config_file).section("skill_taxonomy").items():
+        taxonomy.setdefault(str(canonical), []).extend(str(s) for s in (synonyms or []))
+    return taxonomy
+
+
+def _load_ambiguous_terms(config_file: str = "configs/recruitment_config.yml") -> List[str]:
+    """加载需要结合上下文匹配的技能写法：内置列表 + skill_matching.ambiguous_terms"""
+    extra = get_app_config(config_file).section("skill_matching").get("ambiguous_terms") or []
+    return list(DEFAULT_AMBIGUOUS_TERMS) + [str(term) for term in extra]
+
+
+def get_skill_matcher() -> SkillMatcher:
+    """获取进程内共享的技能匹配器"""
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                _matcher = SkillMatcher(_load_taxonomy(), _load_ambiguous_terms())
+    return _matcher
@@ -0,0 +1,189 @@
+# backend/utils/spreadsheet_reader.py
+import asyncio
+import csv
+import datetime
+import itertools
+import os
+import re
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# 在表格前若干行中查找表头（招聘网站导出的表格前面常有标题行、导出时间等）
+DEFAULT_HEADER_SCAN_ROWS = 20
+
+# 标准字段 -> 常见表头写法（比较时忽略大小写、空格和冒号）
+HEADER_ALIASES = {
+    "name": ["姓名", "名字", "候选人", "候选人姓名", "应聘者", "name", "fullname", "candidate", "candidatename"],
+    "phone": ["电话", "手机", "手机号", "手机号码", "联系电话", "联系方式", "phone", "mobile", "tel", "telephone",
+              "phonenumber"],
+    "email": ["邮箱", "电子邮箱", "邮件", "email", "e-mail", "mail"],
+    "gender": ["性别", "gender", "sex"],
+    "age": ["年龄", "age"],
+    "education": ["学历", "最高学历", "教育程度", "education", "degree"],
+    "school": ["学校", "毕业院校", "毕业学校", "院校", "school", "university", "college"],
+    "major": ["专业", "所学专业", "major"],
+    "experience_years": ["工作年限", "工作经验", "经验年限", "工龄", "yearsofexperience", "experience"],
+    "current_company": ["公司", "当前公司", "目前公司", "最近公司", "所在公司", "company", "currentcompany", "employer"],
+    "current_position": ["职位", "当前职位", "目前职位", "最近职位", "title", "jobtitle", "currentposition"],
+    "applied_position": ["应聘职位", "应聘岗位", "投递职位", "申请职位", "appliedposition", "position"],
+    "location": ["城市", "所在地", "现居住地", "居住地", "location", "city"],
+    "expected_salary": ["期望薪资", "期望薪水", "薪资要求", "expectedsalary", "salary"],
+    "skills": ["技能", "专业技能", "技能特长", "skills", "skill"],
+    "work_history": ["工作经历", "工作履历", "项目经历", "workexperience", "workhistory", "projects"],
+    "resume_text": ["简历", "简历内容", "简历正文", "自我评价", "个人简介", "resume", "summary", "profile"],
+}
+
+_HEADER_CLEAN_RE = re.compile(r"[\s:：*_()（）]+")
+_ALIAS_TO_FIELD = {
+    _HEADER_CLEAN_RE.sub("", alias.lower()): field
+    for field, aliases in HEADER_ALIASES.items()
+    for alias in aliases
+}
+
+
+def _normalize_header(value) -> str:
+    return _HEADER_CLEAN_RE.sub("", str(value).lower()) if value is not None else ""
+
+
+def match_header(value) -> Optional[str]:
+    """把表头单元格映射为标准字段：先精确匹配，再取表头中包含的最长别名，无法识别时返回None"""
+    header = _normalize_header(value)
+    if not header:
+        return None
+    if header in _ALIAS_TO_FIELD:
+        return _ALIAS_TO_FIELD[header]
+    best = None
+    for alias, field in _ALIAS_TO_FIELD.items():
+        if len(alias) >= 2 and alias in header and (best is None or len(alias) > len(best[0])):
+            best = (alias, field)
+    return best[1] if best else None
+
+
+def format_cell(value) -> str:
+    """单元格值转为文本：整数值的浮点数去掉小数部分，日期去掉零时刻"""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, datetime.datetime) and value.time() == datetime.time(0):
+        return value.date().isoformat()
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    return str(value).strip()
+
+
+def detect_header(rows: Sequence[Sequence]) -> Tuple[int, List[str], List[Optional[str]]]:
+    """
+    在候选行中识别表头行
+    取能识别出最多标准字段的一行；都识别不出时取第一个非空行。
+    返回 (表头行在rows中的下标, 列名列表, 每列对应的标准字段)，rows 中没有非空行时下标为 -1
+    """
+    best_index, best_score = -1, 0
+    for index, row in enumerate(rows):
+        score = len({match_header(cell) for cell in row} - {None})
+        if score > best_score:
+            best_index, best_score = index, score
+    if best_index < 0:
+        best_index = next((i for i, row in enumerate(rows) if any(format_cell(c) for c in row)), -1)
+    if best_index < 0:
+        return -1, [], []
+
+    labels, seen = [], {}
+    for column, cell in enumerate(rows[best_index]):
+        label = format_cell(cell) or f"列{column + 1}"
+        seen[label] = seen.get(label, 0) + 1
+        labels.append(label if seen[label] == 1 else f"{label}_{seen[label]}")
+    fields, used = [], set()
+    for cell in rows[best_index]:
+        field = match_header(cell)
+        # 同一标准字段出现在多列时只映射第一列，其余列保留在 fields 原始列名中
+        fields.append(field if field not in used else None)
+        used.add(field)
+    return best_index, labels, fields
+
+
+def _iter_raw_rows(file_path: str, sheet_name: Optional[str] = None) -> Iterator[Tuple[int, Sequence]]:
+    """按行产出 (Excel行号, 单元格值)；xlsx/xlsm 以只读模式流式读取"""
+    _, ext = os.path.splitext(file_path)
+    ext = ext.lower()
+    if ext in ('.xlsx', '.xlsm'):
+        import openpyxl  # 按需导入，避免拖慢服务启动
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            sheet = workbook[sheet_name] if sheet_name else workbook.worksheets[0]
+            for row_number, row in enumerate(sheet.iter_rows(values_only=True), start=1):
+                yield row_number, row
+        finally:
+            workbook.close()
+    elif ext == '.csv':
+        with open(file_path, 'r', encoding='utf-8-sig', newline='') as f:
+            for row_number, row in enumerate(csv.reader(f), start=1):
+                yield row_number, row
+    elif ext == '.xls':
+        # 旧版xls为二进制格式，无法流式读取，整表读入后逐行产出
+        import pandas as pd
+        df = pd.read_excel(file_path, sheet_name=sheet_name or 0, header=None, dtype=object)
+        for row_number, row in enumerate(df.itertuples(index=False), start=1):
+            yield row_number, [None if pd.isna(value) else value for value in row]
+    else:
+        raise ValueError(f"不支持的表格格式: {ext}")
+
+
+def record_to_text(record: Dict) -> str:
+    """把候选人记录转为逐行的“列名: 值”文本，作为筛选输入"""
+    return "".join(f"{label}: {value}\n" for label, value in record["fields"].items())
+
+
+def iter_candidate_records(file_path: str, sheet_name: Optional[str] = None,
+                           header_scan_rows: int = DEFAULT_HEADER_SCAN_ROWS) -> Iterator[Dict]:
+    """
+    流式读取候选人表格，每个数据行产出一条记录：
+    {"row": Excel行号, "fields": {列名: 值}, "candidate": {标准字段: 值}, "text": 筛选文本}
+    只缓存表头识别所需的前若干行，内存占用与表格行数无关；空行跳过
+    """
+    rows = _iter_raw_rows(file_path, sheet_name)
+    try:
+        head = list(itertools.islice(rows, header_scan_rows))
+        header_index, labels, fields = detect_header([row for _, row in head])
+        if header_index < 0:
+            return
+        for row_number, row in itertools.chain(head[header_index + 1:], rows):
+            record_fields, candidate = {}, {}
+            for column, cell in enumerate(row):
+                value = format_cell(cell)
+                if not value:
+                    continue
+                label = labels[column] if column < len(labels) else f"列{column + 1}"
+                record_fields[label] = value
+                if column < len(fields) and fields[column]:
+                    candidate[fields[column]] = value
+            if not record_fields:
+                continue
+            record = {"row": row_number, "fields": record_fields, "candidate": candidate}
+            record["text"] = record_to_text(record)
+            yield record
+    finally:
+        rows.close()
+
+
+async def aiter_candidate_records(file_path: str, sheet_name: Optional[str] = None,
+                                  header_scan_rows: int = DEFAULT_HEADER_SCAN_ROWS,
+                                  chunk_rows: int = 64) -> AsyncIterator[Dict]:
+    """
+    异步版本：在线程池中分块读取表格，不阻塞事件循环。
+    按需读取下一块，配合有限并发的筛选引擎时读取速度跟随筛选速度，内存占用有界
+    """
+    loop = asyncio.get_running_loop()
+    records = iter_candidate_records(file_path, sheet_name, header_scan_rows)
+    try:
+        while True:
+            chunk = await loop.run_in_executor(None, lambda: list(itertools.islice(records, chunk_rows)))
+            if not chunk:
+                break
+            for record in chunk:
+                yield record
+    finally:
+        try:
+            records.close()
+        except ValueError:
+            # 取消时工作线程可能仍在读取，生成器由垃圾回收关闭
+            pass
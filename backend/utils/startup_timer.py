@@ -0,0 +1,76 @@
+# backend/utils/startup_timer.py
+import importlib
+import threading
+import time
+from contextlib import contextmanager
+from types import ModuleType
+from typing import Dict, List, Optional
+
+# 本模块首次导入的时间，main.py 最先导入本模块，近似为进程启动时间
+_PROCESS_STARTED_AT = time.perf_counter()
+
+
+class StartupTimer:
+    """
+    启动耗时记录
+    记录各模块导入、智能体创建等启动阶段的耗时，以及服务可以接收请求、预热完成的时间点，
+    用于排查冷启动和 --reload 重启慢的问题
+    """
+
+    def __init__(self, started_at: float = _PROCESS_STARTED_AT):
+        self.started_at = started_at
+        self._stages: List[Dict] = []
+        self._milestones: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str, kind: str = "stage"):
+        """with timer.stage("agent:resume_screener", "agent"): 记录代码块耗时（失败也记录）"""
+        started = time.perf_counter()
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            error = str(e)
+            raise
+        finally:
+            record = {
+                "name": name,
+                "kind": kind,
+                "ms": round((time.perf_counter() - started) * 1000, 1),
+                "offset_ms": round((started - self.started_at) * 1000, 1),
+                "thread": threading.current_thread().name
+            }
+            if error is not None:
+                record["error"] = error
+            with self._lock:
+                self._stages.append(record)
+
+    def import_module(self, name: str) -> ModuleType:
+        """导入模块并记录耗时（已导入的模块耗时接近0）"""
+        with self.stage(name, "import"):
+            return importlib.import_module(name)
+
+    def mark(self, milestone: str):
+        """记录一个时间点，如 "accepting"（开始接收请求）、"warmed_up"（预热完成）"""
+        with self._lock:
+            self._milestones[milestone] = round(time.perf_counter() - self.started_at, 3)
+
+    def report(self, top: Optional[int] = None) -> Dict:
+        """启动报告：各时间点（距进程启动的秒数）和按耗时降序排列的各阶段"""
+        with self._lock:
+            stages = sorted(self._stages, key=lambda s: s["ms"], reverse=True)
+            milestones = dict(self._milestones)
+        return {
+            "uptime_seconds": round(time.perf_counter() - self.started_at, 3),
+            "milestones": milestones,
+            "stages": stages[:top] if top else stages
+        }
+
+
+_timer = StartupTimer()
+
+
+def get_startup_timer() -> StartupTimer:
+    """获取进程内共享的启动耗时记录"""
+    return _timer
@@ -0,0 +1,95 @@
+# backend/utils/token_budget.py
+import os
+import re
+import threading
+from typing import List, Optional, Sequence
+
+from utils.app_config import get_app_config
+
+# 中日韩字符（Qwen分词器中一个汉字大致对应一个token）
+_CJK_RE = re.compile(r"[\u3000-\u303f\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uff00-\uffef]")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# 非中日韩文本平均每个token对应的字符数
+_CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """快速估算文本的token数（本地近似，无需加载分词器）"""
+    if not text:
+        return 0
+    cjk_count = len(_CJK_RE.findall(text))
+    other_chars = len(_WHITESPACE_RE.sub(" ", text)) - cjk_count
+    return cjk_count + (max(other_chars, 0) + _CHARS_PER_TOKEN - 1) // _CHARS_PER_TOKEN
+
+
+_tokenizer = None
+_tokenizer_loaded = False
+_tokenizer_lock = threading.Lock()
+
+
+def _load_tokenizer():
+    """
+    加载本地的Qwen分词器（tokenizer.path 指向 tokenizer.json，需要安装 tokenizers）
+    未配置、文件不存在或未安装时返回None，使用本地近似估算
+    """
+    global _tokenizer, _tokenizer_loaded
+    if not _tokenizer_loaded:
+        with _tokenizer_lock:
+            if not _tokenizer_loaded:
+                path = get_app_config().section("tokenizer").get("path")
+                if path and os.path.exists(path):
+                    try:
+                        from tokenizers import Tokenizer  # 可选依赖
+                        _tokenizer = Tokenizer.from_file(path)
+                    except Exception as e:
+                        print(f"加载分词器失败，使用近似估算: {e}")
+                elif path:
+                    print(f"分词器文件不存在，使用近似估算: {path}")
+                _tokenizer_loaded = True
+    return _tokenizer
+
+
+def count_tokens(text: str) -> int:
+    """
+    统计文本的token数：配置了Qwen分词器时精确计数，否则使用 estimate_tokens 近似估算
+    用于提示词预算和节省量统计；分批、限流等高频估算请直接使用 estimate_tokens
+    """
+    if not text:
+        return 0
+    tokenizer = _load_tokenizer()
+    if tokenizer is None:
+        return estimate_tokens(text)
+    return len(tokenizer.encode(text, add_special_tokens=False).ids)
+
+
+def tokenizer_name() -> Optional[str]:
+    """当前使用的计数方式，便于在响应中说明token数的来源"""
+    return "qwen" if _load_tokenizer() is not None else "estimate"
+
+
+def plan_batches(texts: Sequence[str], fixed_tokens: int, token_budget: int, max_batch_size: int,
+                 max_item_tokens: int, output_tokens_per_item: int = 0) -> List[List[int]]:
+    """
+    按token预算把文本分组
+    每组的 固定部分 + Σ(文本token + 单条输出token) 不超过预算，
+    超过 max_item_tokens 的长文本单独成组
+    返回下标分组，组内下标保持原始顺序
+    """
+    batches = []
+    current = []
+    current_tokens = fixed_tokens
+    for index, text in enumerate(texts):
+        item_tokens = estimate_tokens(text) + output_tokens_per_item
+        if item_tokens - output_tokens_per_item > max_item_tokens or fixed_tokens + item_tokens > token_budget:
+            batches.append([index])
+            continue
+        if current and (current_tokens + item_tokens > token_budget or len(current) >= max_batch_size):
+            batches.append(current)
+            current = []
+            current_tokens = fixed_tokens
+        current.append(index)
+        current_tokens += item_tokens
+    if current:
+        batches.append(current)
+    return batches
@@ -0,0 +1,97 @@
+# backend/utils/usage_counter.py
+import math
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+# 导出指标时默认统计的时间窗口（秒）
+DEFAULT_WINDOWS = {"1m": 60, "1h": 3600, "24h": 86400}
+
+
+class SlidingWindowCounter:
+    """
+    按时间分桶的滑动窗口计数器
+    环形数组中保存每个时间桶开始时的累计计数，任意窗口内的次数 = 当前累计 - 窗口起点所在桶的累计，
+    记录和查询都是O(1)（时间推进时补齐跳过的桶，均摊O(1)）。窗口按桶对齐，精度为 bucket_seconds
+    """
+
+    def __init__(self, bucket_seconds: int = 10, horizon_seconds: int = 86400):
+        self.bucket_seconds = bucket_seconds
+        self._size = math.ceil(horizon_seconds / bucket_seconds) + 1
+        self._ring = [0] * self._size
+        self._total = 0
+        self._current = self._bucket(time.time())
+
+    def _bucket(self, now: float) -> int:
+        return int(now // self.bucket_seconds)
+
+    def _advance(self, now: float):
+        bucket = self._bucket(now)
+        if bucket <= self._current:
+            return
+        # 跳过的桶内没有新计数，起始累计都等于当前累计；最多补齐一整圈
+        steps = min(bucket - self._current, self._size)
+        for b in range(bucket - steps + 1, bucket + 1):
+            self._ring[b % self._size] = self._total
+        self._current = bucket
+
+    def add(self, count: int = 1, now: Optional[float] = None):
+        """记录 count 次"""
+        self._advance(time.time() if now is None else now)
+        self._total += count
+
+    def count(self, window_seconds: float, now: Optional[float] = None) -> int:
+        """最近 window_seconds 秒内的次数（超过保存范围时按保存范围计算）"""
+        self._advance(time.time() if now is None else now)
+        buckets = min(max(1, math.ceil(window_seconds / self.bucket_seconds)), self._size - 1)
+        return self._total - self._ring[(self._current - buckets + 1) % self._size]
+
+    @property
+    def total(self) -> int:
+        """累计总次数"""
+        return self._total
+
+
+class UsageCounters:
+    """按名称（如服务名）分组的线程安全使用次数计数器"""
+
+    def __init__(self, bucket_seconds: int = 10, horizon_seconds: int = 86400):
+        self.bucket_seconds = bucket_seconds
+        self.horizon_seconds = horizon_seconds
+        self._counters: Dict[str, SlidingWindowCounter] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, name: str) -> SlidingWindowCounter:
+        counter = self._counters.get(name)
+        if counter is None:
+            counter = SlidingWindowCounter(self.bucket_seconds, self.horizon_seconds)
+            self._counters[name] = counter
+        return counter
+
+    def record(self, name: str, count: int = 1):
+        """记录一次（或 count 次）使用"""
+        with self._lock:
+            self._get(name).add(count)
+
+    def count(self, name: str, window_seconds: float) -> int:
+        """最近 window_seconds 秒内的使用次数"""
+        with self._lock:
+            counter = self._counters.get(name)
+            return counter.count(window_seconds) if counter else 0
+
+    def total(self, name: str) -> int:
+        """累计使用次数"""
+        with self._lock:
+            counter = self._counters.get(name)
+            return counter.total if counter else 0
+
+    def snapshot(self, windows: Optional[Dict[str, float]] = None,
+                 names: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, int]]:
+        """导出指标：{名称: {"total": 累计次数, "1m": ..., "1h": ..., "24h": ...}}"""
+        windows = windows or DEFAULT_WINDOWS
+        with self._lock:
+            selected = self._counters if names is None else {n: self._counters[n] for n in names if n in self._counters}
+            return {
+                name: {"total": counter.total, **{label: counter.count(seconds) for label, seconds in windows.items()}}
+                for name, counter in selected.items()
+            }